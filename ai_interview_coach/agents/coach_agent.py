@@ -6,7 +6,7 @@ import tempfile
 import logging
 import os
 import asyncio
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 from config import Config
 import openai
 from langgraph.graph import StateGraph, END
@@ -18,118 +18,182 @@ from models.interview_state import InterviewState
 from models.user_profile import UserProfile
 from utils.file_storage import FileStorage
 from utils.dashboard import InterviewDashboard
+from utils.tts import get_tts_worker
+from utils.voice import SpeechCapture, AudioChunkChannel, TextInputChannel, create_asr_backend
+from utils.acoustics import features_from_pcm, vocal_scores
+from utils.analysis import build_vocal_feedback
+from utils.question_store import LEVELS, RoleBank, get_question_store, slot_key
+from utils.question_stats import question_hash
+from utils.sampler import get_question_sampler
+from utils.reference_scoring import ReferenceScorer
+from utils.tracing import traced
 import random
 import json
 from agents.feedback_agent import FeedbackAgent
 from agents.resume_agent import ResumeAgent
 
 
+CLOSING_MESSAGE = "We've reached the end of our session. Thank you for your time!"
+TIMEOUT_MESSAGE = "I didn't hear your response. Let's move to the next question."
+
+
 class InterviewStateDict(TypedDict):
     state: InterviewState
     messages: List[Any]
 
 
+def welcome_message(interview_type: str, level: str) -> str:
+    return (f"Welcome to your {interview_type.replace('_', ' ')} mock interview. "
+            f"I'll be your AI coach today. This session is for {level} level. "
+            "Let's begin with some introductory questions.")
+
+
+def spoken_prompts(roles: List[str]) -> List[str]:
+    """The fixed prompts the coach can speak, used to pre-warm the TTS cache at startup."""
+    prompts = [CLOSING_MESSAGE, TIMEOUT_MESSAGE]
+    for interview_type in roles:
+        prompts.extend(welcome_message(interview_type, level) for level in LEVELS)
+    return prompts
+
+
+def session_prompts(bank: Optional[RoleBank], level: str) -> List[str]:
+    """Questions one session may ask, pre-warmed again once its bank is loaded, in case it changed since startup."""
+    if bank is None:
+        return []
+    return bank.questions("intro") + bank.questions("technical", level) + bank.questions("behavioral")
+
+
 class VoiceInterface:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
-        self.engine.setProperty('volume', 0.9)
-        self._last_response = None
-        self._response_event = asyncio.Event()
+        self.tts = get_tts_worker()
+        self.text_input = TextInputChannel()
 
         # Improved recognizer settings
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 1.0  # Seconds of silence before considering speech ended
         self.recognizer.energy_threshold = 4000  # Adjust based on your microphone
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
-    def speak(self, text: str):
-        """Output text as speech if voice is enabled"""
-        if not Config.VOICE_ENABLED:
-            logging.debug(f"Text-to-speech: {text}")
+        self.capture = SpeechCapture(self.recognizer)
+        self.asr = create_asr_backend(self.recognizer)
+        self.audio_input = AudioChunkChannel()
+        self.on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+        self.last_audio: Optional[sr.AudioData] = None
+
+    @traced("voice.speak")
+    async def speak(self, text: str):
+        """Output text as speech if voice is enabled; the TTS worker keeps the event loop free"""
+        if not Config.VOICE_ENABLED or Config.TTS_MODE == "client":
+            logging.debug("Text-to-speech: %s", text)
             return
 
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
+            await self.tts.speak(text)
         except Exception as e:
             logging.error(f"Speech synthesis error: {e}")
 
+    @traced("voice.synthesize")
+    async def synthesize(self, text: str) -> Optional[str]:
+        """Cached audio for `text` as a cache key clients can fetch, if synthesis succeeded"""
+        path = await self.tts.synthesize(text)
+        return path.stem if path else None
+
     def set_response(self, response: str):
-        """Set the response received from the UI"""
-        self._last_response = response
-        self._response_event.set()
-        logging.debug(f"Response received from UI: {response}")
+        """Push a typed answer received from the UI, waking any pending wait_for_response"""
+        self.text_input.push(response)
+        logging.debug("Response received from UI: %s", response)
 
-    async def wait_for_response(self, timeout: int = 60) -> Optional[str]:
-        """Wait for a response with timeout, checking both UI and voice input"""
-        self._response_event.clear()
-        self._last_response = None
+    def feed_audio(self, chunk: bytes):
+        """Push a PCM chunk streamed by the client (websocket binary frame)"""
+        self.audio_input.feed(chunk)
 
-        try:
-            # Create tasks with proper timeout handling
-            voice_task = asyncio.create_task(self._listen_for_voice(timeout))
-            ui_task = asyncio.create_task(self._response_event.wait())
-
-            done, pending = await asyncio.wait(
-                {voice_task, ui_task},
-                timeout=timeout,
-                return_when=asyncio.FIRST_COMPLETED
-            )
+    def end_audio(self):
+        """Mark the end of the client's spoken answer"""
+        self.audio_input.end()
 
-            # Cancel any pending tasks
-            for task in pending:
-                task.cancel()
-
-            # Check which task completed
-            if voice_task in done and not voice_task.exception():
-                return voice_task.result()
-            elif ui_task in done:
-                return self._last_response
+    async def wait_for_response(self, timeout: int = 60) -> Optional[str]:
+        """Wait for a response with timeout, checking UI text, client audio and local voice input"""
+        self.last_audio = None
 
+        tasks = {
+            asyncio.create_task(self.text_input.get()),
+            asyncio.create_task(self._listen_for_voice(timeout)),
+            asyncio.create_task(self._listen_for_client_audio())
+        }
+        deadline = asyncio.get_running_loop().time() + timeout
+        try:
+            while tasks:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                done, tasks = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result():
+                        return task.result()
             return None
 
         except Exception as e:
             logging.error(f"Error waiting for response: {e}")
             return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _transcribe(self, chunks) -> Optional[str]:
+        """Run the ASR backend over an audio stream, forwarding partial transcripts"""
+        try:
+            async for transcript in self.asr.transcribe(chunks):
+                if not transcript.is_final:
+                    if self.on_partial:
+                        await self.on_partial(transcript.text)
+                    continue
+                logging.debug("Recognized speech: %s", transcript.text)
+                return transcript.text or None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Voice recognition error: {e}")
+        return None
 
+    @traced("voice.listen")
     async def _listen_for_voice(self, timeout: int) -> Optional[str]:
         """Listen for voice input with timeout"""
         if not Config.VOICE_ENABLED:
             return None
 
-        with sr.Microphone() as source:
-            logging.debug("Adjusting for ambient noise...")
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
-            logging.debug(f"Listening for speech (timeout: {timeout}s)...")
-
-            try:
-                audio = self.recognizer.listen(
-                    source,
-                    timeout=timeout,
-                    phrase_time_limit=timeout
-                )
-                logging.debug("Processing speech...")
-                text = self.recognizer.recognize_google(audio)
-                logging.debug(f"Recognized speech: {text}")
-                self._last_response = text
-                self._response_event.set()
-                return text
-            except sr.WaitTimeoutError:
-                logging.debug("No speech detected within timeout period")
-                return None
-            except sr.UnknownValueError:
-                logging.debug("Could not understand audio")
-                return None
-            except Exception as e:
-                logging.error(f"Voice recognition error: {e}")
-                return None
+        text = await self._transcribe(self.capture.stream(timeout))
+        if text is None:
+            logging.debug("No speech detected within timeout period")
+        else:
+            self.last_audio = self.capture.last_audio
+        return text
+
+    @traced("voice.client_audio")
+    async def _listen_for_client_audio(self) -> Optional[str]:
+        """Transcribe an answer streamed by the client, keeping its audio for analysis"""
+        frames = bytearray()
+
+        async def recorded():
+            async for chunk in self.audio_input:
+                frames.extend(chunk)
+                yield chunk
+
+        text = await self._transcribe(recorded())
+        if text is not None and frames:
+            self.last_audio = sr.AudioData(bytes(frames), self.asr.sample_rate, self.asr.sample_width)
+        return text
+
+    async def measure_last_answer(self, transcript: str) -> dict:
+        """Acoustic features of the last spoken answer, computed off the event loop; {} for typed answers"""
+        audio = self.last_audio
+        if audio is None:
+            return {}
+        return await asyncio.to_thread(features_from_pcm, audio.frame_data, audio.sample_rate,
+                                       audio.sample_width, transcript)
 
     def clear_response(self):
-        """Clear the stored response"""
-        self._last_response = None
-        self._response_event.clear()
+        """Drop typed answers and client audio that have not been read yet"""
+        self.text_input.clear()
+        self.audio_input.clear()
 
 
 class InterviewCoachAgent:
@@ -138,45 +202,47 @@ class InterviewCoachAgent:
         self.voice = VoiceInterface()
         self.storage = FileStorage()
         self.dashboard = InterviewDashboard()
-        self.question_banks = self._load_question_banks()
+        self.question_store = get_question_store()
+        self.bank: Optional[RoleBank] = None
+        self.extra_questions: Dict[str, List[str]] = {}
+        self.sampler = get_question_sampler()
+        self.user_exposure: Dict[str, int] = {}
+        self.reference_scorer = ReferenceScorer()
+        self.state: Optional[InterviewState] = None  # The running interview, for checkpoints
+        # Receives (type, data) events such as provisional scores, e.g. to forward to the client
+        self.on_event: Optional[Callable[[str, Dict], Awaitable[None]]] = None
         self.workflow = self._create_workflow()
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
-    def _load_question_banks(self) -> Dict:
-        banks = {
-            "software_engineer": {
-                "intro": ["Tell me about yourself.", "Why do you want to work in software engineering?"],
-                "technical": {
-                    "junior": ["What is a list in Python?", "Explain APIs."],
-                    "mid": ["Explain the difference between a list and a tuple in Python.",
-                            "How would you optimize a slow SQL query?"],
-                    "senior": ["Design a scalable microservices architecture.", "Explain the CAP theorem."]
-                },
-                "behavioral": ["Describe a time you faced a challenging bug.", "Tell me about a team project."]
-            }
-        }
-        for bank_file in Config.QUESTION_BANKS_DIR.glob("*.json"):
-            try:
-                with open(bank_file, 'r') as f:
-                    bank_data = json.load(f)
-                    banks[bank_file.stem] = bank_data
-                    logging.debug(f"Loaded question bank: {bank_file.stem}")
-            except Exception as e:
-                logging.warning(f"Failed to load question bank {bank_file}: {e}")
-        return banks
-
-    def _create_workflow(self):
+        self._resume_workflow = None
+
+    def _next_question(self, state: InterviewState, phase: str, level: Optional[str] = None) -> Optional[str]:
+        """A question not yet asked this session, from the bank or the session's tailored questions"""
+        asked = {question_hash(q["question"]) for q in state.question_history}
+        extras = [q for q in self.extra_questions.get(slot_key(phase, level), []) if question_hash(q) not in asked]
+        slot_size = len(self.bank.ids(phase, level)) if self.bank else 0
+        if extras and random.random() < len(extras) / (len(extras) + slot_size):
+            return random.choice(extras)
+        return self.sampler.draw(self.bank, phase, level, asked, self.user_exposure)
+
+    def _create_workflow(self, resume: bool = False):
         workflow = StateGraph(InterviewStateDict)
-        workflow.add_node("initialize", self.initialize_interview)
-        workflow.add_node("analyze_resume", self.analyze_resume)
-        workflow.add_node("ask_intro", self.ask_intro_question)
-        workflow.add_node("ask_technical", self.ask_technical_question)
-        workflow.add_node("ask_behavioral", self.ask_behavioral_question)
-        workflow.add_node("evaluate", self.evaluate_response)
-        workflow.add_node("closing", self.handle_closing)
-
-        workflow.add_edge("initialize", "analyze_resume")
-        workflow.add_edge("analyze_resume", "ask_intro")
+
+        def add_node(name, node):
+            workflow.add_node(name, traced(f"node.{name}")(node))
+
+        if resume:
+            add_node("resume", self.resume_interview)
+        else:
+            add_node("initialize", self.initialize_interview)
+            add_node("analyze_resume", self.analyze_resume)
+        add_node("ask_intro", self.ask_intro_question)
+        add_node("ask_technical", self.ask_technical_question)
+        add_node("ask_behavioral", self.ask_behavioral_question)
+        add_node("evaluate", self.evaluate_response)
+        add_node("closing", self.handle_closing)
+
+        if not resume:
+            workflow.add_edge("initialize", "analyze_resume")
+            workflow.add_edge("analyze_resume", "ask_intro")
         workflow.add_edge("ask_intro", "evaluate")
         workflow.add_edge("ask_technical", "evaluate")
         workflow.add_edge("ask_behavioral", "evaluate")
@@ -190,8 +256,20 @@ class InterviewCoachAgent:
                 "closing": "closing"
             }
         )
+        if resume:
+            workflow.add_conditional_edges(
+                "resume",
+                self.decide_resume_step,
+                {
+                    "evaluate": "evaluate",
+                    "intro": "ask_intro",
+                    "technical": "ask_technical",
+                    "behavioral": "ask_behavioral",
+                    "closing": "closing"
+                }
+            )
         workflow.add_edge("closing", END)
-        workflow.set_entry_point("initialize")
+        workflow.set_entry_point("resume" if resume else "initialize")
         return workflow.compile()
 
     async def initialize_interview(self, input: InterviewStateDict) -> InterviewStateDict:
@@ -200,13 +278,51 @@ class InterviewCoachAgent:
         state.question_history = []
         state.user_responses = []
         state.feedback = []
-
-        welcome_msg = AIMessage(content=f"Welcome to your {state.interview_type.replace('_', ' ')} mock interview. "
-                                        f"I'll be your AI coach today. This session is for {state.level} level. "
-                                        "Let's begin with some introductory questions.")
-        self.voice.speak(welcome_msg.content)
+        self.state = state
+        # The session keeps this bank for its whole run
+        self.bank = await asyncio.to_thread(self.question_store.get_role, state.interview_type)
+        self.extra_questions = {}
+        self.user_exposure = await asyncio.to_thread(self.storage.question_stats.get_user_exposure, state.user_id)
+        if Config.VOICE_ENABLED and Config.TTS_PREWARM:
+            self.voice.tts.prewarm(session_prompts(self.bank, state.level))
+
+        welcome_msg = AIMessage(content=welcome_message(state.interview_type, state.level))
+        await self.voice.speak(welcome_msg.content)
         return {"state": state, "messages": [welcome_msg]}
 
+    async def resume_interview(self, input: InterviewStateDict) -> InterviewStateDict:
+        """Pick up an interview restored from a snapshot, repeating the question it was waiting on"""
+        state = input["state"]
+        self.state = state
+        self.bank = await asyncio.to_thread(self.question_store.get_role, state.interview_type)
+        self.user_exposure = await asyncio.to_thread(self.storage.question_stats.get_user_exposure, state.user_id)
+
+        messages = []
+        if self._awaiting_answer(state):
+            messages.append(AIMessage(content=state.current_question))
+            await self.voice.speak(state.current_question)
+        return {"state": state, "messages": messages}
+
+    def _awaiting_answer(self, state: InterviewState) -> bool:
+        return bool(state.current_question) and len(state.user_responses) < len(state.question_history)
+
+    def decide_resume_step(self, input: InterviewStateDict) -> str:
+        if self._awaiting_answer(input["state"]):
+            return "evaluate"
+        return self.decide_next_phase(input)
+
+    def snapshot(self) -> Optional[Dict]:
+        """What another worker needs to resume this interview: its state and tailored questions"""
+        if self.state is None:
+            return None
+        return {"state": self.state.model_dump(mode="json"), "extra_questions": self.extra_questions}
+
+    def restore(self, snapshot: Dict) -> InterviewState:
+        """Load a snapshot taken by `snapshot()`; run the returned state with `run_interview(state, resume=True)`"""
+        self.extra_questions = {slot: list(questions) for slot, questions in snapshot.get("extra_questions", {}).items()}
+        self.state = InterviewState.model_validate(snapshot["state"])
+        return self.state
+
     async def analyze_resume(self, input: InterviewStateDict) -> InterviewStateDict:
         state = input["state"]
         messages = []
@@ -214,20 +330,10 @@ class InterviewCoachAgent:
             analyzer = ResumeAgent()
             try:
                 resume_data = await analyzer.extract_skills(state.resume_text)
-                tailored_questions = await analyzer.tailor_questions(resume_data, state.interview_type, state.level)
-
-                if state.interview_type in self.question_banks:
-                    if "technical" not in self.question_banks[state.interview_type]:
-                        self.question_banks[state.interview_type]["technical"] = {}
-                    if state.level not in self.question_banks[state.interview_type]["technical"]:
-                        self.question_banks[state.interview_type]["technical"][state.level] = []
-                    self.question_banks[state.interview_type]["technical"][state.level].extend(tailored_questions)
-                else:
-                    self.question_banks[state.interview_type] = {
-                        "intro": ["Tell me about yourself."],
-                        "technical": {state.level: tailored_questions},
-                        "behavioral": ["Describe a challenging situation you faced at work."]
-                    }
+                tailored_questions = await analyzer.tailor_questions(resume_data, state.interview_type, state.level,
+                                                                     bank=self.bank)
+
+                self.extra_questions.setdefault(slot_key("technical", state.level), []).extend(tailored_questions)
 
                 state.resume_data = resume_data
             except Exception as e:
@@ -239,10 +345,10 @@ class InterviewCoachAgent:
 
     async def ask_intro_question(self, input: InterviewStateDict) -> InterviewStateDict:
         state = input["state"]
-        question = random.choice(self.question_banks[state.interview_type][
-                                     "intro"]) if state.interview_type in self.question_banks else "Tell me about yourself."
+        question = self._next_question(state, "intro") or "Tell me about yourself."
         question_msg = AIMessage(content=question)
-        self.voice.speak(question)
+        self.voice.clear_response()  # Input sent before this question was asked answers nothing
+        await self.voice.speak(question)
 
         state.current_question = question
         state.current_phase = "intro"
@@ -256,10 +362,10 @@ class InterviewCoachAgent:
 
     async def ask_technical_question(self, input: InterviewStateDict) -> InterviewStateDict:
         state = input["state"]
-        question = random.choice(self.question_banks[state.interview_type]["technical"][
-                                     state.level]) if state.interview_type in self.question_banks else "Explain a technical concept."
+        question = self._next_question(state, "technical", state.level) or "Explain a technical concept."
         question_msg = AIMessage(content=question)
-        self.voice.speak(question)
+        self.voice.clear_response()  # Input sent before this question was asked answers nothing
+        await self.voice.speak(question)
 
         state.current_question = question
         state.current_phase = "technical"
@@ -273,10 +379,10 @@ class InterviewCoachAgent:
 
     async def ask_behavioral_question(self, input: InterviewStateDict) -> InterviewStateDict:
         state = input["state"]
-        question = random.choice(self.question_banks[state.interview_type][
-                                     "behavioral"]) if state.interview_type in self.question_banks else "Describe a challenging situation."
+        question = self._next_question(state, "behavioral") or "Describe a challenging situation."
         question_msg = AIMessage(content=question)
-        self.voice.speak(question)
+        self.voice.clear_response()  # Input sent before this question was asked answers nothing
+        await self.voice.speak(question)
 
         state.current_question = question
         state.current_phase = "behavioral"
@@ -299,27 +405,42 @@ class InterviewCoachAgent:
             response_text = "No response provided within time limit"
             logging.warning("Response timeout reached")
             # Add gentle timeout notice
-            timeout_msg = AIMessage(content="I didn't hear your response. Let's move to the next question.")
-            self.voice.speak(timeout_msg.content)
+            timeout_msg = AIMessage(content=TIMEOUT_MESSAGE)
+            await self.voice.speak(timeout_msg.content)
 
         processing_time = (datetime.now() - start_time).seconds
-        logging.debug(f"Response processing time: {processing_time} seconds")
+        logging.debug("Response processing time: %s seconds", processing_time)
+
+        audio_features = await self.voice.measure_last_answer(response_text)
 
         user_response = {
             "text": response_text,
-            "audio_features": {},
+            "audio_features": audio_features,
             "processing_time": processing_time,
             "timestamp": datetime.now().isoformat()
         }
         state.user_responses.append(user_response)
 
+        reference_score = None
+        reference = self.bank.reference(state.current_question) if self.bank else None
+        if reference and "No response provided within time limit" not in response_text:
+            reference_score = self.reference_scorer.score(response_text, reference)
+            await self._emit("provisional_score", {"question": state.current_question, **reference_score})
+        confident = reference_score if reference_score and \
+            reference_score["confidence"] >= Config.REFERENCE_CONFIDENT else None
+
         feedback_agent = FeedbackAgent()
         feedback = await feedback_agent.analyze_response(
             state.current_question,
             response_text,
-            {}
+            audio_features,
+            reference_score=confident
         )
-        feedback = self._validate_feedback(feedback, {})
+        feedback = self._validate_feedback(feedback, audio_features, response_text)
+        if reference_score:
+            feedback["reference_score"] = reference_score
+        if confident:
+            feedback["metrics"]["technical_accuracy"] = float(confident["technical_accuracy"])
         state.feedback.append(feedback)
 
         self._update_metrics(state, feedback)
@@ -336,7 +457,14 @@ class InterviewCoachAgent:
                          AIMessage(content=f"Feedback: {feedback.get('feedback', 'No feedback')}")]
         }
 
-    def _validate_feedback(self, feedback: Any, audio_features: dict) -> dict:
+    async def _emit(self, event_type: str, data: Dict):
+        if self.on_event:
+            try:
+                await self.on_event(event_type, data)
+            except Exception as e:
+                logging.error(f"Error emitting {event_type} event: {e}")
+
+    def _validate_feedback(self, feedback: Any, audio_features: dict, response_text: str = "") -> dict:
         default_feedback = {
             "feedback": "No detailed feedback available",
             "metrics": {"clarity": 5.0, "technical_accuracy": 5.0, "communication": 5.0},
@@ -348,7 +476,7 @@ class InterviewCoachAgent:
         }
 
         if not isinstance(feedback, dict):
-            return default_feedback
+            feedback = {}
 
         validated = {
             "feedback": str(feedback.get("feedback", default_feedback["feedback"])),
@@ -365,7 +493,15 @@ class InterviewCoachAgent:
                                                                                      "vocal_suggestions"]))
             }
         }
-        return validated
+        return self._apply_measured_vocals(validated, audio_features, response_text)
+
+    def _apply_measured_vocals(self, feedback: dict, audio_features: dict, response_text: str) -> dict:
+        """Prefer locally computed vocal feedback, or at least measured pace and confidence, over LLM estimates"""
+        if Config.LOCAL_VOCAL_FEEDBACK:
+            feedback["vocal_feedback"] = build_vocal_feedback(response_text, audio_features)
+        elif audio_features.get("speech_duration"):
+            feedback["vocal_feedback"]["vocal_metrics"].update(vocal_scores(audio_features))
+        return feedback
 
     def _update_metrics(self, state: InterviewState, feedback: Dict):
         for metric in ["clarity", "technical_accuracy", "communication"]:
@@ -377,34 +513,52 @@ class InterviewCoachAgent:
         state = input["state"]
         state.end_time = datetime.now()
 
-        closing_msg = AIMessage(content="We've reached the end of our session. Thank you for your time!")
-        self.voice.speak(closing_msg.content)
+        closing_msg = AIMessage(content=CLOSING_MESSAGE)
+        await self.voice.speak(closing_msg.content)
 
         feedback_agent = FeedbackAgent()
         summary = await feedback_agent.generate_summary_report(state)
 
-        interview_data = {
+        interview_data = self._interview_data(state)
+        interview_data['summary'] = summary
+        # Writes JSON and updates question statistics in SQLite; kept off the event loop
+        await asyncio.to_thread(self.storage.save_interview, interview_data)
+
+        return {
+            "state": state,
+            "messages": [closing_msg, AIMessage(content=f"Summary: {summary.get('overview', 'No summary')}")],
+            "summary": summary
+        }
+
+    def _interview_data(self, state: InterviewState) -> Dict:
+        return {
             'interview_id': state.interview_id,
             'user_id': state.user_id,
             'interview_type': state.interview_type,
             'level': state.level,
-            'start_time': state.start_time.isoformat(),
-            'end_time': state.end_time.isoformat(),
+            'start_time': state.start_time.isoformat() if state.start_time else None,
+            'end_time': state.end_time.isoformat() if state.end_time else None,
             'questions': [{
                 'question': q['question'],
                 'phase': q['phase'],
                 'response': r['text'],
+                'processing_time': r.get('processing_time'),
                 'feedback': f
-            } for q, r, f in zip(state.question_history, state.user_responses, state.feedback)],
-            'summary': summary
+            } for q, r, f in zip(state.question_history, state.user_responses, state.feedback)]
         }
-        self.storage.save_interview(interview_data)
 
-        return {
-            "state": state,
-            "messages": [closing_msg, AIMessage(content=f"Summary: {summary.get('overview', 'No summary')}")],
-            "summary": summary
-        }
+    def checkpoint(self) -> bool:
+        """Save the unfinished interview so an abandoned session can be released without losing it"""
+        if self.state is None or self.state.end_time is not None:
+            return False
+        interview_data = self._interview_data(self.state)
+        interview_data.update({
+            'status': 'abandoned',
+            'current_phase': self.state.current_phase,
+            'current_question': self.state.current_question,
+            'checkpoint_time': datetime.now().isoformat()
+        })
+        return self.storage.save_checkpoint(interview_data)
 
     def decide_next_phase(self, input: InterviewStateDict) -> str:
         state = input["state"]
@@ -420,17 +574,22 @@ class InterviewCoachAgent:
             return "behavioral"
         return "closing"
 
-    async def run_interview(self, initial_state: InterviewState):
+    async def run_interview(self, initial_state: InterviewState, resume: bool = False):
+        if resume and self._resume_workflow is None:
+            self._resume_workflow = self._create_workflow(resume=True)
+        workflow = self._resume_workflow if resume else self.workflow
         try:
             inputs = {"state": initial_state, "messages": []}
-            async for output in self.workflow.astream(inputs):
-                yield {
-                    "messages": output.get("messages", []),
-                    "state": output.get("state", initial_state),
-                    "feedback": output.get("state", initial_state).feedback[-1] if output.get("state",
-                                                                                              initial_state).feedback else {},
-                    "summary": output.get("summary", None)
-                }
+            async for chunk in workflow.astream(inputs):
+                # Each chunk maps the node that just ran to the update it returned
+                for output in chunk.values():
+                    yield {
+                        "messages": output.get("messages", []),
+                        "state": output.get("state", initial_state),
+                        "feedback": output.get("state", initial_state).feedback[-1] if output.get("state",
+                                                                                                  initial_state).feedback else {},
+                        "summary": output.get("summary", None)
+                    }
         except Exception as e:
             logging.error(f"Interview error: {e}")
             yield {
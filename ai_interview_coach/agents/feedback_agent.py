@@ -5,14 +5,17 @@ import logging
 import json
 import re
 import asyncio
-from typing import Dict, Any, Union
+from typing import Callable, Dict, Any, Optional, Union
 from models.interview_state import InterviewState
+from utils.resources import tracked_llm_call
 
 
 class FeedbackAgent:
     def __init__(self):
         self.llm = ChatOpenAI(api_key=Config.OPENAI_API_KEY, model="gpt-4-turbo", max_tokens=1000)
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.content_llm = ChatOpenAI(api_key=Config.OPENAI_API_KEY, model="gpt-4-turbo",
+                                      max_tokens=Config.FEEDBACK_CONTENT_MAX_TOKENS)
+        self.last_usage: Dict[str, int] = {}
 
     def _process_metric(self, value: Union[int, float, str]) -> float:
         """Convert any metric value to float with error handling."""
@@ -21,7 +24,20 @@ class FeedbackAgent:
         except (ValueError, TypeError):
             return 5.0  # Default neutral score
 
-    async def analyze_response(self, question: str, response_text: str, audio_features: dict) -> dict:
+    async def analyze_response(self, question: str, response_text: str, audio_features: dict,
+                               local_vocals: Optional[bool] = None, reference_score: Optional[dict] = None) -> dict:
+        """Grade a response; with `local_vocals` the LLM only returns content feedback and metrics.
+
+        A confident `reference_score` already settles technical_accuracy, so the
+        content prompt then only asks for clarity and communication.
+        """
+        if local_vocals is None:
+            local_vocals = Config.LOCAL_VOCAL_FEEDBACK
+        if local_vocals and reference_score:
+            return await self._analyze_with_reference(question, response_text, reference_score)
+        if local_vocals:
+            return await self._analyze_content(question, response_text)
+
         prompt = ChatPromptTemplate.from_template("""
             Analyze the user's response to the interview question and provide feedback in valid JSON format.
             Question: {question}
@@ -53,60 +69,130 @@ class FeedbackAgent:
             - If audio features are empty, use default scores of 5
         """)
 
-        for attempt in range(3):
+        feedback = await self._invoke_json(prompt | self.llm, {
+            "question": question,
+            "response_text": response_text,
+            "audio_features": json.dumps(audio_features)
+        }, "llm.feedback", self._parse_feedback, strip_comments=True)
+        return feedback if feedback is not None else self._get_default_feedback(audio_features)
+
+    def _parse_feedback(self, feedback: dict) -> dict:
+        feedback["metrics"] = self._process_content_metrics(feedback)
+
+        # Process vocal feedback
+        if not isinstance(feedback.get("vocal_feedback"), dict):
+            feedback["vocal_feedback"] = {
+                "vocal_feedback": str(feedback.get("vocal_feedback", "No vocal feedback")),
+                "vocal_metrics": {},
+                "vocal_suggestions": []
+            }
+
+        feedback["vocal_feedback"]["vocal_metrics"] = {
+            "pace": self._process_metric(feedback["vocal_feedback"].get("vocal_metrics", {}).get("pace", 5)),
+            "confidence": self._process_metric(
+                feedback["vocal_feedback"].get("vocal_metrics", {}).get("confidence", 5)),
+            "filler_words": self._process_metric(
+                feedback["vocal_feedback"].get("vocal_metrics", {}).get("filler_words", 0))
+        }
+
+        if not isinstance(feedback["vocal_feedback"].get("vocal_suggestions"), list):
+            feedback["vocal_feedback"]["vocal_suggestions"] = [
+                "Ensure clear and structured responses."
+            ]
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Processed feedback: %s", json.dumps(feedback, indent=2))
+        return feedback
+
+    async def _analyze_content(self, question: str, response_text: str) -> dict:
+        prompt = ChatPromptTemplate.from_template("""
+            Grade the content of the user's answer to the interview question.
+            Question: {question}
+            Response: {response_text}
+
+            Return only raw JSON, numbers 0-10:
+            {{"feedback": "2-4 sentences on content and quality", "metrics": {{"clarity": 7, "technical_accuracy": 8, "communication": 6}}}}
+        """)
+
+        def parse(feedback: dict) -> dict:
+            return {
+                "feedback": str(feedback.get("feedback", "No detailed feedback available")),
+                "metrics": self._process_content_metrics(feedback)
+            }
+
+        feedback = await self._invoke_json(prompt | self.content_llm,
+                                           {"question": question, "response_text": response_text},
+                                           "llm.content_feedback", parse)
+        if feedback is None:
+            default = self._get_default_feedback({})
+            return {"feedback": default["feedback"], "metrics": default["metrics"]}
+        return feedback
+
+    async def _analyze_with_reference(self, question: str, response_text: str, reference_score: dict) -> dict:
+        prompt = ChatPromptTemplate.from_template("""
+            Grade the clarity and communication of the user's answer to the interview question.
+            Technical accuracy was already scored {technical_accuracy}/10 against a reference answer.
+            Key points missed: {missed_points}
+            Question: {question}
+            Response: {response_text}
+
+            Return only raw JSON, numbers 0-10:
+            {{"feedback": "1-2 sentences, mentioning any missed key points", "metrics": {{"clarity": 7, "communication": 6}}}}
+        """)
+
+        def parse(feedback: dict) -> dict:
+            metrics = self._process_content_metrics(feedback)
+            metrics["technical_accuracy"] = float(reference_score["technical_accuracy"])
+            return {
+                "feedback": str(feedback.get("feedback", "No detailed feedback available")),
+                "metrics": metrics
+            }
+
+        feedback = await self._invoke_json(prompt | self.content_llm, {
+            "question": question,
+            "response_text": response_text,
+            "technical_accuracy": reference_score["technical_accuracy"],
+            "missed_points": "; ".join(reference_score.get("missed_points", [])) or "none"
+        }, "llm.reference_feedback", parse)
+        if feedback is None:
+            default = self._get_default_feedback({})
+            default["metrics"]["technical_accuracy"] = float(reference_score["technical_accuracy"])
+            return {"feedback": default["feedback"], "metrics": default["metrics"]}
+        return feedback
+
+    async def _invoke_json(self, chain, inputs: Dict[str, Any], span_name: str, parse: Callable[[dict], dict],
+                           strip_comments: bool = False, attempts: int = 3) -> Optional[dict]:
+        """Call `chain` until its reply is JSON that `parse` accepts; None once every attempt has failed."""
+        for attempt in range(attempts):
             try:
-                chain = prompt | self.llm
-                result = await chain.ainvoke({
-                    "question": question,
-                    "response_text": response_text,
-                    "audio_features": json.dumps(audio_features)
-                })
-                response_text = result.content.strip()
-                logging.debug(f"Attempt {attempt + 1} - Raw LLM response: {response_text[:500]}...")
+                result = await tracked_llm_call(chain.ainvoke(inputs), span_name, attempt=attempt + 1)
+                self._record_usage(result)
+                content = result.content.strip()
+                logging.debug("Attempt %d - Raw LLM response: %.500s...", attempt + 1, content)
 
                 # Clean and validate JSON
-                response_text = re.sub(r'^```json\s*|\s*```$', '', response_text, flags=re.MULTILINE).strip()
-                response_text = re.sub(r'//.*?\n|/\*.*?\*/', '', response_text, flags=re.DOTALL).strip()
-
-                feedback = json.loads(response_text)
-
-                # Process metrics
-                feedback["metrics"] = {
-                    "clarity": self._process_metric(feedback.get("metrics", {}).get("clarity", 5)),
-                    "technical_accuracy": self._process_metric(
-                        feedback.get("metrics", {}).get("technical_accuracy", 5)),
-                    "communication": self._process_metric(feedback.get("metrics", {}).get("communication", 5))
-                }
-
-                # Process vocal feedback
-                if not isinstance(feedback.get("vocal_feedback"), dict):
-                    feedback["vocal_feedback"] = {
-                        "vocal_feedback": str(feedback.get("vocal_feedback", "No vocal feedback")),
-                        "vocal_metrics": {},
-                        "vocal_suggestions": []
-                    }
-
-                feedback["vocal_feedback"]["vocal_metrics"] = {
-                    "pace": self._process_metric(feedback["vocal_feedback"].get("vocal_metrics", {}).get("pace", 5)),
-                    "confidence": self._process_metric(
-                        feedback["vocal_feedback"].get("vocal_metrics", {}).get("confidence", 5)),
-                    "filler_words": self._process_metric(
-                        feedback["vocal_feedback"].get("vocal_metrics", {}).get("filler_words", 0))
-                }
-
-                if not isinstance(feedback["vocal_feedback"].get("vocal_suggestions"), list):
-                    feedback["vocal_feedback"]["vocal_suggestions"] = [
-                        "Ensure clear and structured responses."
-                    ]
-
-                logging.debug(f"Processed feedback: {json.dumps(feedback, indent=2)}")
-                return feedback
-
+                content = re.sub(r'^```json\s*|\s*```$', '', content, flags=re.MULTILINE).strip()
+                if strip_comments:
+                    content = re.sub(r'//.*?\n|/\*.*?\*/', '', content, flags=re.DOTALL).strip()
+                return parse(json.loads(content))
             except Exception as e:
                 logging.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                if attempt == 2:
-                    return self._get_default_feedback(audio_features)
-                await asyncio.sleep(1)
+                if attempt < attempts - 1:
+                    await asyncio.sleep(1)
+        return None
+
+    def _process_content_metrics(self, feedback: dict) -> dict:
+        metrics = feedback.get("metrics", {})
+        return {
+            "clarity": self._process_metric(metrics.get("clarity", 5)),
+            "technical_accuracy": self._process_metric(metrics.get("technical_accuracy", 5)),
+            "communication": self._process_metric(metrics.get("communication", 5))
+        }
+
+    def _record_usage(self, result):
+        self.last_usage = (getattr(result, "response_metadata", None) or {}).get("token_usage", {})
+        if self.last_usage:
+            logging.debug("Feedback token usage: %s", self.last_usage)
 
     def _get_default_feedback(self, audio_features: dict) -> dict:
         """Return default feedback structure when processing fails."""
@@ -144,14 +230,14 @@ class FeedbackAgent:
 
         try:
             chain = prompt | self.llm
-            result = await chain.ainvoke({"state": state.model_dump(mode='json')})
+            result = await tracked_llm_call(chain.ainvoke({"state": state.model_dump(mode='json')}), "llm.summary")
             response_text = result.content.strip()
             response_text = re.sub(r'^```json\s*|\s*```$', '', response_text, flags=re.MULTILINE).strip()
 
             summary = json.loads(response_text)
             summary["score"] = float(summary.get("score", 50))  # Ensure score is numeric
 
-            logging.debug(f"Summary report generated: {summary}")
+            logging.debug("Summary report generated: %s", summary)
             return summary
         except Exception as e:
             logging.error(f"Error generating summary report: {str(e)}")
@@ -4,38 +4,49 @@ from config import Config
 import logging
 import json
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional
 import asyncio
+from utils.question_store import RoleBank
+from utils.retrieval import relevant_questions
+from utils.skills import get_skill_extractor
+from utils.chunking import chunk_text
+from utils.resources import tracked_llm_call
 
 class ResumeAgent:
     def __init__(self):
         self.llm = ChatOpenAI(api_key=Config.OPENAI_API_KEY, model="gpt-4-turbo", max_tokens=1000)
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
     async def extract_skills(self, resume_text: str, retries: int = 5) -> Dict:
-        # Handle short or invalid resume text
-        if not resume_text or len(resume_text.strip()) < 10:
-            logging.warning("Resume text is too short or empty, using default skills")
-            return {
-                "skills": ["Python", "JavaScript", "SQL"],
-                "tools": ["Django", "React", "Flutter"],
-                "technologies": ["RESTful APIs", "AI"]
-            }
-
-        # Append additional resume text
-        additional_resume = (
-            "Skilled in data preprocessing, model training, and visualization using tools like Pandas, "
-            "Scikit-learn, and Power BI. Experienced in full-stack development and cloud architecture."
-        )
-        full_resume = f"{resume_text.strip()}\n\n{additional_resume.strip()}"
-
-        # Validate and truncate resume text
-        if len(full_resume) > 4000:
-            logging.warning(f"Resume text too long ({len(full_resume)} chars), truncating to 4000 chars")
-            full_resume = full_resume[:4000]
-        full_resume = full_resume.replace('\r', '').replace('\n\n', '\n').strip()
-        logging.debug(f"Sanitized resume text (first 200 chars): {full_resume[:200]}...")
-
+        """Skills, tools and technologies from the local taxonomy, optionally enriched by the LLM."""
+        extractor = get_skill_extractor()
+        skills_data = extractor.extract(resume_text or "")
+        logging.debug("Locally extracted skills: %s", skills_data)
+        if not Config.RESUME_LLM_ENRICHMENT or not resume_text or len(resume_text.strip()) < 10:
+            return skills_data
+
+        llm_skills = await self._extract_skills_llm(resume_text, retries)
+        return extractor.merge(skills_data, llm_skills) if llm_skills else skills_data
+
+    async def _extract_skills_llm(self, resume_text: str, retries: int) -> Optional[Dict]:
+        """Map the resume's chunks through the LLM concurrently and merge the results locally."""
+        chunks = chunk_text(resume_text.replace('\r', ''), Config.RESUME_CHUNK_TOKENS)
+        logging.debug("Extracting skills from %d resume chunks", len(chunks))
+        semaphore = asyncio.Semaphore(Config.RESUME_EXTRACTION_CONCURRENCY)
+
+        async def extract(chunk: str) -> Optional[Dict]:
+            async with semaphore:
+                return await self._extract_chunk_skills(chunk, retries)
+
+        results = await asyncio.gather(*(extract(chunk) for chunk in chunks))
+        extractor = get_skill_extractor()
+        merged = None
+        for result in results:
+            if result:
+                merged = extractor.merge(merged or {}, result)
+        return merged
+
+    async def _extract_chunk_skills(self, chunk: str, retries: int) -> Optional[Dict]:
+        full_resume = chunk.strip()
         prompt = ChatPromptTemplate.from_template("""
             Extract skills, tools, and technologies from the resume.
             Resume: {resume_text}
@@ -46,18 +57,19 @@ class ResumeAgent:
         """)
 
         attempt = 0
+        response_text = ""
         while attempt < retries:
             attempt += 1
             try:
                 chain = prompt | self.llm
-                result = await chain.ainvoke({"resume_text": full_resume})
+                result = await tracked_llm_call(chain.ainvoke({"resume_text": full_resume}), "llm.resume_skills", attempt=attempt)
                 response_text = result.content.strip()
-                logging.debug(f"Raw LLM response (attempt {attempt}/{retries}): {response_text[:500]}...")
+                logging.debug("Raw LLM response (attempt %s/%s): %.500s...", attempt, retries, response_text)
 
                 # Strip Markdown and comments
                 response_text = re.sub(r'^```json\s*|\s*```$', '', response_text, flags=re.MULTILINE).strip()
                 response_text = re.sub(r'//.*?\n|/\*.*?\*/', '', response_text, flags=re.DOTALL).strip()
-                logging.debug(f"Cleaned response (first 200 chars): {response_text[:200]}...")
+                logging.debug("Cleaned response (first 200 chars): %.200s...", response_text)
 
                 # Validate JSON
                 if not response_text.startswith('{') or not response_text.endswith('}'):
@@ -75,7 +87,7 @@ class ResumeAgent:
                         logging.warning(f"Invalid {key} format, converting to list")
                         skills_data[key] = []
 
-                logging.debug(f"Extracted skills: {skills_data}")
+                logging.debug("Extracted skills: %s", skills_data)
                 return skills_data
 
             except Exception as e:
@@ -87,20 +99,29 @@ class ResumeAgent:
                         try:
                             matches = re.findall(r'"([^"]+)"', response_text)
                             partial_skills = [s for s in matches if s.lower() in full_resume.lower()]
-                            logging.debug(f"Partial skills extracted: {partial_skills}")
+                            logging.debug("Partial skills extracted: %s", partial_skills)
                         except Exception:
                             pass
 
-                    return {
-                        "skills": partial_skills or ["Python", "JavaScript", "SQL", "Machine Learning", "Data Preprocessing"],
-                        "tools": ["Flutter", "React Native", "Pandas", "Scikit-learn", "Power BI"],
-                        "technologies": ["RESTful APIs", "AI", "Data Visualization"]
-                    }
+                    return {"skills": partial_skills, "tools": [], "technologies": []} if partial_skills else None
                 await asyncio.sleep(2)
 
-    async def tailor_questions(self, resume_data: Dict, interview_type: str, level: str, retries: int = 5) -> List[str]:
+    async def tailor_questions(self, resume_data: Dict, interview_type: str, level: str, retries: int = 5,
+                               bank: Optional[RoleBank] = None) -> List[str]:
+        """Resume-relevant questions from the bank, topped up by the LLM only when too few match."""
+        questions = await asyncio.to_thread(relevant_questions, bank, resume_data, level)
+        if len(questions) >= Config.RETRIEVAL_MIN_MATCHES:
+            logging.debug("Retrieved %d resume-relevant bank questions, skipping generation", len(questions))
+            return questions
+
+        count = str(Config.TAILORED_QUESTION_COUNT - len(questions)) if questions else "3-5"
+        logging.debug("Retrieved %d resume-relevant bank questions, generating %s more", len(questions), count)
+        return questions + await self._generate_questions(resume_data, interview_type, level, retries, count)
+
+    async def _generate_questions(self, resume_data: Dict, interview_type: str, level: str, retries: int,
+                                  count: str) -> List[str]:
         prompt = ChatPromptTemplate.from_template("""
-            Generate 3-5 interview questions based on resume data, interview type, and level.
+            Generate {count} interview questions based on resume data, interview type, and level.
             Resume data: {resume_data}
             Interview type: {interview_type}
             Level: {level}
@@ -114,18 +135,19 @@ class ResumeAgent:
             attempt += 1
             try:
                 chain = prompt | self.llm
-                result = await chain.ainvoke({
+                result = await tracked_llm_call(chain.ainvoke({
                     "resume_data": json.dumps(resume_data),
                     "interview_type": interview_type,
-                    "level": level
-                })
+                    "level": level,
+                    "count": count
+                }), "llm.tailored_questions", attempt=attempt)
                 response_text = result.content.strip()
-                logging.debug(f"Raw LLM response for questions (attempt {attempt}/{retries}): {response_text[:500]}...")
+                logging.debug("Raw LLM response for questions (attempt %s/%s): %.500s...", attempt, retries, response_text)
 
                 # Strip Markdown and comments
                 response_text = re.sub(r'^```json\s*|\s*```$', '', response_text, flags=re.MULTILINE).strip()
                 response_text = re.sub(r'//.*?\n|/\*.*?\*/', '', response_text, flags=re.DOTALL).strip()
-                logging.debug(f"Cleaned response (first 200 chars): {response_text[:200]}...")
+                logging.debug("Cleaned response (first 200 chars): %.200s...", response_text)
 
                 # Validate JSON
                 if not response_text.startswith('{') or not response_text.endswith('}'):
@@ -137,15 +159,19 @@ class ResumeAgent:
                     logging.error(f"Invalid JSON structure on attempt {attempt}: {questions_data}")
                     raise ValueError("Invalid JSON structure from LLM")
 
-                logging.debug(f"Tailored questions: {questions_data['questions']}")
+                logging.debug("Tailored questions: %s", questions_data['questions'])
                 return questions_data["questions"]
 
             except Exception as e:
                 logging.error(f"Error generating questions on attempt {attempt}/{retries}: {e}")
                 if attempt == retries:
+                    # The local extractor may legitimately find nothing in a category
+                    skill = (resume_data.get('skills') or ["your strongest skill"])[0]
+                    tool = (resume_data.get('tools') or ["your main tools"])[0]
+                    technology = (resume_data.get('technologies') or ["an unfamiliar framework"])[0]
                     return [
-                        f"Explain how you used {resume_data['skills'][0]} in a project.",
-                        f"Describe your experience with {resume_data['tools'][0]} in {interview_type} development.",
-                        f"How do you approach learning a new technology like {resume_data['technologies'][0]}?"
+                        f"Explain how you used {skill} in a project.",
+                        f"Describe your experience with {tool} in {interview_type} development.",
+                        f"How do you approach learning a new technology like {technology}?"
                     ]
                 await asyncio.sleep(2)
\ No newline at end of file
@@ -1,44 +1,171 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from typing import Dict
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import HTTPException
+from typing import Optional
+import asyncio
 import json
-import os
 import logging
+import re
 import uuid
-from starlette.websockets import WebSocketState
 
 from langchain_core.messages import AIMessage
 
-from agents.coach_agent import InterviewCoachAgent
+from agents.coach_agent import InterviewCoachAgent, spoken_prompts
+from config import Config
 from models.interview_state import InterviewState, InterviewMetrics
 from models.user_profile import UserProfile
 from utils.storage import InterviewStorage
+from utils.file_storage import FileStorage
+from utils.assets import AssetStore
+from utils.reports import ReportRenderer
+from utils.profile_cache import ProfileCache
+from utils.tts import get_tts_worker
+from utils.question_store import BankWatcher, get_question_store
+from utils.sampler import get_question_sampler
+from utils.framing import FrameCodec, negotiate
+from utils.session import Session, SessionManager, SessionRunner
+from utils.session_registry import WORKER_ID, create_session_registry
+from utils.logging_setup import bind_log_context, configure_logging, logging_stats
+from utils.tracing import get_tracer, span, trace_id_for
+from utils.loop_monitor import get_loop_monitor
+
+# Configured once, before anything below logs; records are formatted and written by a listener thread
+configure_logging(log_file=Config.LOG_FILE)
 
 app = FastAPI()
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static files are fingerprinted, compressed and held in memory once, at import
+assets = AssetStore()
+reports = ReportRenderer()
+file_storage = FileStorage()
+session_registry = create_session_registry()
+session_manager = SessionManager(registry=session_registry)
+profile_cache = ProfileCache(InterviewStorage())
+bank_watcher = BankWatcher(get_question_store())
+
+
+@app.on_event("startup")
+async def prewarm_tts_cache():
+    if Config.VOICE_ENABLED and Config.TTS_PREWARM:
+        store = get_question_store()
+        roles = store.roles()
+        # Loading a bank reads its compiled file, so it happens off the event loop
+        banks = await asyncio.to_thread(lambda: [store.get_role(role) for role in roles])
+        questions = [question for bank in banks if bank is not None for question in bank.texts]
+        get_tts_worker().prewarm(spoken_prompts(roles) + questions)
+
+
+@app.on_event("startup")
+async def start_bank_watcher():
+    bank_watcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_bank_watcher():
+    await bank_watcher.stop()
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    if Config.LOOP_MONITOR_ENABLED:
+        get_loop_monitor().start()
+
 
-active_connections: Dict[str, WebSocket] = {}
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await get_loop_monitor().stop()
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+@app.on_event("startup")
+async def start_session_reaper():
+    session_manager.start()
+
+
+@app.on_event("shutdown")
+async def stop_session_reaper():
+    await session_manager.stop()
 
 
 @app.get("/", response_class=HTMLResponse)
-async def get_index():
-    with open(os.path.join("static", "index.html")) as f:
-        return HTMLResponse(content=f.read())
+async def get_index(request: Request):
+    return assets.page("index.html", request)
+
+
+@app.get("/static/{path:path}")
+async def get_static(path: str, request: Request):
+    return assets.serve(path, request)
+
+
+@app.get("/report/{interview_id}", response_class=HTMLResponse)
+async def get_report(interview_id: str, request: Request, token: str = ""):
+    # 404 rather than 403, so an unsigned request cannot tell which interviews exist
+    if not re.fullmatch(r"[\w-]+", interview_id) or not reports.verify(interview_id, token):
+        raise HTTPException(status_code=404)
+    report = reports.cached(interview_id)
+    if report is None:
+        interview = await asyncio.to_thread(file_storage.load_interview, interview_id)
+        if not interview or not interview.get("summary"):
+            raise HTTPException(status_code=404)
+        report = reports.report(interview)
+    return report.response(request)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        "profile_cache": profile_cache.stats(),
+        "tts": get_tts_worker().stats(),
+        "question_banks": bank_watcher.stats(),
+        "question_sampler": get_question_sampler().stats(),
+        "assets": assets.stats(),
+        "reports": reports.stats(),
+        "logging": logging_stats(),
+        "tracing": get_tracer().stats(),
+        "event_loop": get_loop_monitor().stats(),
+        "sessions": session_manager.stats(),
+        "workers": await asyncio.to_thread(session_registry.worker_loads)
+    }
+
+
+@app.get("/tts/{key}.wav")
+async def get_tts_audio(key: str):
+    if not re.fullmatch(r"[0-9a-f]{32}", key):
+        raise HTTPException(status_code=404)
+    path = get_tts_worker().cache_path(key)
+    if not path.exists():
+        raise HTTPException(status_code=404)
+    return FileResponse(path, media_type="audio/wav",
+                        headers={"Cache-Control": "public, max-age=31536000, immutable"})
 
 
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
-    await websocket.accept()
-    active_connections[client_id] = websocket
+    bind_log_context(client_id=client_id)
+    subprotocol = negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    session = await session_manager.reserve(client_id)
+    if session is None:
+        retry_after = session_manager.retry_after()
+        logging.warning(f"Rejecting client {client_id}: {session_manager.max_sessions} sessions active")
+        await websocket.send_text(json.dumps({"type": "busy", "message": "Server busy, please retry later",
+                                              "retry_after": retry_after}))
+        await websocket.close(code=1013)  # Try Again Later
+        return
+
+    try:
+        # Any worker may serve a reconnect; the previous owner releases the session on its next sync
+        previous_owner = await session_manager.claim(session)
+        if previous_owner and previous_owner != WORKER_ID:
+            logging.info(f"Client {client_id} moved here from worker {previous_owner}")
+        await run_session(websocket, client_id, session, FrameCodec(subprotocol))
+    finally:
+        await session_manager.finish(session)
+
+
+async def run_session(websocket: WebSocket, client_id: str, session: Session, codec: FrameCodec):
     coach = InterviewCoachAgent()
-    storage = InterviewStorage()
 
-    user_profile = storage.get_user_profile(client_id)
+    user_profile = await profile_cache.get(client_id)
     if not user_profile:
         user_profile = UserProfile(
             user_id=client_id,
@@ -48,80 +175,100 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
             current_level="mid",
             skills=[]
         )
-        storage.save_user_profile(user_profile)
+        await profile_cache.save(user_profile)
 
-    async def send_message(type, data):
-        try:
-            if websocket.application_state == WebSocketState.CONNECTED:
-                await websocket.send_text(json.dumps({"type": type, **data}))
-        except Exception as e:
-            logging.error(f"WebSocket send error: {e}")
+    async def handle_message(message):
+        nonlocal interview_task
+        if message["type"] == "start_interview":
+            if interview_task and not interview_task.done():
+                await runner.send("error", {"message": "Interview already in progress"})
+                return
+            snapshot = None
+            if message.get("resume"):
+                snapshot = await asyncio.to_thread(session_registry.load_snapshot, client_id)
+            if snapshot:
+                initial_state = coach.restore(snapshot)
+                await runner.send("resumed", {"interview_id": initial_state.interview_id,
+                                              "answered": len(initial_state.user_responses)})
+                interview_task = runner.spawn(run_interview(initial_state, resume=True))
+                return
+            initial_state = InterviewState(
+                interview_id=f"mock_{uuid.uuid4().hex[:8]}",
+                user_id=client_id,
+                interview_type=message.get("interview_type", "software_engineer"),
+                level=message.get("level", "mid"),
+                current_phase="intro",
+                current_question="",
+                question_history=[],
+                user_responses=[],
+                feedback=[],
+                metrics=InterviewMetrics(),
+                conversation_context="",
+                start_time=None,
+                end_time=None,
+                resume_text=message.get("resume_text", ""),
+                use_voice=False  # Disable voice recognition
+            )
+            interview_task = runner.spawn(run_interview(initial_state))
 
-    try:
-        while True:
-            try:
-                data = await websocket.receive_text()
-                message = json.loads(data)
-
-                if message["type"] == "start_interview":
-                    initial_state = InterviewState(
-                        interview_id=f"mock_{uuid.uuid4().hex[:8]}",
-                        user_id=client_id,
-                        interview_type=message.get("interview_type", "software_engineer"),
-                        level=message.get("level", "mid"),
-                        current_phase="intro",
-                        current_question="",
-                        question_history=[],
-                        user_responses=[],
-                        feedback=[],
-                        metrics=InterviewMetrics(),
-                        conversation_context="",
-                        start_time=None,
-                        end_time=None,
-                        resume_text=message.get("resume_text", ""),
-                        use_voice=False  # Disable voice recognition
-                    )
-
-                    async for step in coach.run_interview(initial_state):
-                        if websocket.application_state != WebSocketState.CONNECTED:
-                            break
-
-                        for msg in step.get("messages", []):
-                            if isinstance(msg, AIMessage) and not msg.content.startswith("Feedback:"):
-                                await send_message("question", {"question": msg.content})
-                            elif isinstance(msg, AIMessage) and msg.content.startswith("Feedback:"):
-                                await send_message("feedback", {"feedback": step.get("feedback", {})})
-
-                        if step.get("summary"):
-                            await send_message("summary", {"summary": step["summary"]})
-                            # Close connection with normal closure code
-                            if websocket.application_state == WebSocketState.CONNECTED:
-                                await websocket.close(code=1000)
-                            break  # Exit the interview loop
-
-                elif message["type"] == "response":
-                    # Directly process text responses without voice fallback
-                    if hasattr(coach, 'voice'):
-                        coach.voice._last_response = message["response"]
-                    await send_message("ack", {"message": "Response received"})
-
-                    # Force process the response immediately
-                    if hasattr(coach, 'process_text_response'):
-                        await coach.process_text_response(message["response"])
-
-            except WebSocketDisconnect:
-                logging.info(f"WebSocket disconnected for client {client_id}")
-                break
-            except Exception as e:
-                logging.error(f"WebSocket error: {e}")
-                await send_message("error", {"message": str(e)})
-                break
+        elif message["type"] == "audio_end":
+            coach.voice.end_audio()
 
-    finally:
-        if client_id in active_connections:
-            del active_connections[client_id]
-        if websocket.application_state != WebSocketState.DISCONNECTED:
+        elif message["type"] == "response":
+            # Wakes the interview's pending wait_for_response immediately
+            coach.voice.set_response(message["response"])
+            await runner.send("ack", {"message": "Response received"})
+
+    async def save_snapshot():
+        snapshot = coach.snapshot()
+        if snapshot and not await asyncio.to_thread(session_registry.save_snapshot, client_id, WORKER_ID, snapshot):
+            logging.warning(f"Session for client {client_id} is owned by another worker; snapshot not saved")
+
+    async def run_interview(initial_state: InterviewState, resume: bool = False):
+        """Stream the interview to the client; runs beside the reader so answers arrive while it waits"""
+        bind_log_context(interview_id=initial_state.interview_id)
+        # Every span of the interview, on this worker or one it is resumed on, shares this trace
+        with span("interview", trace_id=trace_id_for(initial_state.interview_id),
+                  interview_id=initial_state.interview_id, client_id=client_id, resumed=resume) as interview_span:
+            runner.trace_parent = interview_span
             try:
-                await websocket.close()
+                async for step in coach.run_interview(initial_state, resume=resume):
+                    for msg in step.get("messages", []):
+                        if isinstance(msg, AIMessage) and not msg.content.startswith("Feedback:"):
+                            question = {"question": msg.content}
+                            if Config.VOICE_ENABLED and Config.TTS_MODE == "client":
+                                audio_key = await coach.voice.synthesize(msg.content)
+                                if audio_key:
+                                    question["audio_url"] = f"/tts/{audio_key}.wav"
+                            await runner.send("question", question)
+                        elif isinstance(msg, AIMessage) and msg.content.startswith("Feedback:"):
+                            await runner.send("feedback", {"feedback": step.get("feedback", {})})
+
+                    # Lets another worker resume from this step if the client reconnects there
+                    await save_snapshot()
+
+                    if step.get("summary"):
+                        await asyncio.to_thread(session_registry.discard, client_id)
+                        await runner.send("summary", {"summary": step["summary"],
+                                                      "report_url": reports.url(coach.state.interview_id)})
+                        # Close connection with normal closure code once the summary is sent
+                        await runner.close(code=1000)
+                        break  # Exit the interview loop
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logging.error(f"Error closing WebSocket: {e}")
\ No newline at end of file
+                logging.error(f"Interview error for client {client_id}: {e}")
+                await runner.send("error", {"message": str(e)})
+
+    async def send_partial_transcript(text):
+        await runner.send("partial_transcript", {"text": text}, droppable=True)
+
+    interview_task: Optional[asyncio.Task] = None
+    # Binary frames carry 16 kHz 16-bit mono PCM of a spoken answer
+    runner = SessionRunner(websocket, handle_message, on_audio=coach.voice.feed_audio, codec=codec)
+    coach.voice.on_partial = send_partial_transcript
+    coach.on_event = runner.send
+    session.runner, session.coach = runner, coach
+
+    await runner.run()
+    logging.info(f"WebSocket session ended for client {client_id}")
\ No newline at end of file
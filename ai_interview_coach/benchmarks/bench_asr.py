@@ -0,0 +1,67 @@
+"""Offline ASR latency/throughput benchmark using the local WAV-fixture backend.
+
+Run from the project directory:  python -m benchmarks.bench_asr [FIXTURES_DIR]
+
+No recordings ship with the app. Without FIXTURES_DIR the benchmark generates
+synthetic answers; to measure real speech, pass a directory of 16 kHz 16-bit
+mono NAME.wav recordings, each with its transcript in NAME.txt.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Optional
+from utils.voice import LocalASRBackend
+from tests.audio_fixtures import write_answer_wav
+
+CHUNK_BYTES = 3200  # 100 ms of 16 kHz 16-bit mono audio
+
+
+async def _stream(frames: bytes):
+    for i in range(0, len(frames), CHUNK_BYTES):
+        yield frames[i:i + CHUNK_BYTES]
+
+
+async def run(n_fixtures: int = 20, fixtures_dir: Optional[Path] = None):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if fixtures_dir is None:
+            for i in range(n_fixtures):
+                path = write_answer_wav(tmp / f"answer_{i}.wav", speech_segments=(1.0 + i % 3, 0.8), seed=i)
+                path.with_suffix(".txt").write_text(" ".join(f"word{j}" for j in range(20 + i)))
+        fixtures_dir = fixtures_dir or tmp
+        backend = LocalASRBackend(fixtures_dir=fixtures_dir)
+        wav_paths = [p for p in sorted(fixtures_dir.glob("*.wav")) if p.with_suffix(".txt").exists()]
+        if not wav_paths:
+            print(f"No NAME.wav + NAME.txt pairs in {fixtures_dir}")
+            return
+
+        audio_seconds = 0.0
+        final_latencies = []
+        partials = 0
+        start = time.perf_counter()
+        for wav_path in wav_paths:
+            with wave.open(str(wav_path), "rb") as f:
+                frames = f.readframes(f.getnframes())
+            audio_seconds += len(frames) / (16000 * 2)
+            last_chunk = time.perf_counter()
+            async for transcript in backend.transcribe(_stream(frames)):
+                if transcript.is_final:
+                    final_latencies.append(time.perf_counter() - last_chunk)
+                else:
+                    partials += 1
+                    last_chunk = time.perf_counter()
+        elapsed = time.perf_counter() - start
+
+    print(f"utterances:          {len(wav_paths)}")
+    print(f"audio processed:     {audio_seconds:.1f}s in {elapsed * 1000:.1f}ms "
+          f"({audio_seconds / elapsed:.0f}x real time)")
+    print(f"partial transcripts: {partials}")
+    print(f"final latency:       mean {sum(final_latencies) / len(final_latencies) * 1e6:.0f}us "
+          f"max {max(final_latencies) * 1e6:.0f}us after the last partial")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(fixtures_dir=Path(sys.argv[1]) if len(sys.argv) > 1 else None))
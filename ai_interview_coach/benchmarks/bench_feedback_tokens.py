@@ -0,0 +1,52 @@
+"""Output-token comparison of the full feedback schema against the content-only schema.
+
+Uses the LLM feedback stored with past interviews as the "before" sample and the
+content-only subset of the same answers (what the model returns when vocal
+feedback is computed locally) as the "after" sample.
+
+Run from the project directory:  python -m benchmarks.bench_feedback_tokens
+"""
+import json
+import statistics
+from pathlib import Path
+from config import Config
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+except Exception:  # tiktoken missing or its encoding cannot be downloaded
+    def count_tokens(text: str) -> int:
+        return max(1, len(text) // 4)
+
+
+def stored_feedback():
+    for path in sorted((Path(Config.STORAGE_DIR) / "interviews").glob("*.json")):
+        with open(path, 'r') as f:
+            interview = json.load(f)
+        for question in interview.get("questions", []):
+            feedback = question.get("feedback")
+            if isinstance(feedback, dict) and "vocal_feedback" in feedback:
+                yield feedback
+
+
+def main():
+    full, content = [], []
+    for feedback in stored_feedback():
+        full.append(count_tokens(json.dumps(feedback)))
+        content.append(count_tokens(json.dumps({"feedback": feedback.get("feedback", ""),
+                                                "metrics": feedback.get("metrics", {})})))
+    if not full:
+        print("No stored feedback found under", Path(Config.STORAGE_DIR) / "interviews")
+        return
+
+    print(f"{len(full)} stored answers")
+    print(f"full schema:   mean {statistics.mean(full):6.1f} tokens, max {max(full)}")
+    print(f"content-only:  mean {statistics.mean(content):6.1f} tokens, max {max(content)}")
+    print(f"output tokens saved: {1 - sum(content) / sum(full):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Filler detection benchmark on multi-thousand-word transcripts.
+
+Run from the project directory:  python -m benchmarks.bench_fillers
+"""
+import random
+import time
+from utils.analysis import FillerDetector
+
+VOCABULARY = ("the service cache was slow so we added an index and measured latency again before "
+              "rolling it out to production with a feature flag").split()
+FILLERS = ["um,", "uh", "like", "you know,", "I mean", "basically", "I think", "maybe"]
+
+
+def make_transcript(n_words: int, seed: int) -> str:
+    rng = random.Random(seed)
+    words = []
+    while len(words) < n_words:
+        words.append(rng.choice(FILLERS) if rng.random() < 0.08 else rng.choice(VOCABULARY))
+    return " ".join(words)
+
+
+def split_and_lookup(text: str) -> int:
+    """The previous approach: whitespace split plus per-token list membership."""
+    words = text.split()
+    return sum(1 for word in words if word.lower() in ["um", "uh", "like", "you know", "ah"])
+
+
+def timed(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    detector = FillerDetector()
+    for n_words in (2000, 5000, 20000):
+        text = make_transcript(n_words, seed=n_words)
+        old = timed(split_and_lookup, text)
+        new = timed(detector.detect, text)
+        counts_only = timed(detector.detect, text, False)
+        result = detector.detect(text)
+        print(f"{n_words:>6} words: split+lookup {old * 1000:6.2f}ms ({split_and_lookup(text)} fillers) | "
+              f"trie {new * 1000:6.2f}ms, counts only {counts_only * 1000:6.2f}ms "
+              f"({result['filler_count']} fillers, {result['hedge_count']} hedges)")
+
+    batch = [make_transcript(3000, seed=i) for i in range(200)]
+    elapsed = timed(detector.detect_batch, batch, repeat=3)
+    print(f"batch: {len(batch)} x 3000 words in {elapsed * 1000:.1f}ms "
+          f"({len(batch) * 3000 / elapsed / 1e6:.2f}M words/s)")
+
+
+if __name__ == "__main__":
+    main()
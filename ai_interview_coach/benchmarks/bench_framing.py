@@ -0,0 +1,82 @@
+"""Bytes, frames and encode time per interview for each websocket framing.
+
+Replays the messages of a seven-question voice interview, grouped by the graph
+step that produces them, through the original framing (one JSON object per
+frame) and the negotiated coach.json.v2 / coach.msgpack.v2 framings
+(coalesced steps, feedback as deltas).
+
+Run from the project directory:  python -m benchmarks.bench_framing
+"""
+import random
+import time
+from utils.framing import JSON_V2, MSGPACK_V2, FrameCodec, msgpack
+
+QUESTIONS = 7
+PARTIALS_PER_ANSWER = 6
+
+
+def feedback_message(rng, i):
+    return {"type": "feedback", "feedback": {
+        "feedback": f"Answer {i} covered the main idea but could go deeper into trade-offs and failure modes.",
+        "metrics": {"clarity": rng.choice([6.0, 7.0, 8.0]), "technical_accuracy": rng.choice([5.5, 7.0, 8.5]),
+                    "communication": 7.0, "confidence": 6.5, "pace": 8.0, "filler_words": rng.randint(0, 4)},
+        "vocal_feedback": {
+            "vocal_feedback": "Steady pace with a few filler words.",
+            "vocal_metrics": {"pace": 8.0, "confidence": 6.5, "filler_words": rng.randint(0, 4),
+                              "words_per_minute": rng.randint(120, 160), "long_pauses": rng.randint(0, 2)},
+            "vocal_suggestions": ["Pause briefly instead of saying 'um'.", "Keep a steady pace."]
+        },
+        "reference_score": {"technical_accuracy": 7.0, "coverage": 0.75, "similarity": 0.41, "confidence": 0.8,
+                            "matched_points": ["hashing", "collisions", "load factor"],
+                            "missed_points": ["resizing cost"]}
+    }}
+
+
+def interview_steps(seed=0):
+    """Messages of one interview, one list per graph step."""
+    rng = random.Random(seed)
+    steps = [[{"type": "question", "question": "Welcome to your software engineer mock interview."}]]
+    for i in range(QUESTIONS):
+        steps.append([{"type": "question", "question": f"Question {i}: how would you design a rate limiter?",
+                       "audio_url": f"/tts/{rng.getrandbits(128):032x}.wav"}])
+        words = "I would use a token bucket per client stored in Redis with a sliding window".split()
+        for n in range(1, PARTIALS_PER_ANSWER + 1):
+            steps.append([{"type": "partial_transcript", "text": " ".join(words[:n * 2])}])
+        steps.append([{"type": "provisional_score", "question": f"Question {i}", "technical_accuracy": 7.0,
+                       "coverage": 0.75, "similarity": 0.41, "confidence": 0.8,
+                       "matched_points": ["hashing", "collisions"], "missed_points": ["resizing cost"]},
+                      feedback_message(rng, i)])
+    steps.append([{"type": "summary", "summary": {
+        "score": 72.0, "overview": "Solid fundamentals; go deeper on trade-offs.",
+        "strengths": ["Clear structure", "Good examples"], "recommendations": ["Quantify impact"]}}])
+    return steps
+
+
+def measure(subprotocol, steps, repeat=200):
+    elapsed, stats = 0.0, None
+    for _ in range(repeat):
+        codec = FrameCodec(subprotocol)
+        start = time.perf_counter()
+        for step in steps:
+            codec.encode(step)
+        elapsed += time.perf_counter() - start
+        stats = codec.stats()
+    return stats, elapsed / repeat
+
+
+def main():
+    steps = interview_steps()
+    print(f"{sum(len(s) for s in steps)} messages in {len(steps)} steps per interview")
+    protocols = [None, JSON_V2] + ([MSGPACK_V2] if msgpack is not None else [])
+    baseline = None
+    for subprotocol in protocols:
+        stats, seconds = measure(subprotocol, steps)
+        baseline = baseline or stats["bytes"]
+        print(f"{stats['protocol']:>17}: {stats['bytes']:6d} bytes ({stats['bytes'] / baseline:5.1%}) "
+              f"in {stats['frames']:3d} frames, encode {seconds * 1e6:7.1f}us per interview")
+    if msgpack is None:
+        print("msgpack not installed; binary framing skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Startup cost of eagerly loading every bank versus the compiled, lazily loaded store.
+
+Generates synthetic banks in a temporary directory, then measures the time and
+peak memory to get one role's questions ready for an interview.
+
+Run from the project directory:  python -m benchmarks.bench_question_store
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from utils.question_store import LEVELS, QuestionStore, compile_banks
+
+ROLES = 40
+QUESTIONS_PER_SLOT = 1200
+
+
+def write_banks(directory: Path):
+    for r in range(ROLES):
+        bank = {
+            "intro": [f"Role {r} intro question {i} about your background?" for i in range(QUESTIONS_PER_SLOT)],
+            "technical": {level: [f"Role {r} {level} technical question {i} on systems and data?"
+                                  for i in range(QUESTIONS_PER_SLOT)] for level in LEVELS},
+            "behavioral": [f"Role {r} behavioral question {i} about teamwork?" for i in range(QUESTIONS_PER_SLOT)]
+        }
+        (directory / f"role_{r}.json").write_text(json.dumps(bank))
+
+
+def eager_load(directory: Path):
+    """The previous approach: json.load every bank file at coach start-up."""
+    banks = {}
+    for bank_file in directory.glob("*.json"):
+        with open(bank_file, 'r') as f:
+            banks[bank_file.stem] = json.load(f)
+    return banks["role_0"]["technical"]["mid"]
+
+
+def lazy_load(source_dir: Path, compiled_dir: Path):
+    return QuestionStore(source_dir, compiled_dir).get_role("role_0").questions("technical", "mid")
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir, compiled_dir = Path(tmp) / "banks", Path(tmp) / "compiled"
+        source_dir.mkdir()
+        write_banks(source_dir)
+        start = time.perf_counter()
+        manifest = compile_banks(source_dir, compiled_dir)
+        total = sum(entry["count"] for entry in manifest["roles"].values())
+        print(f"compiled {total} questions across {ROLES} roles in {time.perf_counter() - start:.2f}s")
+
+        for name, fn, args in (("eager json.load", eager_load, (source_dir,)),
+                               ("compiled + lazy", lazy_load, (source_dir, compiled_dir))):
+            elapsed, peak, count = measure(fn, *args)
+            print(f"{name:>16}: {elapsed * 1000:7.1f}ms, peak {peak / 2 ** 20:6.1f} MiB ({count} questions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Resume-to-question retrieval over a large synthetic technical bank.
+
+Run from the project directory:  python -m benchmarks.bench_retrieval
+"""
+import random
+import time
+from utils.retrieval import RetrievalIndex, resume_query
+
+TOPICS = ("python django flask postgresql mysql redis kafka kubernetes docker terraform aws gcp react "
+          "typescript node.js graphql rest grpc spark pandas pytorch tensorflow airflow c++ rust go java "
+          "spring microservices caching sharding replication observability").split()
+TEMPLATES = ["How would you scale {a} when {b} becomes the bottleneck in a {c} stack?",
+             "Explain the trade-offs between {a} and {b} for a team using {c}.",
+             "Describe debugging a production incident involving {a}, {b} and {c}.",
+             "Design a system that uses {a} for ingestion, {b} for serving and {c} for deployment."]
+LEVELS = ["junior", "mid", "senior"]
+
+
+def main():
+    rng = random.Random(0)
+    n = 60000
+    texts = list(dict.fromkeys(
+        rng.choice(TEMPLATES).format(a=rng.choice(TOPICS), b=rng.choice(TOPICS), c=rng.choice(TOPICS))
+        for _ in range(n)))
+    n = len(texts)
+    labels = [rng.choice(LEVELS) for _ in range(n)]
+
+    start = time.perf_counter()
+    index = RetrievalIndex(texts, labels)
+    print(f"indexed {n} questions ({len(index.postings)} terms) in {time.perf_counter() - start:.2f}s")
+
+    resume = {"skills": ["Python", "PostgreSQL", "Caching"], "tools": ["Redis", "Docker", "Kafka"],
+              "technologies": ["Microservices", "REST"]}
+    query = resume_query(resume)
+    timings = []
+    for _ in range(50):
+        start = time.perf_counter()
+        results = index.search(query, k=5, min_score=0.15, label="mid")
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"query: median {timings[len(timings) // 2] * 1000:.2f}ms, p95 {timings[int(len(timings) * 0.95)] * 1000:.2f}ms")
+    for text, score in results:
+        print(f"  {score:.3f}  {text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Latency and recall of the local skill extractor on labelled sample resumes.
+
+With OPENAI_API_KEY set, the LLM extraction path is measured on the same
+resumes for comparison.
+
+Run from the project directory:  python -m benchmarks.bench_skills
+"""
+import asyncio
+import time
+from config import Config
+from utils.skills import CATEGORIES, SkillExtractor
+
+SAMPLES = [
+    ("""Jane Doe - Backend Engineer
+    6 years building Python/Django and FastAPI services backed by PostgreSQL and Redis. Migrated a monolith to
+    microservices on k8s with Terraform and GitHub Actions for CI/CD. Exposed REST and gRPC APIs, added
+    Prometheus and Grafana observability, and ran Kafka consumers on AWS.""",
+     {"Python", "Django", "FastAPI", "PostgreSQL", "Redis", "Microservices", "Kubernetes", "Terraform",
+      "GitHub Actions", "CI/CD", "RESTful APIs", "gRPC", "Prometheus", "Grafana", "Observability", "Kafka", "AWS"}),
+    ("""Data scientist with a background in statistics. Daily tools: py, pandas, NumPy, sklearn, XGBoost and
+    PyTorch for deep learning; NLP with Hugging Face and spaCy. Built forecasting models and A/B testing
+    frameworks, ETL with Airflow and dbt into Snowflake, dashboards in Power BI and Tableau.""",
+     {"Statistics", "Python", "Pandas", "NumPy", "Scikit-learn", "XGBoost", "PyTorch", "Deep Learning",
+      "Natural Language Processing", "Hugging Face", "spaCy", "Time Series Analysis", "A/B Testing", "ETL",
+      "Airflow", "dbt", "Snowflake", "Power BI", "Tableau"}),
+    ("""Mobile and web developer. Shipped React Native and Flutter apps for iOS and Android, a Next.js storefront in
+    TypeScript with GraphQL, and Node.js backends on Google Cloud with MongoDB. I go to meetups and rest on
+    weekends; I excel at mentoring. Familiar with Jest, Docker and Agile ceremonies.""",
+     {"React Native", "Flutter", "Mobile Development", "Next.js", "TypeScript", "GraphQL", "Node.js",
+      "Google Cloud", "MongoDB", "Jest", "Docker", "Agile"}),
+]
+
+
+def flatten(extraction):
+    return {name for category in CATEGORIES for name in extraction.get(category, [])}
+
+
+def score(found, expected):
+    hits = len(found & expected)
+    return hits / len(expected), hits / len(found) if found else 0.0
+
+
+def timed(fn, *args, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return (time.perf_counter() - start) / repeat, result
+
+
+async def llm_extract(text):
+    from agents.resume_agent import ResumeAgent
+    return await ResumeAgent()._extract_skills_llm(text, retries=1) or {}
+
+
+def main():
+    start = time.perf_counter()
+    extractor = SkillExtractor()
+    print(f"taxonomy compiled in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    for i, (text, expected) in enumerate(SAMPLES):
+        elapsed, found = timed(extractor.extract, text)
+        recall, precision = score(flatten(found), expected)
+        line = f"resume {i}: local {elapsed * 1e6:7.1f}us recall {recall:.2f} precision {precision:.2f}"
+        if Config.OPENAI_API_KEY:
+            llm_start = time.perf_counter()
+            llm_found = flatten(extractor.merge({}, asyncio.run(llm_extract(text))))
+            llm_recall, llm_precision = score(llm_found, expected)
+            line += (f" | llm {time.perf_counter() - llm_start:6.2f}s "
+                     f"recall {llm_recall:.2f} precision {llm_precision:.2f}")
+        print(line)
+
+    long_resume = " ".join(text for text, _ in SAMPLES) * 40
+    elapsed, _ = timed(extractor.extract, long_resume, repeat=20)
+    print(f"{len(long_resume.split())}-word resume: {elapsed * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
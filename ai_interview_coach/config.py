@@ -8,11 +8,84 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     DB_PATH = Path(__file__).parent / "data" / "interviews.db"
     QUESTION_BANKS_DIR = Path(__file__).parent / "question_banks"
+    QUESTION_BANKS_COMPILED_DIR = QUESTION_BANKS_DIR / "compiled"  # Output of `python -m utils.question_store build`
+    QUESTION_BANK_RELOAD_INTERVAL = 2.0  # Seconds between checks for edited bank files; 0 disables hot reload
+    QUESTION_EXPOSURE_ALPHA = 1.0  # Question weight is 1 / (1 + times seen) ** alpha
+    SAMPLER_MAX_REJECTIONS = 32  # Rejected draws before falling back to a scan of the remaining questions
+    TAILORED_QUESTION_COUNT = 5  # Resume-relevant questions added to a session
+    RETRIEVAL_MIN_SCORE = 0.15  # Cosine similarity a bank question needs to count as resume-relevant
+    RETRIEVAL_MIN_MATCHES = 3  # Fewer relevant bank questions than this are topped up by the LLM
+    KEY_POINT_MATCH = 0.6  # Share of a key point's words an answer must contain to cover it
+    REFERENCE_SIMILARITY_CEILING = 0.6  # Similarity to the reference answer treated as a perfect match
+    REFERENCE_CONFIDENT = 0.7  # Provisional scores this confident replace the LLM's technical_accuracy
+    SKILLS_TAXONOMY_PATH = Path(__file__).parent / "data" / "skills_taxonomy.json"
+    RESUME_LLM_ENRICHMENT = False  # Also ask the LLM for skills the taxonomy does not know
+    RESUME_CHUNK_TOKENS = 800  # Resume tokens sent per LLM extraction call
+    RESUME_EXTRACTION_CONCURRENCY = 4  # Chunk extraction calls in flight at once
     VOICE_ENABLED = True
     WEB_INTERFACE = True
     WEBSOCKET_HOST = "localhost"
     WEBSOCKET_PORT = 8765
+    STATIC_DIR = Path(__file__).parent / "static"
+    TEMPLATES_DIR = Path(__file__).parent / "templates"
+    ASSET_MIN_COMPRESS_BYTES = 512  # Smaller assets are served as-is; compression would barely pay for its header
+    REPORT_CACHE_SIZE = 256  # Rendered interview reports kept in memory per worker
+    REPORT_SECRET = os.getenv("REPORT_SECRET")  # Signs report URLs; unset uses a random key in REPORT_SECRET_PATH
+    REPORT_SECRET_PATH = Path(__file__).parent / "data" / "report_secret"
+    WS_OUTBOUND_QUEUE_SIZE = 64  # Messages buffered per session before senders wait for the client
+    WS_HEARTBEAT_INTERVAL = 15  # Seconds between application-level pings
+    WS_HEARTBEAT_TIMEOUT = 45  # Seconds without any client frame before the session is closed
+    WS_MAX_BATCH = 32  # Queued messages coalesced into one frame for clients that negotiated batching
+    MAX_SESSIONS = 50  # Concurrent interview sessions per worker; more are told to retry later
+    SESSION_IDLE_TIMEOUT = 300  # Seconds without client messages or audio before a session is checkpointed and closed
+    SESSION_REAP_INTERVAL = 30  # Seconds between idle-session sweeps
+    SESSION_RETRY_AFTER_MAX = 60  # Upper bound on the retry delay given to rejected clients
+    SESSION_REGISTRY = "sqlite"  # "sqlite" shares sessions between the workers of one host; "memory" is per process
+    SESSION_REGISTRY_PATH = Path(__file__).parent / "data" / "sessions.db"
+    SESSION_SNAPSHOT_TTL = 3600  # Seconds an abandoned interview can still be resumed
+    WORKER_LOAD_MAX_AGE = 90  # Workers that have not reported load for this long are considered gone
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE = Path("interview.log")  # JSON lines; rotated files are gzipped
+    LOG_MAX_BYTES = 10 * 1024 * 1024  # Log file size before rotation
+    LOG_BACKUP_COUNT = 5  # Rotated log files kept
+    LOG_JSON_CONSOLE = False  # Console gets text lines unless this is set
+    LOG_DEBUG_SAMPLE_BURST = 50  # DEBUG records kept per call site before sampling starts
+    LOG_DEBUG_SAMPLE_EVERY = 20  # After the burst, one DEBUG record in this many is kept per call site
+    TRACING_ENABLED = True  # Record spans for interviews, LLM calls, voice, storage and websocket sends
+    TRACE_FILE = Path(__file__).parent / "data" / "traces.jsonl"  # Read by `python -m utils.tracing INTERVIEW_ID`
+    TRACE_MAX_BYTES = 50 * 1024 * 1024  # Trace file size before it is moved to traces.jsonl.1
+    LOOP_MONITOR_ENABLED = True  # Measure event-loop lag in the server and capture the stack of blocking calls
+    LOOP_MONITOR_INTERVAL = 0.05  # Seconds between lag samples
+    LOOP_BLOCK_THRESHOLD = 0.1  # Seconds the loop may be stuck before the blocking stack is captured and logged
+    LOOP_LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)  # Upper bounds of the lag histogram buckets
+    LOOP_BLOCK_HISTORY = 20  # Captured blocking stacks kept for /metrics
     STORAGE_DIR = Path("interview_data")  # Directory to store all interviews
+    PROFILE_HISTORY_LIMIT = 20  # Interview history entries loaded with a user profile
+    PROFILE_CACHE_SIZE = 1024  # Validated profiles kept in memory per worker
+    PROFILE_CACHE_TTL = 300  # Seconds before a cached profile is re-read from the database
+    TTS_MODE = "local"  # "local" speaks on the server, "client" ships cached audio to the browser
+    TTS_CACHE_DIR = Path(__file__).parent / "data" / "tts_cache"
+    TTS_PREWARM = True  # Synthesize every bank question in the background at startup
+    TTS_RATE = 150
+    TTS_VOLUME = 0.9
+    VOICE_SAMPLE_RATE = 16000  # Microphone and client audio are 16-bit mono PCM at this rate
+    VOICE_CALIBRATION_DURATION = 1  # Seconds of ambient noise sampled when (re)calibrating
+    VOICE_CALIBRATION_DRIFT = 0.5  # Recalibrate when the energy threshold drifts this far from its baseline
+    VOICE_CALIBRATION_MAX_AGE = 600  # Seconds before calibration is refreshed regardless of drift
+    VOICE_LISTEN_POLL = 0.5  # Listening window; bounds how long a cancelled capture holds the microphone
+    ASR_BACKEND = "google"  # "google" or "local" (deterministic WAV fixtures, no network)
+    ASR_FIXTURES_DIR = Path(__file__).parent / "data" / "asr_fixtures"  # NAME.wav + NAME.txt pairs you record; none ship
+    FILLER_WORDS = ["um", "uh", "ah", "er", "hmm", "like", "you know", "i mean", "basically", "literally"]
+    HEDGE_WORDS = ["i think", "i guess", "i believe", "maybe", "probably", "perhaps", "sort of", "kind of",
+                   "not sure"]
+    ACOUSTIC_FRAME_MS = 30  # Analysis frame length for energy-based speech features
+    ACOUSTIC_MIN_PAUSE_MS = 250  # Shorter silences inside speech are not counted as pauses
+    IDEAL_WPM_RANGE = (120, 160)  # Speaking rate scored as a perfect pace
+    FILLER_RATE_LIMIT = 3.0  # Fillers or hedges per 100 words before a suggestion is given
+    LONG_PAUSE_SECONDS = 3.0
+    LOCAL_VOCAL_FEEDBACK = True  # Compute vocal metrics locally; the LLM only grades content
+    FEEDBACK_CONTENT_MAX_TOKENS = 400  # Output budget for the content-only feedback schema
+    ASR_PARTIAL_INTERVAL = 0  # Seconds of audio between partial transcripts from the Google backend; 0 disables
 
     @classmethod
     def validate(cls):
@@ -8,6 +8,8 @@ from models.user_profile import UserProfile
 from agents.coach_agent import InterviewCoachAgent
 from utils.storage import InterviewStorage
 from config import Config
+from utils.logging_setup import configure_logging
+from utils.tracing import span, trace_id_for
 
 load_dotenv()
 Config.validate()
@@ -15,9 +17,11 @@ Config.validate()
 
 async def run_interview(coach, initial_state):
     try:
-        async for output in coach.run_interview(initial_state):
-            for msg in output.get("messages", []):
-                print(f"{msg.__class__.__name__}: {msg.content}")
+        with span("interview", trace_id=trace_id_for(initial_state.interview_id),
+                  interview_id=initial_state.interview_id):
+            async for output in coach.run_interview(initial_state):
+                for msg in output.get("messages", []):
+                    print(f"{msg.__class__.__name__}: {msg.content}")
     except Exception as e:
         logging.error(f"Failed to run interview: {e}")
         print(f"Error: Failed to run interview: {e}")
@@ -25,15 +29,8 @@ async def run_interview(coach, initial_state):
 
 
 async def main():
-    # Configure logging with both file and console output
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('interview.log'),
-            logging.StreamHandler()
-        ]
-    )
+    # Console and rotated JSON log file, written by a listener thread
+    configure_logging(log_file=Config.LOG_FILE)
 
     print("=== AI Interview Coach Setup ===")
     interview_type = input("Enter interview type (e.g., software_engineer): ").strip().replace(" ",
@@ -43,7 +40,7 @@ async def main():
 
     resume_text = ""
     if resume_choice == "y":
-        print("Paste your resume text (max 4000 characters). Type 'END' on a new line and press Enter to finish:")
+        print("Paste your resume text. Type 'END' on a new line and press Enter to finish:")
         lines = []
         while True:
             line = input()
@@ -57,11 +54,7 @@ async def main():
             logging.error("Resume text is empty")
             print("Error: Resume text cannot be empty. Proceeding without resume.")
             resume_text = ""
-        elif len(resume_text) > 4000:
-            logging.warning(f"Resume text too long ({len(resume_text)} chars), truncating to 4000 chars")
-            resume_text = resume_text[:4000]
-            print("Warning: Resume truncated to 4000 characters.")
-        logging.debug(f"Resume text input (first 200 chars): {resume_text[:300]}...")
+        logging.debug("Resume text input (first 200 chars): %s...", resume_text[:200])
 
     user_id = f"user_{uuid.uuid4().hex[:8]}"
     storage = InterviewStorage()
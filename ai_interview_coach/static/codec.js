@@ -0,0 +1,95 @@
+// Decoding of server frames for the coach.msgpack.v2 and coach.json.v2 websocket subprotocols.
+// Only server-to-client frames are encoded this way; the client still sends JSON text.
+const CoachCodec = (function() {
+    const SUBPROTOCOLS = ['coach.msgpack.v2', 'coach.json.v2'];
+    const UNSET = '$unset';
+    const textDecoder = new TextDecoder();
+
+    // Minimal MessagePack decoder covering the types the server emits
+    function decodeMsgpack(buffer) {
+        const view = new DataView(buffer);
+        const bytes = new Uint8Array(buffer);
+        let offset = 0;
+
+        function str(length) {
+            const value = textDecoder.decode(bytes.subarray(offset, offset + length));
+            offset += length;
+            return value;
+        }
+        function array(length) {
+            const value = new Array(length);
+            for (let i = 0; i < length; i++) value[i] = read();
+            return value;
+        }
+        function map(length) {
+            const value = {};
+            for (let i = 0; i < length; i++) {
+                const key = read();
+                value[key] = read();
+            }
+            return value;
+        }
+        function read() {
+            const type = bytes[offset++];
+            if (type < 0x80) return type;
+            if (type < 0x90) return map(type & 0x0f);
+            if (type < 0xa0) return array(type & 0x0f);
+            if (type < 0xc0) return str(type & 0x1f);
+            if (type >= 0xe0) return type - 0x100;
+            let value;
+            switch (type) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xca: value = view.getFloat32(offset); offset += 4; return value;
+                case 0xcb: value = view.getFloat64(offset); offset += 8; return value;
+                case 0xcc: return bytes[offset++];
+                case 0xcd: value = view.getUint16(offset); offset += 2; return value;
+                case 0xce: value = view.getUint32(offset); offset += 4; return value;
+                case 0xcf: value = Number(view.getBigUint64(offset)); offset += 8; return value;
+                case 0xd0: value = view.getInt8(offset); offset += 1; return value;
+                case 0xd1: value = view.getInt16(offset); offset += 2; return value;
+                case 0xd2: value = view.getInt32(offset); offset += 4; return value;
+                case 0xd3: value = Number(view.getBigInt64(offset)); offset += 8; return value;
+                case 0xd9: value = bytes[offset]; offset += 1; return str(value);
+                case 0xda: value = view.getUint16(offset); offset += 2; return str(value);
+                case 0xdb: value = view.getUint32(offset); offset += 4; return str(value);
+                case 0xdc: value = view.getUint16(offset); offset += 2; return array(value);
+                case 0xdd: value = view.getUint32(offset); offset += 4; return array(value);
+                case 0xde: value = view.getUint16(offset); offset += 2; return map(value);
+                case 0xdf: value = view.getUint32(offset); offset += 4; return map(value);
+                default: throw new Error(`Unsupported MessagePack type 0x${type.toString(16)}`);
+            }
+        }
+        return read();
+    }
+
+    function applyDelta(previous, delta) {
+        const result = Object.assign({}, previous);
+        for (const key of delta[UNSET] || []) delete result[key];
+        for (const [key, value] of Object.entries(delta)) {
+            if (key === UNSET) continue;
+            const isObject = v => v && typeof v === 'object' && !Array.isArray(v);
+            result[key] = isObject(value) && isObject(result[key]) ? applyDelta(result[key], value) : value;
+        }
+        return result;
+    }
+
+    // Turns each frame into full messages, expanding deltas against the last message of the same type
+    function createDecoder() {
+        const lastByType = {};
+        return function decodeFrame(data) {
+            const payload = data instanceof ArrayBuffer ? decodeMsgpack(data) : JSON.parse(data);
+            const messages = Array.isArray(payload) ? payload : [payload];
+            return messages.map(message => {
+                if (message.delta) {
+                    message = applyDelta(lastByType[message.type] || {}, message.delta);
+                }
+                lastByType[message.type] = message;
+                return message;
+            });
+        };
+    }
+
+    return { SUBPROTOCOLS, decodeMsgpack, applyDelta, createDecoder };
+})();
@@ -7,6 +7,10 @@ document.addEventListener('DOMContentLoaded', function() {
     const sendBtn = document.getElementById('send-btn');
     let socket = null;
     let interviewActive = false;
+    let clientId = null;
+    let resumeOnConnect = false;
+    let reconnectAttempts = 0;
+    const MAX_RECONNECT_ATTEMPTS = 5;
 
     // Add message to chat
     function addMessage(text, sender = 'system', type = 'text') {
@@ -38,11 +42,16 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Initialize WebSocket connection
     function initWebSocket() {
-        const clientId = 'client-' + Math.random().toString(36).substr(2, 9);
-        socket = new WebSocket(`ws://${window.location.host}/ws/${clientId}`);
+        // Kept across reconnects so the server can resume this client's interview
+        clientId = clientId || 'client-' + Math.random().toString(36).substr(2, 9);
+        // Offer compact framing; a server without it falls back to one JSON message per frame
+        socket = new WebSocket(`ws://${window.location.host}/ws/${clientId}`, CoachCodec.SUBPROTOCOLS);
+        socket.binaryType = 'arraybuffer';
+        const decodeFrame = CoachCodec.createDecoder();
 
         socket.onopen = function() {
             interviewActive = true;
+            reconnectAttempts = 0;
             addMessage('Connected to interview session');
 
             // Get form data
@@ -58,7 +67,8 @@ document.addEventListener('DOMContentLoaded', function() {
                     interview_type: interviewType,
                     level: experienceLevel,
                     resume_text: fileReader.result || '',
-                    use_voice: false // Explicitly disable voice input
+                    use_voice: false, // Explicitly disable voice input
+                    resume: resumeOnConnect
                 };
                 socket.send(JSON.stringify(message));
             };
@@ -71,11 +81,17 @@ document.addEventListener('DOMContentLoaded', function() {
         };
 
         socket.onmessage = function(event) {
-            const data = JSON.parse(event.data);
+            decodeFrame(event.data).forEach(handleMessage);
+        };
+
+        function handleMessage(data) {
             console.log('Received:', data);
 
             if (data.type === 'question') {
                 addMessage(data.question, 'bot', 'question');
+                if (data.audio_url) {
+                    new Audio(data.audio_url).play().catch(err => console.log('Audio playback blocked:', err));
+                }
                 // Focus input field when new question arrives
                 responseInput.focus();
             }
@@ -89,28 +105,59 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
                 addMessage(feedbackText, 'bot', 'feedback');
             }
+            else if (data.type === 'provisional_score') {
+                let scoreText = `Provisional technical accuracy: ${data.technical_accuracy}/10`;
+                if (data.missed_points && data.missed_points.length) {
+                    scoreText += `<br>Not yet covered: ${data.missed_points.join('; ')}`;
+                }
+                addMessage(scoreText, 'bot', 'feedback');
+            }
+            else if (data.type === 'partial_transcript') {
+                responseInput.placeholder = data.text || 'Listening...';
+            }
             else if (data.type === 'summary') {
-                showInterviewComplete(data.summary);
+                showInterviewComplete(data.summary, data.report_url);
+            }
+            else if (data.type === 'resumed') {
+                addMessage(`Reconnected - resuming your interview after ${data.answered} answers`);
+            }
+            else if (data.type === 'busy') {
+                // The server is at capacity; try again when it expects a free slot
+                interviewActive = false;
+                addMessage(`Server busy - retrying in ${data.retry_after}s`, 'error');
+                setTimeout(initWebSocket, data.retry_after * 1000);
+            }
+            else if (data.type === 'ping') {
+                socket.send(JSON.stringify({ type: 'pong' }));
             }
             else if (data.type === 'ack') {
                 // Acknowledge response was received
                 console.log('Response acknowledged by server');
             }
-        };
+        }
 
         socket.onerror = function(error) {
             addMessage(`Connection error: ${error.message || 'Unknown error'}`, 'error');
         };
 
         socket.onclose = function(event) {
-            if (interviewActive && event.code !== 1000) {
+            if (interviewActive && event.code === 1001) {
+                addMessage('Session closed after inactivity - please refresh to start again', 'error');
+            }
+            else if (interviewActive && event.code !== 1000 && reconnectAttempts < MAX_RECONNECT_ATTEMPTS) {
+                addMessage('Connection lost - reconnecting...', 'error');
+                reconnectAttempts++;
+                resumeOnConnect = true;
+                setTimeout(initWebSocket, 1000 * reconnectAttempts);
+            }
+            else if (interviewActive && event.code !== 1000) {
                 addMessage('Connection lost - please refresh to continue', 'error');
             }
         };
     }
 
     // Show interview completion message
-    function showInterviewComplete(summary) {
+    function showInterviewComplete(summary, reportUrl) {
         const completionDiv = document.createElement('div');
         completionDiv.className = 'interview-complete';
 
@@ -125,6 +172,7 @@ document.addEventListener('DOMContentLoaded', function() {
             <div class="summary-content">
                 <div class="summary-score">Your Score: <strong>${summary.score}/100</strong></div>
                 <div class="summary-overview">${summary.overview}</div>
+                ${reportUrl ? `<a class="summary-report" href="${reportUrl}" target="_blank">View full report</a>` : ''}
                 <div class="completion-footer">
                     Refresh the page to start a new interview
                 </div>
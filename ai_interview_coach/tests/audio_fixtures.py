@@ -0,0 +1,55 @@
+"""Deterministic WAV fixtures standing in for recorded microphone answers."""
+import time
+import wave
+from pathlib import Path
+import numpy as np
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000
+
+
+def write_answer_wav(path: Path, ambient: float = 1.5, speech_segments=(1.0,), pause: float = 0.6,
+                     trailing: float = 1.0, sample_rate: int = SAMPLE_RATE, seed: int = 0) -> Path:
+    """Low ambient noise, then loud voiced segments separated by pauses, then silence."""
+    rng = np.random.default_rng(seed)
+    parts = [rng.normal(0, 60, int(ambient * sample_rate))]
+    for i, seconds in enumerate(speech_segments):
+        if i:
+            parts.append(rng.normal(0, 60, int(pause * sample_rate)))
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2
+        voiced = 6000 * envelope * np.sin(2 * np.pi * 180 * t) + rng.normal(0, 300, t.size)
+        parts.append(voiced)
+    parts.append(rng.normal(0, 60, int(trailing * sample_rate)))
+    samples = np.clip(np.concatenate(parts), -32768, 32767).astype("<i2")
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+    return path
+
+
+class _PacedStream:
+    def __init__(self, stream, sample_rate: int, sample_width: int, speedup: float):
+        self.stream = stream
+        self.seconds_per_byte = 1.0 / (sample_rate * sample_width * speedup)
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        time.sleep(len(data) * self.seconds_per_byte)
+        return data
+
+
+class PacedAudioFile(sr.AudioFile):
+    """An AudioFile that delivers frames at (a multiple of) real time, like a microphone."""
+
+    def __init__(self, path, speedup: float = 10.0):
+        super().__init__(str(path))
+        self.speedup = speedup
+
+    def __enter__(self):
+        source = super().__enter__()
+        self.stream = _PacedStream(self.stream, self.SAMPLE_RATE, self.SAMPLE_WIDTH, self.speedup)
+        return source
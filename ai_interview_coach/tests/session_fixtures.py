@@ -0,0 +1,53 @@
+import asyncio
+import json
+import time
+from starlette.websockets import WebSocketState
+
+
+class FakeWebSocket:
+    def __init__(self, send_delay=0.0):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent = []
+        self.frames = []
+        self.closed_with = None
+        self.send_delay = send_delay
+        self.application_state = WebSocketState.CONNECTED
+
+    def client_send(self, message):
+        self.incoming.put_nowait({"type": "websocket.receive", "text": json.dumps(message)})
+
+    def client_disconnect(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect", "code": 1001})
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.send_delay)
+        self.frames.append(text)
+        payload = json.loads(text)
+        self.sent.extend(payload if isinstance(payload, list) else [payload])
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.send_delay)
+        self.frames.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+        self.application_state = WebSocketState.DISCONNECTED
+
+
+class FakeCoach:
+    def __init__(self, checkpoint_delay=0.0):
+        self.state = None
+        self.checkpoints = 0
+        self.checkpoint_delay = checkpoint_delay
+
+    def checkpoint(self):
+        time.sleep(self.checkpoint_delay)  # Stands in for the synchronous write to disk
+        self.checkpoints += 1
+        return True
+
+
+async def ignore_message(message):
+    pass
@@ -0,0 +1,48 @@
+import wave
+import numpy as np
+import pytest
+from utils.acoustics import extract_acoustic_features, features_from_pcm, pcm_to_array, vocal_scores
+from tests.audio_fixtures import write_answer_wav, SAMPLE_RATE
+
+
+def _pcm(path):
+    with wave.open(str(path), "rb") as f:
+        return f.readframes(f.getnframes())
+
+
+def test_pauses_and_speaking_rate(tmp_path):
+    path = write_answer_wav(tmp_path / "answer.wav", ambient=1.0, speech_segments=(2.0, 1.5, 1.0),
+                            pause=0.8, trailing=1.0)
+    features = features_from_pcm(_pcm(path), SAMPLE_RATE, 2, " ".join(["word"] * 12))
+
+    assert features["pause_count"] == 2
+    assert features["pause_mean"] == pytest.approx(0.8, abs=0.1)
+    assert features["speech_duration"] == pytest.approx(6.1, abs=0.15)
+    assert features["voiced_duration"] == pytest.approx(4.5, abs=0.15)
+    assert features["wpm"] == pytest.approx(12 / 6.1 * 60, rel=0.05)
+    assert 0.5 < features["volume_stability"] <= 1.0
+
+
+def test_short_gaps_are_not_pauses(tmp_path):
+    path = write_answer_wav(tmp_path / "answer.wav", speech_segments=(1.0, 1.0), pause=0.1)
+    features = features_from_pcm(_pcm(path), SAMPLE_RATE, 2, "a few words")
+    assert features["pause_count"] == 0
+
+
+def test_silence_has_no_speech():
+    silence = np.random.default_rng(0).normal(0, 1e-3, SAMPLE_RATE * 2).astype(np.float32)
+    features = extract_acoustic_features(silence, SAMPLE_RATE, "")
+    assert features["pause_count"] == 0 and features["wpm"] == 0.0
+
+
+def test_pcm_decoding():
+    samples = pcm_to_array(np.array([0, 16384, -32768], dtype="<i2").tobytes(), 2)
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_vocal_scores_reward_ideal_pace():
+    steady = {"wpm": 140, "speech_duration": 10.0, "pause_total": 0.5, "volume_stability": 0.9}
+    rushed = dict(steady, wpm=230)
+    assert vocal_scores(steady)["pace"] == 10.0
+    assert vocal_scores(rushed)["pace"] < vocal_scores(steady)["pace"]
+    assert 1.0 <= vocal_scores(steady)["confidence"] <= 10.0
@@ -0,0 +1,56 @@
+import pytest
+from utils.analysis import FillerDetector, analyze_audio_features, build_vocal_feedback
+
+
+@pytest.fixture
+def detector():
+    return FillerDetector(fillers=["um", "uh", "like", "you know"], hedges=["i think", "maybe"])
+
+
+def test_multi_word_and_punctuated_fillers(detector):
+    result = detector.detect("Um, I built it, you know? Uhhh... You  know, it worked.")
+    assert result["fillers"] == {"um": 1, "you know": 2, "uh": 1}
+    assert result["filler_count"] == 4
+
+
+def test_word_boundaries(detector):
+    result = detector.detect("The umbrella likes unlikely things")
+    assert result["filler_count"] == 0
+    assert result["word_count"] == 5
+
+
+def test_positions_and_rates(detector):
+    text = "I think the cache, um, was the bottleneck"
+    result = detector.detect(text)
+    assert result["word_count"] == 8
+    assert result["hedge_rate"] == pytest.approx(12.5)
+    assert [(p["term"], p["word_index"], text[p["start"]:p["end"]]) for p in result["positions"]] == [
+        ("i think", 0, "I think"), ("um", 4, "um")]
+
+
+def test_batch_matches_single(detector):
+    texts = ["um like", "maybe, you know", ""]
+    assert detector.detect_batch(texts, with_positions=True) == [detector.detect(t) for t in texts]
+    assert [r["filler_count"] for r in detector.detect_batch(texts)] == [2, 1, 0]
+
+
+def test_analyze_audio_features_counts_fillers():
+    features = analyze_audio_features("Um, you know, I basically rewrote it")
+    assert features["filler_words"] == 3
+    assert features["word_count"] == 7
+
+
+def test_build_vocal_feedback_uses_measured_audio():
+    measured = {"speech_duration": 10.0, "wpm": 190.0, "pause_count": 1, "pause_max": 4.0,
+                "pause_total": 4.0, "volume_stability": 0.8}
+    vocal = build_vocal_feedback("Um, you know, I basically, um, rewrote the cache layer", measured)
+    assert vocal["vocal_metrics"]["filler_words"] == 4
+    assert vocal["vocal_metrics"]["pace"] == pytest.approx(7.0)
+    assert any("'um'" in s for s in vocal["vocal_suggestions"])
+    assert any("Slow down" in s for s in vocal["vocal_suggestions"])
+
+
+def test_build_vocal_feedback_without_audio():
+    vocal = build_vocal_feedback("I rewrote the cache layer and measured latency", {})
+    assert vocal["vocal_metrics"]["filler_words"] == 0
+    assert vocal["vocal_suggestions"] == ["Keep up the steady, clear delivery."]
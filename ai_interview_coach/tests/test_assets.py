@@ -0,0 +1,125 @@
+import gzip
+from starlette.requests import Request
+from config import Config
+from utils.assets import IMMUTABLE, REVALIDATE, AssetStore
+from utils.reports import ReportRenderer, load_report_secret, report_context
+
+SCRIPT = "function greet() { return 'hello'; }\n" * 100
+PAGE = """<html><head><link rel="stylesheet" href="static/styles.css">
+<link href="https://fonts.example.com/css" rel="stylesheet"></head>
+<body><script src="static/script.js"></script></body></html>"""
+
+
+def make_request(**headers):
+    return Request({"type": "http", "method": "GET", "path": "/",
+                    "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]})
+
+
+def make_store(tmp_path, script=SCRIPT):
+    (tmp_path / "script.js").write_text(script)
+    (tmp_path / "styles.css").write_text("body { margin: 0; }")
+    (tmp_path / "index.html").write_text(PAGE)
+    return AssetStore(tmp_path)
+
+
+def test_page_links_fingerprinted_assets(tmp_path):
+    store = make_store(tmp_path)
+    body = store.page("index.html", make_request()).body.decode()
+
+    assert f'src="{store.url_for("script.js")}"' in body
+    assert f'href="{store.url_for("styles.css")}"' in body
+    assert 'href="https://fonts.example.com/css"' in body
+    assert store.url_for("script.js") != "/static/script.js"
+
+
+def test_fingerprint_changes_with_content(tmp_path):
+    first = make_store(tmp_path).url_for("script.js")
+    assert make_store(tmp_path, SCRIPT + "greet();\n").url_for("script.js") != first
+
+
+def test_fingerprinted_asset_is_immutable_and_compressed(tmp_path):
+    store = make_store(tmp_path)
+    path = store.url_for("script.js").removeprefix("/static/")
+    response = store.serve(path, make_request(accept_encoding="gzip, deflate"))
+
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.body).decode() == SCRIPT
+
+
+def test_identity_when_encoding_not_accepted(tmp_path):
+    store = make_store(tmp_path)
+    response = store.serve("script.js", make_request(accept_encoding="gzip;q=0"))
+
+    assert "content-encoding" not in response.headers
+    assert response.body.decode() == SCRIPT
+    assert response.headers["cache-control"] == REVALIDATE
+
+
+def test_small_assets_are_not_compressed(tmp_path):
+    store = make_store(tmp_path)
+    assert store.assets["styles.css"].variants == {}
+
+
+def test_if_none_match_returns_304(tmp_path):
+    store = make_store(tmp_path)
+    etag = store.page("index.html", make_request()).headers["etag"]
+
+    response = store.page("index.html", make_request(if_none_match=f'"stale", W/{etag}'))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert store.page("index.html", make_request(if_none_match='"stale"')).status_code == 200
+    assert store.stats()["not_modified"] == 1
+
+
+def test_unknown_asset_is_404(tmp_path):
+    assert make_store(tmp_path).serve("missing.js", make_request()).status_code == 404
+
+
+INTERVIEW = {
+    "interview_id": "mock_1234",
+    "questions": [
+        {"feedback": {"metrics": {"clarity": 6.0, "technical_accuracy": 7.0, "communication": 8.0},
+                      "vocal_feedback": {"vocal_metrics": {"pace": 8.0, "confidence": 5.0}}}},
+        {"feedback": {"metrics": {"clarity": 8.0, "technical_accuracy": 5.0, "communication": 8.0},
+                      "vocal_feedback": {"vocal_metrics": {"pace": 6.0, "confidence": 7.0}}}}
+    ],
+    "summary": {"score": 72.4, "overview": "Solid <b>fundamentals</b>", "strengths": ["Clear structure"],
+                "recommendations": ["Quantify impact"]}
+}
+
+
+def test_report_context_averages_metrics():
+    context = report_context(INTERVIEW)
+
+    assert context["score"] == 72
+    assert {"name": "Clarity", "score": 7.0} in context["metrics"]
+    assert {"name": "Pace", "score": 7.0} in context["metrics"]
+    assert context["improvements"] == ["Quantify impact"]
+    assert context["resources"] == []
+
+
+def test_report_is_rendered_once_and_escaped():
+    renderer = ReportRenderer(secret=b"test-secret")
+    report = renderer.report(INTERVIEW)
+    body = report.body.decode()
+
+    assert "Solid &lt;b&gt;fundamentals&lt;/b&gt;" in body
+    assert "Clear structure" in body and "Quantify impact" in body
+    assert 'style="width: 70.0%"' in body
+    assert renderer.report(INTERVIEW) is report
+    assert renderer.stats() == {"hits": 1, "renders": 1, "rejected": 0, "cached": 1}
+
+
+def test_report_urls_are_signed_per_interview(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "REPORT_SECRET", None)
+    renderer = ReportRenderer(secret=load_report_secret(tmp_path / "report_secret"))
+    token = renderer.url("mock_1").split("token=")[1]
+
+    assert renderer.verify("mock_1", token)
+    assert not renderer.verify("mock_2", token)
+    assert not renderer.verify("mock_1", "")
+    # Every worker reads the same generated key
+    assert ReportRenderer(secret=load_report_secret(tmp_path / "report_secret")).verify("mock_1", token)
+    assert oct((tmp_path / "report_secret").stat().st_mode & 0o777) == "0o600"
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from unittest.mock import patch
+import pytest
+from config import Config
+from agents.resume_agent import ResumeAgent
+from utils.chunking import chunk_text, count_tokens
+
+RESUME = "\n".join(
+    f"Role {i}: built services in Python and PostgreSQL, deployed with Docker on AWS, mentored engineers."
+    for i in range(60)
+)
+
+
+def test_chunks_respect_budget_and_keep_every_line():
+    chunks = chunk_text(RESUME, max_tokens=120)
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 120 for chunk in chunks)
+    covered = {line for chunk in chunks for line in chunk.splitlines()}
+    assert covered == set(RESUME.splitlines())
+
+
+def test_chunks_overlap_by_one_line():
+    chunks = chunk_text(RESUME, max_tokens=120)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.splitlines()[0] == previous.splitlines()[-1]
+
+
+def test_oversized_line_is_split():
+    line = " ".join(["word"] * 400)
+    chunks = chunk_text(line, max_tokens=50, overlap_lines=0)
+    assert all(count_tokens(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == line.split()
+
+
+@pytest.fixture
+def resume_agent(monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+    return ResumeAgent()
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_extracted_concurrently_and_merged(resume_agent, monkeypatch):
+    monkeypatch.setattr(Config, "RESUME_CHUNK_TOKENS", 120)
+    monkeypatch.setattr(Config, "RESUME_EXTRACTION_CONCURRENCY", 4)
+    n_chunks = len(chunk_text(RESUME, 120))
+    delay = 0.1
+
+    async def fake_extract(chunk, retries):
+        await asyncio.sleep(delay)
+        role = chunk.splitlines()[0].split(":")[0]
+        return {"skills": ["python", role], "tools": ["Docker"], "technologies": []}
+
+    with patch.object(resume_agent, "_extract_chunk_skills", side_effect=fake_extract):
+        start = time.perf_counter()
+        result = await resume_agent._extract_skills_llm(RESUME, retries=1)
+        elapsed = time.perf_counter() - start
+
+    # Wall time follows the number of chunks over the parallelism, not the resume length
+    assert elapsed < delay * (n_chunks / 4 + 2)
+    assert elapsed >= delay * (n_chunks // 4)
+    assert result["skills"][0] == "Python"
+    assert len(result["skills"]) == n_chunks + 1
+    assert result["tools"] == ["Docker"]
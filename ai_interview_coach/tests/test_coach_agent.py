@@ -1,9 +1,21 @@
+import asyncio
+import time
 import pytest
 from agents.coach_agent import InterviewCoachAgent
-from models.interview_state import InterviewState
+from config import Config
+from models.interview_state import InterviewState, InterviewMetrics
+from utils import sampler
 from unittest.mock import AsyncMock, patch
 
 
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """Keep the agent's database and interview files out of the tracked data directory"""
+    monkeypatch.setattr(Config, "DB_PATH", tmp_path / "interviews.db")
+    monkeypatch.setattr(Config, "STORAGE_DIR", tmp_path / "interview_data")
+    monkeypatch.setattr(sampler, "_sampler", None)  # Built on the question stats of the patched database
+
+
 @pytest.fixture
 def mock_state():
     return {
@@ -29,7 +41,7 @@ async def test_initialization(mock_state):
 @pytest.mark.asyncio
 async def test_question_flow(mock_state):
     with patch('langchain_openai.ChatOpenAI') as mock_llm, \
-            patch('utils.voice.VoiceInterface') as mock_voice:
+            patch('agents.coach_agent.VoiceInterface') as mock_voice:
         mock_llm.return_value = AsyncMock()
         mock_voice.return_value = AsyncMock()
 
@@ -44,4 +56,82 @@ async def test_question_flow(mock_state):
         mock_state["current_phase"] = "technical"
         result = await coach.ask_technical_question(mock_state)
         assert "messages" in result
-        assert "technical" in mock_state["current_question"].lower()
\ No newline at end of file
+        assert "technical" in mock_state["current_question"].lower()
+
+@pytest.mark.asyncio
+async def test_typed_answer_reaches_feedback_without_waiting_for_timeout(monkeypatch):
+    monkeypatch.setattr(Config, "VOICE_ENABLED", False)
+    coach = InterviewCoachAgent()
+    state = InterviewState(
+        interview_id="latency", user_id="user", interview_type="software_engineer", level="mid",
+        current_phase="technical", current_question="What is a hash map?", question_history=[],
+        user_responses=[], feedback=[], metrics=InterviewMetrics(), conversation_context="",
+        start_time=None, end_time=None, use_voice=False
+    )
+    feedback = {"feedback": "Good", "metrics": {"clarity": 7.0, "technical_accuracy": 7.0, "communication": 7.0}}
+
+    with patch("agents.coach_agent.FeedbackAgent") as mock_agent:
+        mock_agent.return_value.analyze_response = AsyncMock(return_value=feedback)
+        evaluating = asyncio.create_task(coach.evaluate_response({"state": state, "messages": []}))
+        await asyncio.sleep(0.05)
+
+        answered = time.perf_counter()
+        coach.voice.set_response("A table of key-value pairs with constant-time lookups")
+        result = await asyncio.wait_for(evaluating, timeout=5)
+        latency = time.perf_counter() - answered
+
+    assert result["messages"][0].content.startswith("A table of key-value pairs")
+    assert latency < 1.0
+
+
+@pytest.mark.asyncio
+async def test_resumed_interview_repeats_the_unanswered_question(monkeypatch):
+    monkeypatch.setattr(Config, "VOICE_ENABLED", False)
+    first = InterviewCoachAgent()
+    first.state = InterviewState(
+        interview_id="resume", user_id="user", interview_type="software_engineer", level="mid",
+        current_phase="technical", current_question="What is a hash map?",
+        question_history=[{"phase": "intro", "question": "Tell me about yourself."},
+                          {"phase": "technical", "question": "What is a hash map?"}],
+        user_responses=[{"text": "I am a backend engineer"}], feedback=[{}]
+    )
+    first.extra_questions = {"technical:mid": ["How did you scale your Postgres cluster?"]}
+
+    second = InterviewCoachAgent()
+    state = second.restore(first.snapshot())
+    assert second.extra_questions == first.extra_questions
+    assert second.decide_resume_step({"state": state, "messages": []}) == "evaluate"
+
+    steps = second.run_interview(state, resume=True)
+    step = await steps.__anext__()
+    await steps.aclose()
+    assert [m.content for m in step["messages"]] == ["What is a hash map?"]
+
+
+@pytest.mark.asyncio
+async def test_input_sent_before_a_question_does_not_answer_it(monkeypatch):
+    monkeypatch.setattr(Config, "VOICE_ENABLED", False)
+    coach = InterviewCoachAgent()
+    state = InterviewState(
+        interview_id="stale", user_id="user", interview_type="software_engineer", level="mid",
+        current_phase="intro", current_question="Tell me about yourself.", question_history=[],
+        user_responses=[], feedback=[]
+    )
+    feedback = {"feedback": "Good", "metrics": {"clarity": 7.0, "technical_accuracy": 7.0, "communication": 7.0}}
+
+    # Sent twice for the intro question, and a stray audio chunk
+    coach.voice.set_response("I am a backend engineer")
+    coach.voice.feed_audio(b"\x00" * 3200)
+    coach.voice.end_audio()
+    result = await coach.ask_technical_question({"state": state, "messages": []})
+
+    with patch("agents.coach_agent.FeedbackAgent") as mock_agent:
+        mock_agent.return_value.analyze_response = AsyncMock(return_value=feedback)
+        evaluating = asyncio.create_task(coach.evaluate_response(result))
+        await asyncio.sleep(0.05)
+        assert not evaluating.done()
+
+        coach.voice.set_response("A table of key-value pairs with constant-time lookups")
+        result = await asyncio.wait_for(evaluating, timeout=5)
+
+    assert result["messages"][0].content.startswith("A table of key-value pairs")
@@ -1,5 +1,7 @@
 import pytest
+from langchain_core.messages import AIMessage
 from agents.feedback_agent import FeedbackAgent
+from config import Config
 from unittest.mock import AsyncMock, patch
 
 
@@ -39,4 +41,30 @@ async def test_generate_summary_report(feedback_agent):
         })
 
         assert "overview" in result
-        assert "score" in result
\ No newline at end of file
+        assert "score" in result
+
+
+class FakeChain:
+    """Replies with each of `replies` in turn, like a prompt | llm chain."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        return AIMessage(content=self.replies.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_invoke_json_retries_until_the_reply_parses(monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+    agent = FeedbackAgent()
+    chain = FakeChain("Sure! Here is the feedback", '```json\n{"feedback": "Good", "metrics": {"clarity": 8}}\n```')
+
+    feedback = await agent._invoke_json(chain, {}, "llm.content_feedback", lambda f: f["metrics"])
+    assert (feedback, chain.calls) == ({"clarity": 8}, 2)
+
+    chain = FakeChain("[]", "[]")
+    assert await agent._invoke_json(chain, {}, "llm.content_feedback", lambda f: f["metrics"], attempts=2) is None
+    assert chain.calls == 2
\ No newline at end of file
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import pytest
+from utils.framing import JSON_V2, MSGPACK_V2, FrameCodec, apply_delta, make_delta, negotiate
+from utils.session import SessionRunner
+from tests.session_fixtures import FakeWebSocket, ignore_message
+
+FIRST = {"type": "feedback", "feedback": {
+    "feedback": "Clear answer", "metrics": {"clarity": 7.0, "technical_accuracy": 6.0},
+    "vocal_feedback": {"vocal_metrics": {"pace": 5.0, "filler_words": 0}, "vocal_suggestions": ["Slow down"]},
+    "reference_score": {"coverage": 0.5}
+}}
+SECOND = {"type": "feedback", "feedback": {
+    "feedback": "Thorough answer", "metrics": {"clarity": 7.0, "technical_accuracy": 8.0},
+    "vocal_feedback": {"vocal_metrics": {"pace": 5.0, "filler_words": 0}, "vocal_suggestions": ["Slow down"]}
+}}
+
+
+def test_delta_carries_only_changes_and_round_trips():
+    delta = make_delta(FIRST, SECOND)
+    assert delta == {"feedback": {"feedback": "Thorough answer", "metrics": {"technical_accuracy": 8.0},
+                                  "$unset": ["reference_score"]}}
+    assert apply_delta(FIRST, delta) == SECOND
+    assert make_delta(SECOND, SECOND) == {}
+
+
+def test_negotiation_prefers_msgpack():
+    assert negotiate([JSON_V2, MSGPACK_V2]) == MSGPACK_V2
+    assert negotiate([JSON_V2]) == JSON_V2
+    assert negotiate(["graphql-ws"]) is None
+
+
+def test_original_framing_sends_one_full_message_per_frame():
+    codec = FrameCodec()
+    frames = codec.encode([FIRST, SECOND])
+    assert [json.loads(frame) for frame in frames] == [FIRST, SECOND]
+
+
+@pytest.mark.parametrize("subprotocol", [JSON_V2, MSGPACK_V2])
+def test_batched_framing_coalesces_and_sends_deltas(subprotocol):
+    if subprotocol == MSGPACK_V2:
+        msgpack = pytest.importorskip("msgpack")
+        decode = msgpack.unpackb
+    else:
+        decode = json.loads
+    codec = FrameCodec(subprotocol)
+    frames = codec.encode([{"type": "question", "question": "Why?"}, FIRST]) + codec.encode([SECOND])
+    assert len(frames) == 2
+    first_batch, second_batch = decode(frames[0]), decode(frames[1])
+    assert first_batch == [{"type": "question", "question": "Why?"}, FIRST]
+    assert second_batch[0]["type"] == "feedback" and "delta" in second_batch[0]
+    assert apply_delta(first_batch[1], second_batch[0]["delta"]) == SECOND
+    assert codec.stats()["bytes"] == sum(len(f if isinstance(f, bytes) else f.encode()) for f in frames)
+
+
+@pytest.mark.asyncio
+async def test_messages_of_one_step_share_a_frame():
+    websocket = FakeWebSocket()
+    runner = SessionRunner(websocket, ignore_message, heartbeat_interval=10, codec=FrameCodec(JSON_V2))
+    running = asyncio.create_task(runner.run())
+    # Sends that do not wait (queue not full) run back to back, so the writer sees all three at once
+    await runner.send("provisional_score", {"technical_accuracy": 6.0})
+    await runner.send("feedback", FIRST)
+    await runner.send("question", {"question": "Next?"})
+    await runner.close()
+    await asyncio.wait_for(running, timeout=1)
+    assert len(websocket.frames) == 1
+    assert [m["type"] for m in json.loads(websocket.frames[0])] == ["provisional_score", "feedback", "question"]
@@ -0,0 +1,104 @@
+import asyncio
+import gzip
+import json
+import logging
+import queue
+import sys
+import pytest
+from utils.logging_setup import (DebugSampler, DeferredFormatQueueHandler, JsonFormatter, bind_log_context,
+                                 configure_logging, rotating_file_handler, shutdown_logging)
+
+
+def make_record(level=logging.DEBUG, msg="event %s", args=(1,), lineno=10, **extra):
+    record = logging.LogRecord("coach", level, "coach_agent.py", lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampler_keeps_burst_then_one_in_every():
+    sampler = DebugSampler(burst=3, every=5)
+    kept = [sampler.filter(make_record()) for _ in range(13)]
+
+    assert kept[:3] == [True] * 3
+    assert sum(kept) == 5  # 3 from the burst, then the 5th and 10th after it
+    assert sampler.dropped == 8
+
+
+def test_sampler_is_per_call_site_and_ignores_info():
+    sampler = DebugSampler(burst=1, every=100)
+    sampler.filter(make_record(lineno=1))
+
+    assert not sampler.filter(make_record(lineno=1))
+    assert sampler.filter(make_record(lineno=2))
+    assert sampler.filter(make_record(level=logging.INFO, lineno=1))
+
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(make_record(client_id="c1", answer_ms=120)))
+
+    assert entry["message"] == "event 1"
+    assert entry["level"] == "DEBUG"
+    assert entry["client_id"] == "c1"
+    assert entry["answer_ms"] == 120
+    assert "lineno" not in entry
+
+
+def test_queue_handler_merges_args_without_formatting():
+    class FailingFormatter(logging.Formatter):
+        def format(self, record):
+            raise AssertionError("formatted in the caller's thread")
+
+    handler = DeferredFormatQueueHandler(queue.Queue())
+    handler.setFormatter(FailingFormatter())
+    try:
+        raise ValueError("bad answer")
+    except ValueError:
+        record = make_record(msg="answer %s", args=(["draft"],))
+        record.exc_info = sys.exc_info()
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert (queued.msg, queued.args) == ("answer ['draft']", None)
+    assert "ValueError: bad answer" in json.loads(JsonFormatter().format(queued))["exception"]
+
+
+def test_rotated_files_are_gzipped(tmp_path):
+    handler = rotating_file_handler(tmp_path / "interview.log", max_bytes=200, backups=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(20):
+        handler.emit(make_record(msg="line %d padded to fill the file quickly", args=(i,)))
+    handler.close()
+
+    with gzip.open(tmp_path / "interview.log.1.gz", "rt") as f:
+        assert "padded" in f.read()
+    assert not (tmp_path / "interview.log.3.gz").exists()
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "interview.log"
+    configure_logging(level="INFO", log_file=path)
+    yield path
+    shutdown_logging()
+
+
+@pytest.mark.asyncio
+async def test_records_carry_bound_context_through_the_queue(log_file):
+    async def session():
+        bind_log_context(client_id="client-1")
+        await asyncio.create_task(interview())
+
+    async def interview():
+        bind_log_context(interview_id="mock_1234")
+        logging.info("Question %d asked", 3)
+        logging.debug("Not written at INFO")
+
+    await asyncio.create_task(session())  # Each websocket session runs in its own task
+    logging.info("Outside any session")
+    shutdown_logging()  # Flushes the listener
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [e["message"] for e in entries] == ["Question 3 asked", "Outside any session"]
+    assert entries[0]["client_id"] == "client-1"
+    assert entries[0]["interview_id"] == "mock_1234"
+    assert "client_id" not in entries[1]
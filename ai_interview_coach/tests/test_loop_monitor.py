@@ -0,0 +1,62 @@
+import asyncio
+import time
+import pytest
+from models.user_profile import UserProfile
+from utils.loop_monitor import LoopBlockedError, LoopMonitor, assert_no_blocking
+from utils.profile_cache import ProfileCache
+from utils.storage import InterviewStorage
+
+
+def blocking_save():
+    time.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_fails_with_its_stack():
+    with pytest.raises(LoopBlockedError) as excinfo:
+        async with assert_no_blocking(50):
+            await asyncio.sleep(0.01)
+            blocking_save()
+
+    message = str(excinfo.value)
+    assert "Event loop blocked for" in message
+    assert "in blocking_save" in message
+
+
+@pytest.mark.asyncio
+async def test_awaiting_and_threads_do_not_block():
+    async with assert_no_blocking(50) as monitor:
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(time.sleep, 0.1)
+
+    assert monitor.stats()["samples"] > 0
+    assert not monitor.blocks
+
+
+@pytest.mark.asyncio
+async def test_profile_storage_stays_off_the_loop(tmp_path):
+    cache = ProfileCache(InterviewStorage(tmp_path / "interviews.db"))
+    profile = UserProfile(user_id="u1", name="Test", email="test@example.com",
+                          target_roles=[], current_level="mid", skills=["python"])
+
+    async with assert_no_blocking(50):
+        await cache.save(profile)
+        assert (await cache.get("u1")).skills == ["python"]
+
+
+@pytest.mark.asyncio
+async def test_lag_histogram_and_captured_block():
+    monitor = LoopMonitor(interval=0.01, threshold=0.05, buckets_ms=(10, 100))
+    monitor.start()
+    await asyncio.sleep(0.05)
+    time.sleep(0.12)
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    stats = monitor.stats()
+    assert sum(stats["histogram"].values()) == stats["samples"]
+    assert stats["histogram"][">100ms"] >= 1
+    assert stats["max_lag_ms"] >= 100
+    assert stats["blocked"] == 1
+    assert stats["recent_blocks"][0]["lag_ms"] == round(monitor.max_lag_ms, 1)
+    assert "time.sleep(0.12)" in monitor.blocks[0]["stack"]
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from models.user_profile import UserProfile
+from utils.profile_cache import ProfileCache
+
+
+class CountingStorage:
+    def __init__(self):
+        self.profiles = {}
+        self.reads = 0
+
+    def get_user_profile(self, user_id):
+        self.reads += 1
+        profile = self.profiles.get(user_id)
+        return profile.model_copy(deep=True) if profile else None
+
+    def save_user_profile(self, profile):
+        self.profiles[profile.user_id] = profile.model_copy(deep=True)
+
+
+def _profile(user_id, level="mid"):
+    return UserProfile(user_id=user_id, name="Test", email="test@example.com",
+                       target_roles=[], current_level=level, skills=[])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_read():
+    storage = CountingStorage()
+    storage.save_user_profile(_profile("u1"))
+    cache = ProfileCache(storage, max_size=10, ttl=60)
+
+    profiles = await asyncio.gather(*(cache.get("u1") for _ in range(20)))
+    assert all(p.user_id == "u1" for p in profiles)
+    assert storage.reads == 1
+
+    await cache.get("u1")
+    assert storage.reads == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates():
+    storage = CountingStorage()
+    cache = ProfileCache(storage, max_size=10, ttl=60)
+    await cache.save(_profile("u1"))
+    assert (await cache.get("u1")).current_level == "mid"
+
+    await cache.save(_profile("u1", level="senior"))
+    assert (await cache.get("u1")).current_level == "senior"
+    assert storage.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_ttl():
+    storage = CountingStorage()
+    for user_id in ("u1", "u2", "u3"):
+        storage.save_user_profile(_profile(user_id))
+    cache = ProfileCache(storage, max_size=2, ttl=60)
+
+    for user_id in ("u1", "u2", "u3"):
+        await cache.get(user_id)
+    assert cache.stats()["evictions"] == 1
+    await cache.get("u1")
+    assert storage.reads == 4
+
+    expired = ProfileCache(storage, max_size=2, ttl=0)
+    await expired.get("u1")
+    await expired.get("u1")
+    assert expired.stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_profile_is_not_shared():
+    storage = CountingStorage()
+    storage.save_user_profile(_profile("u1"))
+    cache = ProfileCache(storage, max_size=10, ttl=60)
+
+    first = await cache.get("u1")
+    first.skills.append("Mutated")
+    assert (await cache.get("u1")).skills == []
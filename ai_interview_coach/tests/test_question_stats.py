@@ -0,0 +1,83 @@
+import pytest
+from utils.question_stats import QuestionStatsIndex, question_hash, TIMEOUT_RESPONSE
+
+
+@pytest.fixture
+def stats_index(tmp_path):
+    return QuestionStatsIndex(db_path=tmp_path / "stats.db")
+
+
+def _interview(responses, interview_id="mock_test", bank="software_engineer"):
+    return {
+        "interview_id": interview_id,
+        "interview_type": bank,
+        "level": "mid",
+        "questions": [{
+            "question": "Explain CAP theorem and its implications.",
+            "phase": "technical",
+            "response": response,
+            "processing_time": seconds,
+            "feedback": {"metrics": {"clarity": clarity, "technical_accuracy": 6, "communication": 7}}
+        } for response, seconds, clarity in responses]
+    }
+
+
+def test_question_hash_is_stable():
+    assert question_hash("Explain  CAP theorem.") == question_hash(" explain cap theorem. ")
+    assert question_hash("Explain CAP theorem.") != question_hash("Explain REST.")
+
+
+def test_incremental_updates(stats_index):
+    stats_index.record_interview(_interview([("CAP is about...", 12, 8)]))
+    stats_index.record_interview(_interview([(TIMEOUT_RESPONSE, 60, 4), ("Consistency...", 25, 6)], "mock_2"))
+
+    stats = stats_index.get_question_stats("software_engineer", "Explain CAP theorem and its implications.")
+    assert stats["answer_count"] == 3
+    assert stats["timeout_rate"] == pytest.approx(1 / 3)
+    assert stats["metrics"]["clarity"]["mean"] == pytest.approx(6.0)
+    assert stats["metrics"]["clarity"]["variance"] == pytest.approx(4.0)
+    assert stats["answer_time"]["mean"] == pytest.approx(97 / 3)
+    assert sum(stats["answer_time"]["histogram"]) == 3
+
+
+def test_bank_query(stats_index):
+    stats_index.record_interview(_interview([("CAP is about...", 12, 8)]))
+
+    bank = stats_index.get_bank_stats("software_engineer")
+    assert list(bank) == [question_hash("Explain CAP theorem and its implications.")]
+    assert stats_index.get_bank_stats("product_manager") == {}
+
+
+def test_user_exposure(stats_index):
+    for interview_id in ("mock_1", "mock_2"):
+        interview = _interview([("CAP is about...", 12, 8)], interview_id)
+        interview["user_id"] = "user-1"
+        stats_index.record_interview(interview)
+
+    assert stats_index.get_user_exposure("user-1") == {question_hash("Explain CAP theorem and its implications."): 2}
+    assert stats_index.get_user_exposure("user-2") == {}
+
+
+def test_saving_again_only_adds_new_answers(stats_index):
+    interview = _interview([("CAP is about...", 12, 8)])
+    interview["user_id"] = "user-1"
+    stats_index.record_interview(interview)
+    stats_index.record_interview(interview)
+    interview["questions"].append(_interview([("Consistency...", 25, 6)])["questions"][0])
+    stats_index.record_interview(interview)
+
+    stats = stats_index.get_question_stats("software_engineer", "Explain CAP theorem and its implications.")
+    assert stats["answer_count"] == 2
+    assert stats["metrics"]["clarity"]["mean"] == pytest.approx(7.0)
+    assert stats_index.get_user_exposure("user-1") == {question_hash("Explain CAP theorem and its implications."): 2}
+
+
+def test_banks_keep_separate_stats_for_the_same_question(stats_index):
+    stats_index.record_interview(_interview([("CAP is about...", 12, 8)], "mock_1"))
+    stats_index.record_interview(_interview([(TIMEOUT_RESPONSE, 60, 4)], "mock_2", bank="data_engineer"))
+
+    engineer = stats_index.get_question_stats("software_engineer", "Explain CAP theorem and its implications.")
+    data = stats_index.get_question_stats("data_engineer", "Explain CAP theorem and its implications.")
+    assert (engineer["bank"], engineer["timeout_count"]) == ("software_engineer", 0)
+    assert (data["bank"], data["timeout_count"]) == ("data_engineer", 1)
+    assert list(stats_index.get_answer_counts("software_engineer").values()) == [1]
@@ -0,0 +1,96 @@
+import json
+import os
+import pytest
+from utils.question_store import BankWatcher, QuestionStore, QuestionBankError, compile_banks
+
+
+def _write_bank(directory, role, bank):
+    path = directory / f"{role}.json"
+    path.write_text(json.dumps(bank))
+    return path
+
+
+def _touch_later(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    directory = tmp_path / "banks"
+    directory.mkdir()
+    _write_bank(directory, "data_scientist", {
+        "intro": ["Tell me about yourself."],
+        "technical": {"mid": ["Explain overfitting.", {"question": "What is  bagging?", "tags": ["Ensembles"]}]},
+        "behavioral": ["Describe a failed experiment."]
+    })
+    return directory
+
+
+def test_compiled_banks_load_lazily(source_dir, tmp_path):
+    manifest = compile_banks(source_dir, tmp_path / "compiled")
+    assert manifest["roles"]["data_scientist"]["count"] == 4
+
+    store = QuestionStore(source_dir, tmp_path / "compiled")
+    assert store.loaded_roles() == []
+    bank = store.get_role("data_scientist")
+    assert store.loaded_roles() == ["data_scientist"]
+    assert bank.questions("technical", "mid") == ["Explain overfitting.", "What is bagging?"]
+    assert bank.questions("technical", "senior") == []
+    assert bank.tagged("ensembles") == ["What is bagging?"]
+    assert store.get_role("data_scientist") is bank
+    assert store.get_role("astronaut") is None
+
+
+def test_stale_compiled_output_falls_back_to_source(source_dir, tmp_path):
+    compile_banks(source_dir, tmp_path / "compiled")
+    path = _write_bank(source_dir, "data_scientist", {"intro": ["Why data science?"]})
+    _touch_later(path)
+
+    bank = QuestionStore(source_dir, tmp_path / "compiled").get_role("data_scientist")
+    assert bank.questions("intro") == ["Why data science?"]
+
+
+@pytest.mark.parametrize("bank, message", [
+    ({"intro": ["Q?"], "closing": []}, "unknown phases"),
+    ({"technical": {"expert": ["Q?"]}}, "unknown level"),
+    ({"intro": ["Q?", " q? "]}, "duplicate question"),
+    ({"behavioral": [{"question": ""}]}, "non-empty string"),
+])
+def test_build_rejects_invalid_banks(source_dir, tmp_path, bank, message):
+    _write_bank(source_dir, "broken", bank)
+    with pytest.raises(QuestionBankError, match=message):
+        compile_banks(source_dir, tmp_path / "compiled")
+    assert not (tmp_path / "compiled" / "manifest.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_watcher_swaps_changed_banks(source_dir, tmp_path):
+    store = QuestionStore(source_dir, tmp_path / "compiled")
+    watcher = BankWatcher(store, interval=0)
+    pinned = store.get_role("data_scientist")
+
+    _touch_later(_write_bank(source_dir, "data_scientist", {"intro": ["Why data science?"]}))
+    result = await watcher.check()
+
+    assert result["reloaded"] == ["data_scientist"]
+    assert store.get_role("data_scientist").questions("intro") == ["Why data science?"]
+    assert pinned.questions("intro") == ["Tell me about yourself."]
+    assert watcher.stats()["reloads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_watcher_keeps_previous_bank_on_invalid_edit(source_dir, tmp_path):
+    store = QuestionStore(source_dir, tmp_path / "compiled")
+    watcher = BankWatcher(store, interval=0)
+    bank = store.get_role("data_scientist")
+
+    path = source_dir / "data_scientist.json"
+    path.write_text('{"intro": ["half written')
+    _touch_later(path)
+    await watcher.check()
+    await watcher.check()
+
+    assert store.get_role("data_scientist") is bank
+    assert watcher.stats()["failures"] == 1
+    assert "invalid JSON" in watcher.stats()["last_error"]
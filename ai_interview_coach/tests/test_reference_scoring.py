@@ -0,0 +1,46 @@
+import pytest
+from utils.question_store import QuestionBankError, RoleBank, parse_bank
+from utils.reference_scoring import ReferenceScorer
+
+REFERENCE = {
+    "reference_answer": "Binary search runs in O(log n) time because each comparison halves the remaining "
+                        "search space. It requires sorted input and O(1) extra space when iterative.",
+    "key_points": ["O(log n) time", "halves the search space each step", "input must be sorted"]
+}
+GOOD = ("Binary search is O(log n) time: every comparison halves the search space, so each step discards half "
+        "of the candidates. The input must be sorted first, and the iterative version needs constant space.")
+POOR = "You loop over every element of the list one by one until you find the value you are looking for."
+
+
+@pytest.fixture
+def scorer():
+    return ReferenceScorer()
+
+
+def test_complete_answer_scores_high_with_confidence(scorer):
+    result = scorer.score(GOOD, REFERENCE)
+    assert result["coverage"] == 1.0
+    assert result["technical_accuracy"] >= 8
+    assert result["missed_points"] == []
+    assert result["confidence"] > 0.5
+
+
+def test_answer_missing_key_points_scores_low(scorer):
+    result = scorer.score(POOR, REFERENCE)
+    assert result["technical_accuracy"] < 3
+    assert result["missed_points"] == REFERENCE["key_points"]
+
+
+def test_batch_matches_single(scorer):
+    batch = scorer.score_batch([GOOD, POOR, ""], [REFERENCE] * 3)
+    assert batch[:2] == [scorer.score(GOOD, REFERENCE), scorer.score(POOR, REFERENCE)]
+    assert batch[2]["technical_accuracy"] == 0 and batch[2]["confidence"] == 0
+
+
+def test_bank_entries_carry_references():
+    bank = RoleBank("software_engineer", parse_bank("software_engineer", {"technical": {"junior": [
+        {"question": "What is the time complexity of a binary search?", **REFERENCE}, "Explain APIs."]}}))
+    assert bank.reference("What is the time complexity of a binary search?") == REFERENCE
+    assert bank.reference("Explain APIs.") is None
+    with pytest.raises(QuestionBankError, match="key_points"):
+        parse_bank("software_engineer", {"intro": [{"question": "Q?", "key_points": []}]})
@@ -0,0 +1,63 @@
+from unittest.mock import AsyncMock
+import pytest
+from config import Config
+from agents.resume_agent import ResumeAgent
+from utils.question_store import RoleBank, parse_bank
+from utils.retrieval import RetrievalIndex, relevant_questions, tokenize
+
+BANK = RoleBank("software_engineer", parse_bank("software_engineer", {"technical": {
+    "mid": [
+        "How would you tune a slow PostgreSQL query?",
+        "Explain how Redis eviction policies work.",
+        "Design a REST API for a todo app.",
+        "How do you profile a Node.js service?",
+        "Describe the event loop in Node.js."
+    ],
+    "senior": ["Design a multi-region PostgreSQL deployment."]
+}}), "1")
+
+
+def test_tokenize_keeps_tech_terms():
+    assert tokenize("Node.js, C++ and machine learning.") == [
+        "node.js", "c++", "machine", "learning", "c++ machine", "machine learning"]
+
+
+def test_search_ranks_by_similarity():
+    index = RetrievalIndex(["Tune PostgreSQL indexes", "Cache with Redis", "Scale PostgreSQL reads with replicas"])
+    results = index.search("postgresql indexes", k=2)
+    assert [text for text, _ in results] == ["Tune PostgreSQL indexes", "Scale PostgreSQL reads with replicas"]
+    assert results[0][1] > results[1][1] > 0
+    assert index.search("kubernetes") == []
+
+
+def test_relevant_questions_filters_by_level():
+    resume = {"skills": ["PostgreSQL"], "tools": ["Node.js"], "technologies": []}
+    questions = relevant_questions(BANK, resume, "mid", min_score=0.1)
+    assert set(questions) == {"How would you tune a slow PostgreSQL query?", "How do you profile a Node.js service?",
+                              "Describe the event loop in Node.js."}
+    assert relevant_questions(BANK, resume, "senior", min_score=0.1) == ["Design a multi-region PostgreSQL deployment."]
+
+
+@pytest.fixture
+def resume_agent(monkeypatch):
+    monkeypatch.setattr(Config, "OPENAI_API_KEY", "test-key")
+    agent = ResumeAgent()
+    agent._generate_questions = AsyncMock(return_value=["Generated question?"])
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_tailor_questions_skips_llm_with_enough_matches(resume_agent, monkeypatch):
+    monkeypatch.setattr(Config, "RETRIEVAL_MIN_SCORE", 0.1)
+    resume = {"skills": ["PostgreSQL"], "tools": ["Node.js", "Redis"], "technologies": []}
+    questions = await resume_agent.tailor_questions(resume, "software_engineer", "mid", bank=BANK)
+    assert len(questions) >= Config.RETRIEVAL_MIN_MATCHES
+    resume_agent._generate_questions.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tailor_questions_tops_up_with_llm(resume_agent):
+    resume = {"skills": ["Kotlin"], "tools": [], "technologies": []}
+    questions = await resume_agent.tailor_questions(resume, "software_engineer", "mid", bank=BANK)
+    assert questions == ["Generated question?"]
+    resume_agent._generate_questions.assert_awaited_once()
@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+import pytest
+from utils.question_store import RoleBank, parse_bank
+from utils.question_stats import question_hash
+from utils.sampler import AliasTable, QuestionSampler
+
+QUESTIONS = [f"Question {i}?" for i in range(6)]
+
+
+def _bank(version="1"):
+    return RoleBank("software_engineer", parse_bank("software_engineer", {"technical": {"mid": QUESTIONS}}), version)
+
+
+def test_alias_table_matches_weights():
+    rng = random.Random(7)
+    table = AliasTable([1, 2, 3, 4])
+    counts = Counter(table.draw(rng) for _ in range(40000))
+    for i, weight in enumerate([1, 2, 3, 4]):
+        assert counts[i] / 40000 == pytest.approx(weight / 10, abs=0.01)
+
+
+def test_no_repeats_within_a_session():
+    sampler = QuestionSampler(rng=random.Random(1))
+    bank = _bank()
+    asked = set()
+    for _ in range(len(QUESTIONS)):
+        question = sampler.draw(bank, "technical", "mid", asked)
+        assert question_hash(question) not in asked
+        asked.add(question_hash(question))
+    assert len(asked) == len(QUESTIONS)
+    # An exhausted slot still yields a question rather than nothing
+    assert sampler.draw(bank, "technical", "mid", asked) in QUESTIONS
+
+
+def test_user_exposure_favours_unseen_questions():
+    sampler = QuestionSampler(rng=random.Random(2))
+    bank = _bank()
+    exposure = {question_hash(q): 9 for q in QUESTIONS[1:]}
+    counts = Counter(sampler.draw(bank, "technical", "mid", user_exposure=exposure) for _ in range(3000))
+    # Weight 1 versus 0.1 for each of the five seen questions
+    assert counts[QUESTIONS[0]] / 3000 == pytest.approx(1 / 1.5, abs=0.05)
+
+
+def test_tables_rebuilt_only_when_bank_changes():
+    calls = []
+    sampler = QuestionSampler(answer_counts=lambda role: calls.append(role) or {}, rng=random.Random(3))
+    bank = _bank()
+    for _ in range(20):
+        sampler.draw(bank, "technical", "mid")
+    assert sampler.stats()["tables_built"] == 1
+    sampler.draw(_bank(version="2"), "technical", "mid")
+    assert sampler.stats()["tables_built"] == 2
+    assert calls == ["software_engineer", "software_engineer"]
+    assert sampler.draw(bank, "technical", "senior") is None
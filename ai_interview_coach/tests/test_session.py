@@ -0,0 +1,178 @@
+import asyncio
+import pytest
+from starlette.websockets import WebSocketState
+from utils.resources import tracked_llm_call
+from utils.session import SessionManager, SessionRunner
+from utils.loop_monitor import assert_no_blocking
+from tests.session_fixtures import FakeCoach, FakeWebSocket, ignore_message
+
+
+def _types(websocket):
+    return [message["type"] for message in websocket.sent]
+
+
+@pytest.mark.asyncio
+async def test_reads_while_spawned_work_runs_and_cancels_it_on_disconnect():
+    websocket = FakeWebSocket()
+    received, cancelled = [], asyncio.Event()
+
+    async def llm_call():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def on_message(message):
+        received.append(message["type"])
+        if message["type"] == "start_interview":
+            runner.spawn(llm_call())
+
+    runner = SessionRunner(websocket, on_message, heartbeat_interval=10)
+    running = asyncio.create_task(runner.run())
+    websocket.client_send({"type": "start_interview"})
+    websocket.client_send({"type": "response", "response": "answer"})
+    await asyncio.sleep(0.05)
+    assert received == ["start_interview", "response"]
+
+    websocket.client_disconnect()
+    await asyncio.wait_for(running, timeout=1)
+    assert cancelled.is_set()
+    assert runner.stats()["tasks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_outbound_queue_applies_backpressure():
+    websocket = FakeWebSocket(send_delay=0.05)
+
+    async def on_message(message):
+        pass
+
+    runner = SessionRunner(websocket, on_message, queue_size=2, heartbeat_interval=10)
+    running = asyncio.create_task(runner.run())
+    await runner.send("question", {"n": 0})
+    await asyncio.sleep(0.01)  # The writer is now busy sending message 0
+    for i in (1, 2):
+        await runner.send("question", {"n": i})
+    assert not await runner.send("partial_transcript", {"text": "..."}, droppable=True)
+
+    blocked = asyncio.create_task(runner.send("question", {"n": 3}))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert runner.outbound.qsize() == 2
+
+    await asyncio.wait_for(blocked, timeout=1)
+    await runner.close()
+    await asyncio.wait_for(running, timeout=1)
+    assert [m["n"] for m in websocket.sent if m["type"] == "question"] == [0, 1, 2, 3]
+    assert runner.stats()["dropped"] == 1
+    assert websocket.closed_with == 1000
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_queued_messages_first():
+    websocket = FakeWebSocket()
+
+    async def on_message(message):
+        pass
+
+    runner = SessionRunner(websocket, on_message, heartbeat_interval=10)
+    running = asyncio.create_task(runner.run())
+    await runner.send("summary", {"summary": {}})
+    await runner.close(code=1000)
+    await asyncio.wait_for(running, timeout=1)
+    assert _types(websocket) == ["summary"]
+    assert websocket.closed_with == 1000
+    assert not await runner.send("question", {})
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_closes_silent_sessions():
+    websocket = FakeWebSocket()
+
+    async def on_message(message):
+        pass
+
+    runner = SessionRunner(websocket, on_message, heartbeat_interval=0.02, heartbeat_timeout=0.1)
+    running = asyncio.create_task(runner.run())
+    for _ in range(4):
+        await asyncio.sleep(0.03)
+        websocket.client_send({"type": "pong"})
+    assert not running.done()
+
+    await asyncio.wait_for(running, timeout=1)
+    assert "ping" in _types(websocket)
+    assert websocket.application_state == WebSocketState.DISCONNECTED
+
+
+@pytest.mark.asyncio
+async def test_capacity_limit_rejects_with_retry_after():
+    manager = SessionManager(max_sessions=2, idle_timeout=30)
+    first, second = await manager.reserve("a"), await manager.reserve("b")
+    assert first and second
+    assert await manager.reserve("c") is None
+    assert 1 <= manager.retry_after() <= 30
+
+    manager.release(first)
+    assert await manager.reserve("c") is not None
+    assert manager.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_client_replaces_its_session():
+    manager = SessionManager(max_sessions=1)
+    old = await manager.reserve("a")
+    old.coach = FakeCoach()
+    new = await manager.reserve("a")
+    assert new is not old and old.coach.checkpoints == 1
+
+    manager.release(old)
+    assert manager.sessions["a"] is new
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_checkpointed_and_closed():
+    manager = SessionManager(max_sessions=4, idle_timeout=0.05)
+    websocket = FakeWebSocket()
+    session = await manager.reserve("idle")
+    session.runner = SessionRunner(websocket, ignore_message, heartbeat_interval=10)
+    session.coach = FakeCoach(checkpoint_delay=0.1)
+    running = asyncio.create_task(session.runner.run())
+
+    await asyncio.sleep(0.02)
+    assert await manager.reap() == 0
+    await asyncio.sleep(0.05)
+    # The checkpoint's disk write must not stall the other sessions on the loop
+    async with assert_no_blocking(50):
+        assert await manager.reap() == 1
+
+    await asyncio.wait_for(running, timeout=1)
+    assert session.coach.checkpoints == 1
+    assert websocket.closed_with == 1001
+    assert "idle" not in manager.sessions
+
+
+@pytest.mark.asyncio
+async def test_pending_llm_calls_are_counted_per_session():
+    release = asyncio.Event()
+
+    async def llm_call():
+        await release.wait()
+        return "done"
+
+    async def on_message(message):
+        runner.spawn(tracked_llm_call(llm_call()))
+
+    websocket = FakeWebSocket()
+    runner = SessionRunner(websocket, on_message, heartbeat_interval=10)
+    running = asyncio.create_task(runner.run())
+    websocket.client_send({"type": "start_interview"})
+    await asyncio.sleep(0.02)
+    assert runner.stats()["pending_llm_calls"] == 1
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert runner.stats()["pending_llm_calls"] == 0
+    assert runner.stats()["llm_calls"] == 1
+    websocket.client_disconnect()
+    await running
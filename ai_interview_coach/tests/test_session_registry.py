@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from utils.session import SessionManager, SessionRunner
+from utils.session_registry import MemorySessionRegistry, SessionRegistry, SQLiteSessionRegistry
+from tests.session_fixtures import FakeCoach, FakeWebSocket, ignore_message
+
+SNAPSHOT = {"state": {"interview_id": "mock_1", "user_responses": [{"text": "an answer"}]},
+            "extra_questions": {"technical:mid": ["How would you shard this table?"]}}
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def registry(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteSessionRegistry(tmp_path / "sessions.db")
+    return MemorySessionRegistry()
+
+
+def test_reconnect_moves_ownership_and_keeps_snapshot(registry):
+    assert registry.claim("client", "worker-a") is None
+    assert registry.save_snapshot("client", "worker-a", SNAPSHOT)
+
+    assert registry.claim("client", "worker-b") == "worker-a"
+    assert registry.owners(["client", "other"]) == {"client": "worker-b", "other": None}
+    assert registry.load_snapshot("client") == SNAPSHOT
+
+
+def test_only_the_owner_writes_snapshots(registry):
+    registry.claim("client", "worker-a")
+    registry.save_snapshot("client", "worker-a", SNAPSHOT)
+    registry.claim("client", "worker-b")
+
+    assert not registry.save_snapshot("client", "worker-a", {"state": {"stale": True}})
+    registry.release("client", "worker-a")
+    assert registry.owners(["client"]) == {"client": "worker-b"}
+    assert registry.load_snapshot("client") == SNAPSHOT
+
+
+def test_released_sessions_expire_and_finished_ones_are_discarded(registry):
+    registry.claim("abandoned", "worker-a")
+    registry.save_snapshot("abandoned", "worker-a", SNAPSHOT)
+    registry.release("abandoned", "worker-a")
+    registry.claim("live", "worker-a")
+
+    assert registry.prune(max_age=0) == 1
+    assert registry.load_snapshot("abandoned") is None
+    assert registry.owners(["live"]) == {"live": "worker-a"}
+    registry.discard("live")
+    assert registry.owners(["live"]) == {"live": None}
+
+
+def test_worker_loads_skip_silent_workers(registry):
+    registry.report_load("worker-a", {"sessions": 3})
+    registry.report_load("worker-b", {"sessions": 1})
+    assert registry.worker_loads() == {"worker-a": {"sessions": 3}, "worker-b": {"sessions": 1}}
+    assert registry.worker_loads(max_age=-1) == {}
+
+
+def test_backends_must_implement_every_method():
+    class PartialRegistry(SessionRegistry):
+        def claim(self, client_id, worker_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialRegistry()
+
+
+def test_workers_share_one_sqlite_file(tmp_path):
+    worker_a = SQLiteSessionRegistry(tmp_path / "sessions.db")
+    worker_b = SQLiteSessionRegistry(tmp_path / "sessions.db")
+    worker_a.claim("client", "worker-a")
+    worker_a.save_snapshot("client", "worker-a", SNAPSHOT)
+
+    assert worker_b.claim("client", "worker-b") == "worker-a"
+    assert worker_b.load_snapshot("client") == SNAPSHOT
+
+
+@pytest.mark.asyncio
+async def test_manager_releases_sessions_resumed_elsewhere(registry):
+    manager = SessionManager(registry=registry, worker_id="worker-a")
+    websocket = FakeWebSocket()
+    session = await manager.reserve("client")
+    session.runner = SessionRunner(websocket, ignore_message, heartbeat_interval=10)
+    session.coach = FakeCoach()
+    running = asyncio.create_task(session.runner.run())
+    registry.claim("client", "worker-a")
+
+    assert await manager.sync_registry() == 0
+    registry.claim("client", "worker-b")
+    assert await manager.sync_registry() == 1
+
+    await asyncio.wait_for(running, timeout=1)
+    assert "client" not in manager.sessions
+    assert registry.worker_loads()["worker-a"]["sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnect_to_same_worker_keeps_ownership(registry):
+    manager = SessionManager(registry=registry, worker_id="worker-a")
+    old = await manager.reserve("client")
+    await manager.claim(old)
+    new = await manager.reserve("client")  # Reconnect replaces the old session before its connection ends
+    await manager.claim(new)
+
+    await manager.finish(old)
+    assert registry.owners(["client"]) == {"client": "worker-a"}
+    assert registry.save_snapshot("client", "worker-a", SNAPSHOT)
+
+    await manager.finish(new)
+    assert registry.owners(["client"]) == {"client": None}
+    assert registry.load_snapshot("client") == SNAPSHOT
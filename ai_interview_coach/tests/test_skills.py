@@ -0,0 +1,46 @@
+import pytest
+from utils.skills import SkillExtractor
+
+TAXONOMY = {
+    "skills": {"Python": ["py"], "Go": ["golang", "=Go"], "Machine Learning": ["ml"]},
+    "tools": {"React": ["reactjs"], "React Native": [], "Kubernetes": ["k8s"], "Scikit-learn": ["sklearn"]},
+    "technologies": {"RESTful APIs": ["=REST", "restful"], "CI/CD": ["continuous integration"]}
+}
+
+
+@pytest.fixture
+def extractor():
+    return SkillExtractor(TAXONOMY)
+
+
+def test_aliases_normalize_to_canonical_names(extractor):
+    result = extractor.extract("Wrote py and golang services on K8S; ML with sklearn. Python again.")
+    assert result == {
+        "skills": ["Python", "Go", "Machine Learning"],
+        "tools": ["Kubernetes", "Scikit-learn"],
+        "technologies": []
+    }
+
+
+def test_longest_match_and_compounds(extractor):
+    result = extractor.extract("Built React Native and React apps, Python/Go backends, CI/CD pipelines.")
+    assert result["tools"] == ["React Native", "React"]
+    assert result["skills"] == ["Python", "Go"]
+    assert result["technologies"] == ["CI/CD"]
+
+
+def test_case_sensitive_aliases_skip_common_words(extractor):
+    assert extractor.extract("I go hiking and rest on weekends.")["skills"] == []
+    assert extractor.extract("Designed REST endpoints in Go.") == {
+        "skills": ["Go"], "tools": [], "technologies": ["RESTful APIs"]}
+
+
+def test_merge_canonicalizes_llm_terms(extractor):
+    merged = extractor.merge({"skills": ["Python"], "tools": [], "technologies": []},
+                             {"skills": ["python", "k8s", "Leadership"], "tools": [], "technologies": ["restful"]})
+    assert merged == {"skills": ["Python", "Leadership"], "tools": ["Kubernetes"], "technologies": ["RESTful APIs"]}
+
+
+def test_bundled_taxonomy_loads():
+    result = SkillExtractor().extract("Python, PostgreSQL, Docker and AWS")
+    assert result == {"skills": ["Python"], "tools": ["PostgreSQL", "Docker"], "technologies": ["AWS"]}
@@ -0,0 +1,129 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+import pytest
+from models.user_profile import UserProfile, InterviewHistory
+from utils.storage import InterviewStorage
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "interviews.db"
+
+
+def _profile(**overrides):
+    data = {
+        "user_id": "user_1",
+        "name": "Test User",
+        "email": "test@example.com",
+        "target_roles": ["software_engineer"],
+        "current_level": "mid",
+        "skills": ["Python", "SQL"]
+    }
+    data.update(overrides)
+    return UserProfile(**data)
+
+
+def _history(n):
+    start = datetime(2025, 1, 1)
+    return [InterviewHistory(
+        interview_id=f"mock_{i}",
+        date=start + timedelta(days=i),
+        interview_type="software_engineer",
+        score=float(i),
+        feedback_summary=f"Interview {i}"
+    ) for i in range(n)]
+
+
+def test_profile_loads_latest_history(db_path):
+    storage = InterviewStorage(db_path=db_path)
+    storage.save_user_profile(_profile(interview_history=_history(30)))
+
+    profile = storage.get_user_profile("user_1", history_limit=5)
+    assert [h.interview_id for h in profile.interview_history] == [f"mock_{i}" for i in range(25, 30)]
+    assert len(storage.get_interview_history("user_1")) == 30
+
+
+def test_save_appends_without_dropping_unloaded_history(db_path):
+    storage = InterviewStorage(db_path=db_path)
+    storage.save_user_profile(_profile(interview_history=_history(10)))
+
+    profile = storage.get_user_profile("user_1", history_limit=2)
+    profile.update_after_interview({"interview_id": "mock_new", "interview_type": "software_engineer",
+                                    "score": 80, "new_skills": ["Docker"]})
+    storage.save_user_profile(profile)
+
+    history = storage.get_interview_history("user_1")
+    assert len(history) == 11
+    assert history[-1].interview_id == "mock_new"
+    assert storage.get_user_profile("user_1").skills == ["Docker", "Python", "SQL"]
+
+
+def test_skills_behave_as_a_set(db_path):
+    storage = InterviewStorage(db_path=db_path)
+    storage.save_user_profile(_profile())
+    storage.add_user_skills("user_1", ["Python", "Go"])
+    assert storage.get_user_profile("user_1").skills == ["Go", "Python", "SQL"]
+
+    storage.save_user_profile(_profile(skills=["Go"]))
+    assert storage.get_user_profile("user_1").skills == ["Go"]
+
+
+def test_migrates_legacy_profile_blobs(db_path):
+    legacy = _profile(interview_history=_history(3))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE users (user_id TEXT PRIMARY KEY, profile_data TEXT, "
+                     "created_at TEXT, updated_at TEXT)")
+        conn.execute("INSERT INTO users VALUES (?, ?, ?, ?)", (
+            legacy.user_id, legacy.model_dump_json(),
+            legacy.created_at.isoformat(), legacy.updated_at.isoformat()))
+        conn.commit()
+
+    storage = InterviewStorage(db_path=db_path)
+    profile = storage.get_user_profile("user_1")
+    assert [h.interview_id for h in profile.interview_history] == ["mock_0", "mock_1", "mock_2"]
+    assert profile.skills == ["Python", "SQL"]
+
+    with sqlite3.connect(db_path) as conn:
+        blob = json.loads(conn.execute("SELECT profile_data FROM users").fetchone()[0])
+    assert "interview_history" not in blob and "skills" not in blob
+
+
+def test_unmigratable_blobs_are_kept_and_retried(db_path):
+    legacy = _profile(interview_history=_history(1))
+    bad_history = json.dumps({"user_id": "user_2", "interview_history": [{"interview_id": "mock_0"}],
+                              "skills": ["Go"]})
+    # Skills fail only after the history rows are written, which must be rolled back too
+    bad_skills = json.dumps({**json.loads(_profile(user_id="user_3", interview_history=_history(1)).model_dump_json()),
+                             "skills": 7})
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE users (user_id TEXT PRIMARY KEY, profile_data TEXT, "
+                     "created_at TEXT, updated_at TEXT)")
+        rows = [(legacy.user_id, legacy.model_dump_json()), ("user_2", bad_history),
+                ("user_3", bad_skills), ("user_4", "[1, 2]")]
+        conn.executemany("INSERT INTO users VALUES (?, ?, '', '')", rows)
+        conn.commit()
+
+    storage = InterviewStorage(db_path=db_path)
+    assert [h.interview_id for h in storage.get_user_profile("user_1").interview_history] == ["mock_0"]
+
+    with sqlite3.connect(db_path) as conn:
+        blobs = dict(conn.execute("SELECT user_id, profile_data FROM users WHERE user_id != 'user_1'"))
+        migrated = conn.execute("SELECT user_id FROM user_interview_history UNION "
+                                "SELECT user_id FROM user_skills").fetchall()
+    assert blobs == {"user_2": bad_history, "user_3": bad_skills, "user_4": "[1, 2]"}
+    assert migrated == [("user_1",)]
+
+    # Retried on the next start once the blobs are fixed
+    fixed = json.dumps({**json.loads(bad_skills), "skills": ["Go"]})
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+        conn.execute("DELETE FROM users WHERE user_id = 'user_2'")
+        conn.execute("UPDATE users SET profile_data = ? WHERE user_id = 'user_3'", (fixed,))
+        conn.commit()
+
+    storage = InterviewStorage(db_path=db_path)
+    assert [h.interview_id for h in storage.get_user_profile("user_3").interview_history] == ["mock_0"]
+    assert storage.get_user_profile("user_3").skills == ["Go"]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from utils.resources import tracked_llm_call
+from utils.tracing import (JsonlSpanExporter, MemorySpanExporter, Span, Tracer, critical_path_report, load_spans,
+                           main, set_tracer, span, trace_id_for, traced)
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemorySpanExporter()
+    previous = set_tracer(Tracer(exporter))
+    yield exporter
+    set_tracer(previous)
+
+
+def by_name(exporter):
+    return {s.name: s for s in exporter.spans}
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_threads(exporter):
+    @traced("storage.save")
+    def save():
+        return "saved"
+
+    async def evaluate():
+        with span("node.evaluate"):
+            await asyncio.to_thread(save)
+
+    with span("interview", trace_id=trace_id_for("mock_1"), interview_id="mock_1"):
+        await asyncio.create_task(evaluate())
+
+    spans = by_name(exporter)
+    assert spans["interview"].trace_id == trace_id_for("mock_1")
+    assert spans["interview"].parent_span_id is None
+    assert spans["node.evaluate"].parent_span_id == spans["interview"].span_id
+    assert spans["storage.save"].parent_span_id == spans["node.evaluate"].span_id
+    assert {s.trace_id for s in exporter.spans} == {trace_id_for("mock_1")}
+
+
+@pytest.mark.asyncio
+async def test_llm_attempts_and_errors_are_recorded(exporter):
+    async def failing():
+        raise ValueError("rate limited")
+
+    with pytest.raises(ValueError):
+        await tracked_llm_call(failing(), "llm.feedback", attempt=1)
+    assert await tracked_llm_call(asyncio.sleep(0, "ok"), "llm.feedback", attempt=2) == "ok"
+
+    first, second = exporter.spans
+    assert (first.status, first.status_message) == ("ERROR", "ValueError: rate limited")
+    assert (second.status, second.attributes) == ("OK", {"attempt": 2})
+
+
+def test_explicit_parent_links_spans_from_other_tasks(exporter):
+    with span("interview") as root:
+        pass
+    with span("ws.send", parent=root, messages=2):
+        pass
+
+    assert exporter.spans[1].parent_span_id == root.span_id
+    assert exporter.spans[1].trace_id == root.trace_id
+
+
+def make_span(name, start, end, span_id, parent=None):
+    ms = 1_000_000
+    return Span(name, "t" * 32, span_id, parent, start * ms, end * ms, {"interview_id": "mock_1"} if not parent else {})
+
+
+def test_critical_path_follows_last_finishing_children():
+    spans = [
+        make_span("interview", 0, 100, "root"),
+        make_span("node.ask", 0, 30, "ask", "root"),
+        make_span("voice.speak", 5, 30, "speak", "ask"),
+        make_span("node.evaluate", 30, 100, "eval", "root"),
+        make_span("llm.feedback", 35, 90, "llm", "eval"),
+        make_span("storage.file.save", 40, 50, "save", "eval"),  # Overlaps the LLM call, not on the path
+        make_span("ws.send", 92, 95, "send", "root"),  # Ends before evaluate, which is already on the path
+    ]
+    lines = critical_path_report(spans)
+
+    assert lines[0] == "interview mock_1: 100.0ms"
+    names = [line.split()[-1] for line in lines[1:-1]]
+    assert names == ["interview", "node.ask", "voice.speak", "node.evaluate", "llm.feedback"]
+    assert lines[-1] == "  time on critical path: llm 55.0ms, voice 25.0ms, node 20.0ms, interview 0.0ms"
+
+
+def test_jsonl_export_and_cli(tmp_path, capsys):
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonlSpanExporter(path)
+    tracer = Tracer(exporter)
+    with tracer.span("interview", trace_id=trace_id_for("mock_1"), interview_id="mock_1"):
+        with tracer.span("node.initialize"):
+            pass
+    with tracer.span("interview", trace_id=trace_id_for("mock_2")):
+        pass
+    exporter.shutdown()
+
+    assert [s.name for s in load_spans(path, trace_id_for("mock_1"))] == ["node.initialize", "interview"]
+    assert main(["mock_1", str(path)]) == 0
+    output = capsys.readouterr().out
+    assert output.startswith("interview mock_1:")
+    assert "node.initialize" in output
+    assert main(["mock_3", str(path)]) == 1
@@ -0,0 +1,88 @@
+import asyncio
+import time
+import pytest
+from utils.tts import TTSWorker
+
+
+class FakeEngine:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.synthesized = []
+        self.spoken = []
+        self._pending_file = None
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, text):
+        self.spoken.append(text)
+
+    def save_to_file(self, text, path):
+        self.synthesized.append(text)
+        self._pending_file = path
+
+    def runAndWait(self):
+        time.sleep(self.delay)
+        if self._pending_file:
+            with open(self._pending_file, "wb") as f:
+                f.write(b"RIFF")
+            self._pending_file = None
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+
+@pytest.fixture
+def worker(tmp_path, engine):
+    worker = TTSWorker(cache_dir=tmp_path, engine_factory=lambda: engine)
+    yield worker
+    worker.stop()
+
+
+@pytest.mark.asyncio
+async def test_synthesis_is_cached_by_content(worker, engine):
+    paths = await asyncio.gather(*(worker.synthesize("Tell me about yourself.") for _ in range(5)))
+    assert len(set(paths)) == 1 and paths[0].exists()
+    assert engine.synthesized == ["Tell me about yourself."]
+
+    assert await worker.synthesize("Tell me about yourself.") == paths[0]
+    assert engine.synthesized == ["Tell me about yourself."]
+
+
+@pytest.mark.asyncio
+async def test_speak_does_not_block_event_loop(worker, engine):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await worker.speak("Welcome to your mock interview.")
+    task.cancel()
+    assert engine.spoken == ["Welcome to your mock interview."]
+    assert ticks > 3
+
+
+@pytest.mark.asyncio
+async def test_prewarm_skips_cached_prompts(worker, engine):
+    await worker.synthesize("Question one?")
+    assert worker.prewarm(["Question one?", "Question two?", "Question two?", ""]) == 1
+    await worker.synthesize("Question two?")
+    assert engine.synthesized == ["Question one?", "Question two?"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_synthesis(worker, engine):
+    first = asyncio.create_task(worker.synthesize("Shared question"))
+    second = asyncio.create_task(worker.synthesize("Shared question"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    path = await asyncio.wait_for(second, timeout=2)
+    assert path is not None and path.exists()
+    assert engine.synthesized == ["Shared question"]
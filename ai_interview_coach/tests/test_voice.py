@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+import speech_recognition as sr
+from utils.voice import ASRBackend, SpeechCapture, AudioChunkChannel, LocalASRBackend, TextInputChannel
+from tests.audio_fixtures import write_answer_wav, PacedAudioFile
+
+SPEEDUP = 10.0
+
+
+@pytest.fixture
+def answer_wav(tmp_path):
+    return write_answer_wav(tmp_path / "answer.wav")
+
+
+def _capture(answer_wav):
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = True
+    recognizer.energy_threshold = 4000
+    return SpeechCapture(recognizer, source_factory=lambda: PacedAudioFile(answer_wav, SPEEDUP),
+                         calibration_duration=1.0, poll_interval=0.5)
+
+
+@pytest.mark.asyncio
+async def test_calibrates_once_per_session(answer_wav):
+    capture = _capture(answer_wav)
+    for _ in range(3):
+        audio = await capture.capture(timeout=5)
+        assert audio is not None and len(audio.frame_data) > 0
+    assert capture.calibrations == 1
+
+
+@pytest.mark.asyncio
+async def test_recalibrates_on_drift(answer_wav):
+    capture = _capture(answer_wav)
+    await capture.capture(timeout=5)
+    capture.recognizer.energy_threshold *= 3
+    assert capture.needs_calibration()
+    await capture.capture(timeout=5)
+    assert capture.calibrations == 2
+
+
+@pytest.mark.asyncio
+async def test_per_answer_latency_drops_after_first_answer(answer_wav):
+    capture = _capture(answer_wav)
+    delays = []
+    for _ in range(3):
+        await capture.capture(timeout=5)
+        delays.append(capture.last_listen_delay)
+
+    # Calibration samples 1s of audio, i.e. 1 / SPEEDUP seconds of wall time with the paced fixture
+    assert delays[0] >= 0.5 / SPEEDUP
+    assert max(delays[1:]) < 0.2 / SPEEDUP
+
+
+@pytest.mark.asyncio
+async def test_capture_does_not_block_loop_and_cancels(answer_wav):
+    capture = _capture(answer_wav)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticking = asyncio.create_task(ticker())
+    listening = asyncio.create_task(capture.capture(timeout=5))
+    await asyncio.sleep(0.1)
+    listening.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listening
+    ticking.cancel()
+    assert ticks > 5
+
+
+async def _chunks(frames, size=3200):
+    for i in range(0, len(frames), size):
+        yield frames[i:i + size]
+
+
+def _frames(path):
+    import wave
+    with wave.open(str(path), "rb") as f:
+        return f.readframes(f.getnframes())
+
+
+@pytest.mark.asyncio
+async def test_local_backend_streams_partials_then_final(tmp_path, answer_wav):
+    answer_wav.with_suffix(".txt").write_text("I built a caching layer in Python")
+    backend = LocalASRBackend(fixtures_dir=tmp_path)
+
+    transcripts = [t async for t in backend.transcribe(_chunks(_frames(answer_wav)))]
+    partials = [t.text for t in transcripts if not t.is_final]
+    assert len(partials) > 1
+    assert all(b.startswith(a) for a, b in zip(partials, partials[1:]))
+    assert transcripts[-1].is_final and transcripts[-1].text == "I built a caching layer in Python"
+
+
+@pytest.mark.asyncio
+async def test_local_backend_unknown_audio(tmp_path):
+    backend = LocalASRBackend(fixtures_dir=tmp_path)
+    transcripts = [t async for t in backend.transcribe(_chunks(b"\x00" * 64000))]
+    assert [(t.text, t.is_final) for t in transcripts] == [("", True)]
+
+
+def test_backends_must_implement_transcribe():
+    class SilentBackend(ASRBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        SilentBackend()
+
+
+@pytest.mark.asyncio
+async def test_audio_channel_separates_utterances(tmp_path, answer_wav):
+    answer_wav.with_suffix(".txt").write_text("first answer")
+    backend = LocalASRBackend(fixtures_dir=tmp_path)
+    channel = AudioChunkChannel()
+    frames = _frames(answer_wav)
+    for _ in range(2):
+        async for chunk in _chunks(frames):
+            channel.feed(chunk)
+        channel.end()
+
+    for _ in range(2):
+        finals = [t.text async for t in backend.transcribe(channel) if t.is_final]
+        assert finals == ["first answer"]
+
+    channel.feed(frames[:3200])
+    channel.end()
+    assert channel.clear() == 2
+
+
+@pytest.mark.asyncio
+async def test_capture_stream_yields_chunks_and_keeps_audio(answer_wav):
+    capture = _capture(answer_wav)
+    chunks = [chunk async for chunk in capture.stream(timeout=5)]
+    assert len(chunks) > 1
+    assert capture.last_audio.frame_data == b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_text_channel_wakes_waiter_immediately():
+    channel = TextInputChannel()
+    loop = asyncio.get_running_loop()
+    waiting = asyncio.create_task(channel.get(timeout=60))
+    await asyncio.sleep(0.01)
+
+    pushed = loop.time()
+    channel.push("my typed answer")
+    assert await waiting == "my typed answer"
+    assert loop.time() - pushed < 0.05
+
+
+@pytest.mark.asyncio
+async def test_text_channel_keeps_order_and_times_out():
+    channel = TextInputChannel()
+    channel.push("first")
+    channel.push("second")
+    assert await channel.get(timeout=1) == "first"
+    assert await channel.get(timeout=1) == "second"
+    assert await channel.get(timeout=0.01) is None
+
+    channel.push("stale")
+    assert channel.clear() == 1
+    assert len(channel) == 0
@@ -0,0 +1,142 @@
+import logging
+from typing import Dict, Any, Optional
+import numpy as np
+from config import Config
+
+
+def pcm_to_array(frame_data: bytes, sample_width: int = 2) -> np.ndarray:
+    """Decode little-endian signed PCM into float32 samples in [-1, 1]."""
+    if sample_width == 1:
+        return (np.frombuffer(frame_data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    dtype = {2: "<i2", 4: "<i4"}.get(sample_width)
+    if dtype is None:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+    samples = np.frombuffer(frame_data[:len(frame_data) - len(frame_data) % sample_width], dtype=dtype)
+    return samples.astype(np.float32) / float(2 ** (8 * sample_width - 1))
+
+
+def _runs(mask: np.ndarray):
+    """Start indices, lengths and values of the constant runs of a boolean array."""
+    change = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], change))
+    lengths = np.diff(np.concatenate((starts, [mask.size])))
+    return starts, lengths, mask[starts]
+
+
+def _fill_short_gaps(voiced: np.ndarray, min_gap: int) -> np.ndarray:
+    """Treat silences shorter than `min_gap` frames between voiced frames as speech."""
+    starts, lengths, values = _runs(voiced)
+    filled = voiced.copy()
+    interior = (~values) & (starts > 0) & (starts + lengths < voiced.size) & (lengths < min_gap)
+    for start, length in zip(starts[interior], lengths[interior]):
+        filled[start:start + length] = True
+    return filled
+
+
+def extract_acoustic_features(samples: np.ndarray, sample_rate: int, transcript: str = "",
+                              frame_ms: Optional[int] = None, min_pause_ms: Optional[int] = None) -> Dict[str, Any]:
+    """Measure delivery features of one spoken answer from its raw samples.
+
+    Frames are scored by RMS energy against an adaptive noise floor; pauses are
+    silent runs of at least `min_pause_ms` inside the speech region, and the
+    speech-rate proxy counts energy peaks (roughly syllable nuclei) per voiced segment.
+    """
+    frame_ms = frame_ms or Config.ACOUSTIC_FRAME_MS
+    min_pause_ms = min_pause_ms or Config.ACOUSTIC_MIN_PAUSE_MS
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    frame_seconds = frame_len / sample_rate
+    n_frames = samples.size // frame_len
+    words = len(transcript.split())
+    features = {
+        "duration": samples.size / sample_rate if sample_rate else 0.0,
+        "speech_duration": 0.0,
+        "voiced_duration": 0.0,
+        "words": words,
+        "wpm": 0.0,
+        "articulation_rate": 0.0,
+        "pause_count": 0,
+        "pause_mean": 0.0,
+        "pause_max": 0.0,
+        "pause_total": 0.0,
+        "speech_rate_variance": 0.0,
+        "volume_stability": 0.0,
+        "volume_db_std": 0.0
+    }
+    if n_frames < 3:
+        return features
+
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    noise_floor, peak = np.percentile(rms, [10, 95])
+    threshold = max(noise_floor * 3.0, noise_floor + 0.1 * (peak - noise_floor), 1e-4)
+    voiced = _fill_short_gaps(rms > threshold, int(np.ceil(min_pause_ms / frame_ms)))
+    voiced_idx = np.flatnonzero(voiced)
+    if voiced_idx.size == 0:
+        return features
+
+    region = voiced[voiced_idx[0]:voiced_idx[-1] + 1]
+    region_rms = rms[voiced_idx[0]:voiced_idx[-1] + 1]
+    starts, lengths, values = _runs(region)
+    pauses = lengths[~values] * frame_seconds
+    segment_lengths = lengths[values]
+
+    speech_duration = region.size * frame_seconds
+    voiced_duration = segment_lengths.sum() * frame_seconds
+
+    # Local energy maxima inside voiced frames approximate syllable nuclei
+    inner = region_rms[1:-1]
+    peaks = np.zeros(region.size, dtype=bool)
+    peaks[1:-1] = (inner > region_rms[:-2]) & (inner >= region_rms[2:]) & region[1:-1] & (inner > threshold * 1.5)
+    # The region starts voiced, so segment k (1-based) begins at the k-th rising edge
+    segment_ids = np.cumsum(np.concatenate(([False], np.diff(region.astype(np.int8)) == 1))) + 1
+    peak_counts = np.bincount(segment_ids[peaks], minlength=segment_lengths.size + 1)[1:]
+    segment_rates = peak_counts / (segment_lengths * frame_seconds)
+
+    voiced_rms = region_rms[region]
+    volume_db = 20 * np.log10(np.maximum(voiced_rms, 1e-6))
+    volume_cv = voiced_rms.std() / voiced_rms.mean() if voiced_rms.mean() > 0 else 1.0
+
+    features.update({
+        "speech_duration": float(speech_duration),
+        "voiced_duration": float(voiced_duration),
+        "wpm": float(words / speech_duration * 60) if speech_duration else 0.0,
+        "articulation_rate": float(words / voiced_duration * 60) if voiced_duration else 0.0,
+        "pause_count": int(pauses.size),
+        "pause_mean": float(pauses.mean()) if pauses.size else 0.0,
+        "pause_max": float(pauses.max()) if pauses.size else 0.0,
+        "pause_total": float(pauses.sum()),
+        "speech_rate_variance": float(segment_rates.var()) if segment_rates.size > 1 else 0.0,
+        "volume_stability": float(np.clip(1.0 - volume_cv, 0.0, 1.0)),
+        "volume_db_std": float(volume_db.std())
+    })
+    return features
+
+
+def features_from_pcm(frame_data: bytes, sample_rate: int, sample_width: int, transcript: str = "") -> Dict[str, Any]:
+    try:
+        return extract_acoustic_features(pcm_to_array(frame_data, sample_width), sample_rate, transcript)
+    except Exception as e:
+        logging.error(f"Error extracting acoustic features: {e}")
+        return {}
+
+
+def vocal_scores(features: Dict[str, Any]) -> Dict[str, float]:
+    """Map measured features onto the 0-10 pace and confidence scales used in feedback."""
+    wpm = features.get("wpm", 0.0)
+    low, high = Config.IDEAL_WPM_RANGE
+    if wpm <= 0:
+        pace = 5.0
+    elif wpm < low:
+        pace = 10.0 - (low - wpm) / 10.0
+    elif wpm > high:
+        pace = 10.0 - (wpm - high) / 10.0
+    else:
+        pace = 10.0
+
+    speech_duration = features.get("speech_duration", 0.0)
+    pause_ratio = features.get("pause_total", 0.0) / speech_duration if speech_duration else 0.0
+    confidence = 10.0 * (0.6 * features.get("volume_stability", 0.5) + 0.4 * (1.0 - min(1.0, pause_ratio * 2)))
+    return {
+        "pace": round(float(np.clip(pace, 1.0, 10.0)), 1),
+        "confidence": round(float(np.clip(confidence, 1.0, 10.0)), 1)
+    }
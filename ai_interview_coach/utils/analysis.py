@@ -1,22 +1,150 @@
 import logging
-from typing import Dict, Any
+from bisect import bisect_left
+from typing import Dict, Any, Iterable, List, Optional
 from config import Config
+from utils.acoustics import vocal_scores
+
+
+class FillerDetector:
+    """Single-pass filler and hedging detector over a configurable lexicon.
+
+    The lexicon is compiled into a token trie (an Aho-Corasick style keyword
+    automaton over words), so multi-word entries ("you know") match, punctuation
+    is ignored ("um,"), and only tokens that can start an entry are examined.
+    """
+
+    PUNCTUATION = "!\"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\u201c\u201d\u2018\u2019\u2026\u2014\u2013"
+    MAX_ELONGATION = 5  # Extra repeats of the last letter accepted for one-word entries ("ummm")
+
+    def __init__(self, fillers: Optional[Iterable[str]] = None, hedges: Optional[Iterable[str]] = None):
+        self.fillers = [f.lower() for f in (fillers if fillers is not None else Config.FILLER_WORDS)]
+        self.hedges = [h.lower() for h in (hedges if hedges is not None else Config.HEDGE_WORDS)]
+        self._trie: Dict[Optional[str], Any] = {}
+        for term in self.fillers:
+            self._add(term, "filler")
+        for term in self.hedges:
+            self._add(term, "hedge")
+
+    def _add(self, term: str, category: str):
+        words = term.split()
+        variants = [words]
+        if len(words) == 1:
+            variants += [[term + term[-1] * n] for n in range(1, self.MAX_ELONGATION + 1)]
+        for variant in variants:
+            node = self._trie
+            for word in variant:
+                node = node.setdefault(word, {})
+            node[None] = (term, category, len(words))
+
+    @staticmethod
+    def _locate(text: str, token: str, cursor: int) -> int:
+        """Offset of the next whitespace-delimited occurrence of `token` at or after `cursor`."""
+        pos = text.find(token, cursor)
+        while pos > 0 and not text[pos - 1].isspace() or (
+                pos + len(token) < len(text) and not text[pos + len(token)].isspace()):
+            pos = text.find(token, pos + 1)
+        return pos
+
+    def detect(self, text: str, with_positions: bool = True) -> Dict[str, Any]:
+        lowered = (text or "").lower()
+        raw_tokens = lowered.split()
+        punctuation = self.PUNCTUATION
+        tokens = [token.strip(punctuation) for token in raw_tokens]
+        trie = self._trie
+        n_tokens = len(tokens)
+        empty = [i for i, token in enumerate(tokens) if not token] if "" in tokens else []
+
+        counts = {"filler": {}, "hedge": {}}
+        positions = []
+        cursor = 0
+        next_free = 0
+        for i in [i for i, token in enumerate(tokens) if token in trie]:
+            if i < next_free:
+                continue
+            if with_positions:
+                cursor = self._locate(lowered, raw_tokens[i], cursor)
+            node = trie[tokens[i]]
+            best, best_end = node.get(None), i + 1
+            j = i + 1
+            while j < n_tokens:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if None in node:
+                    best, best_end = node[None], j
+
+            if best is None:
+                cursor += len(raw_tokens[i])
+                continue
+            term, category, _ = best
+            counts[category][term] = counts[category].get(term, 0) + 1
+            next_free = best_end
+            if not with_positions:
+                continue
+
+            first, last = raw_tokens[i], raw_tokens[best_end - 1]
+            start = cursor + len(first) - len(first.lstrip(punctuation))
+            for k in range(i + 1, best_end):
+                cursor = self._locate(lowered, raw_tokens[k], cursor + 1)
+            end = cursor + len(last.rstrip(punctuation))
+            positions.append({
+                "term": term,
+                "category": category,
+                "start": start,
+                "end": end,
+                "word_index": i - bisect_left(empty, i)
+            })
+            cursor += len(last)
+
+        word_count = n_tokens - len(empty)
+        filler_count = sum(counts["filler"].values())
+        hedge_count = sum(counts["hedge"].values())
+        per_hundred = 100.0 / word_count if word_count else 0.0
+        return {
+            "word_count": word_count,
+            "filler_count": filler_count,
+            "hedge_count": hedge_count,
+            "fillers": counts["filler"],
+            "hedges": counts["hedge"],
+            "filler_rate": filler_count * per_hundred,
+            "hedge_rate": hedge_count * per_hundred,
+            "positions": positions
+        }
+
+    def detect_batch(self, texts: Iterable[str], with_positions: bool = False) -> List[Dict[str, Any]]:
+        """Score many transcripts; positions are skipped by default since aggregate scoring rarely needs them."""
+        return [self.detect(text, with_positions) for text in texts]
+
+
+_default_detector: Optional[FillerDetector] = None
+
+
+def get_filler_detector() -> FillerDetector:
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = FillerDetector()
+    return _default_detector
+
+
+def _neutral_features() -> Dict[str, Any]:
+    return {
+        "word_count": 0,
+        "filler_words": 0,
+        "pace": 5,
+        "confidence": 5,
+        "estimated_tone": "neutral"
+    }
+
 
 def analyze_audio_features(text: str) -> Dict[str, Any]:
     try:
         if not Config.VOICE_ENABLED:
-            return {
-                "word_count": 0,
-                "filler_words": 0,
-                "pace": 5,
-                "confidence": 5,
-                "estimated_tone": "neutral"
-            }
-
-        words = text.split()
-        word_count = len(words)
-        filler_words = sum(1 for word in words if word.lower() in
-                           ["um", "uh", "like", "you know", "ah"])
+            return _neutral_features()
+
+        detection = get_filler_detector().detect(text)
+        word_count = detection["word_count"]
+        filler_words = detection["filler_count"]
 
         pace = min(10, max(1, int((word_count / 10) * 6)))
         confidence = max(1, min(10, 10 - (filler_words * 2)))
@@ -24,16 +152,66 @@ def analyze_audio_features(text: str) -> Dict[str, Any]:
         return {
             "word_count": word_count,
             "filler_words": filler_words,
+            "filler_rate": detection["filler_rate"],
+            "hedge_words": detection["hedge_count"],
+            "hedge_rate": detection["hedge_rate"],
+            "fillers": detection["fillers"],
             "pace": pace,
             "confidence": confidence,
             "estimated_tone": "neutral"
         }
     except Exception as e:
         logging.error(f"Error analyzing audio features: {e}")
-        return {
-            "word_count": 0,
-            "filler_words": 0,
-            "pace": 5,
-            "confidence": 5,
-            "estimated_tone": "neutral"
-        }
\ No newline at end of file
+        return _neutral_features()
+
+
+def analyze_audio_features_batch(texts: Iterable[str]) -> List[Dict[str, Any]]:
+    return [analyze_audio_features(text) for text in texts]
+
+
+def build_vocal_feedback(text: str, acoustic_features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Vocal metrics and templated suggestions computed locally instead of by the LLM.
+
+    Filler counts come from the transcript; pace and confidence come from the
+    measured audio when there is any, otherwise from the transcript heuristics.
+    """
+    acoustic_features = acoustic_features or {}
+    text_features = analyze_audio_features(text)
+    metrics = {
+        "pace": float(text_features["pace"]),
+        "confidence": float(text_features["confidence"]),
+        "filler_words": float(text_features["filler_words"])
+    }
+    measured = bool(acoustic_features.get("speech_duration"))
+    if measured:
+        metrics.update(vocal_scores(acoustic_features))
+
+    suggestions = []
+    fillers = text_features.get("fillers", {})
+    if text_features.get("filler_rate", 0) > Config.FILLER_RATE_LIMIT:
+        top = ", ".join(f"'{term}'" for term, _ in sorted(fillers.items(), key=lambda f: -f[1])[:2])
+        suggestions.append(f"Reduce filler words such as {top}; a short silent pause works better.")
+    if text_features.get("hedge_rate", 0) > Config.FILLER_RATE_LIMIT:
+        suggestions.append("State your conclusions directly instead of hedging with phrases like 'I think'.")
+    if measured:
+        low, high = Config.IDEAL_WPM_RANGE
+        wpm = acoustic_features.get("wpm", 0)
+        if wpm > high:
+            suggestions.append(f"Slow down: you spoke at about {wpm:.0f} words per minute; aim for {low}-{high}.")
+        elif 0 < wpm < low:
+            suggestions.append(f"Pick up the pace slightly: about {wpm:.0f} words per minute; aim for {low}-{high}.")
+        if acoustic_features.get("pause_max", 0) > Config.LONG_PAUSE_SECONDS:
+            suggestions.append("Avoid long silences; if you need time, say so briefly and then structure your answer.")
+        if acoustic_features.get("volume_stability", 1) < 0.5:
+            suggestions.append("Keep your volume steady so every point lands clearly.")
+    if not suggestions:
+        suggestions.append("Keep up the steady, clear delivery.")
+
+    summary = (f"{int(metrics['filler_words'])} filler word(s) detected" +
+               (f", speaking at about {acoustic_features.get('wpm', 0):.0f} words per minute with "
+                f"{acoustic_features.get('pause_count', 0)} noticeable pause(s)." if measured else "."))
+    return {
+        "vocal_feedback": summary,
+        "vocal_metrics": metrics,
+        "vocal_suggestions": suggestions
+    }
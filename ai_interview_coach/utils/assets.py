@@ -0,0 +1,164 @@
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+from starlette.requests import Request
+from starlette.responses import Response
+from config import Config
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are only built when the brotli package is installed
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Content types worth compressing; images and audio are already compressed
+COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+@dataclass
+class Asset:
+    name: str
+    content_type: str
+    body: bytes
+    etag: str
+    variants: Dict[str, bytes] = field(default_factory=dict)  # Content-Encoding -> precompressed body
+
+    @classmethod
+    def build(cls, name: str, body: bytes, content_type: Optional[str] = None) -> "Asset":
+        content_type = content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+        asset = cls(name, content_type, body, f'"{hashlib.sha256(body).hexdigest()[:16]}"')
+        if content_type.startswith(COMPRESSIBLE) and len(body) >= Config.ASSET_MIN_COMPRESS_BYTES:
+            candidates = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                candidates["br"] = brotli.compress(body, quality=11)
+            # A variant that does not save bytes is not worth a Content-Encoding header
+            asset.variants = {encoding: data for encoding, data in candidates.items() if len(data) < len(body)}
+        return asset
+
+    @property
+    def fingerprint(self) -> str:
+        return self.etag.strip('"')[:10]
+
+    def select(self, accept_encoding: str) -> tuple:
+        """Smallest precompressed variant the client accepts, or the identity body."""
+        accepted = _accepted_encodings(accept_encoding)
+        encodings = [encoding for encoding in self.variants if encoding in accepted]
+        if not encodings:
+            return None, self.body
+        encoding = min(encodings, key=lambda e: len(self.variants[e]))
+        return encoding, self.variants[encoding]
+
+    def response(self, request: Request, cache_control: str = REVALIDATE) -> Response:
+        """The asset for `request`: 304 when the client's copy is current, else the best encoding."""
+        headers = {"ETag": self.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("if-none-match", ""), self.etag):
+            return Response(status_code=304, headers=headers)
+        encoding, body = self.select(request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.content_type, headers=headers)
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        encoding, _, params = part.strip().partition(";")
+        quality = re.search(r"q=([0-9.]+)", params)
+        if encoding and not (quality and float(quality.group(1)) == 0):
+            accepted.add(encoding.strip().lower())
+    return accepted
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    # Weak validators match too: they are what proxies send after recompressing
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+class AssetStore:
+    """Static files loaded once at startup, fingerprinted and precompressed in memory.
+
+    Each asset is served under `/static/<stem>.<fingerprint><suffix>` with an
+    immutable cache header, since a changed file gets a new URL. The HTML page
+    linking them is rewritten to those URLs and revalidated with its ETag, so
+    browsers pick up a deploy on the next load without refetching unchanged files.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, prefix: str = "/static"):
+        self.directory = Path(directory or Config.STATIC_DIR)
+        self.prefix = prefix
+        self.assets: Dict[str, Asset] = {}
+        self._by_url: Dict[str, Asset] = {}
+        self._stats = {"hits": 0, "not_modified": 0, "compressed": 0, "misses": 0}
+        self.load()
+
+    def load(self):
+        assets = {}
+        for path in sorted(self.directory.rglob("*")):
+            if path.is_file() and path.suffix != ".html":
+                name = path.relative_to(self.directory).as_posix()
+                assets[name] = Asset.build(name, path.read_bytes())
+        pages = {}
+        for path in sorted(self.directory.rglob("*.html")):
+            name = path.relative_to(self.directory).as_posix()
+            pages[name] = Asset.build(name, self._rewrite(path.read_text(encoding="utf-8"), assets).encode("utf-8"))
+        self.assets = {**assets, **pages}
+        self._by_url = {self._fingerprinted(asset): asset for asset in assets.values()}
+
+    def _fingerprinted(self, asset: Asset) -> str:
+        stem, dot, suffix = asset.name.rpartition(".")
+        return f"{stem}.{asset.fingerprint}.{suffix}" if dot else f"{asset.name}.{asset.fingerprint}"
+
+    def url_for(self, name: str) -> str:
+        return f"{self.prefix}/{self._fingerprinted(self.assets[name])}"
+
+    def _rewrite(self, html: str, assets: Dict[str, Asset]) -> str:
+        """Point `static/<name>` references in `html` at the fingerprinted URLs."""
+        def replace(match):
+            asset = assets.get(match.group(2))
+            if asset is None:
+                return match.group(0)
+            return f'{match.group(1)}"{self.prefix}/{self._fingerprinted(asset)}"'
+        return re.sub(r'((?:href|src)=)"/?static/([^"?#]+)"', replace, html)
+
+    def page(self, name: str, request: Request) -> Response:
+        """An HTML page; revalidated on every load because its URL never changes."""
+        return self._serve(self.assets[name], request, REVALIDATE)
+
+    def serve(self, path: str, request: Request) -> Response:
+        """A file under the static prefix, immutable when requested by its fingerprinted name."""
+        asset = self._by_url.get(path)
+        if asset is not None:
+            return self._serve(asset, request, IMMUTABLE)
+        asset = self.assets.get(path)
+        if asset is None:
+            self._stats["misses"] += 1
+            return Response(status_code=404)
+        # Unversioned URLs (old pages, bookmarks) still work but must revalidate
+        return self._serve(asset, request, REVALIDATE)
+
+    def _serve(self, asset: Asset, request: Request, cache_control: str) -> Response:
+        response = asset.response(request, cache_control)
+        self._stats["hits"] += 1
+        if response.status_code == 304:
+            self._stats["not_modified"] += 1
+        elif "content-encoding" in response.headers:
+            self._stats["compressed"] += 1
+        return response
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "assets": len(self.assets),
+            "bytes": sum(len(asset.body) for asset in self.assets.values()),
+            "compressed_bytes": sum(min(map(len, asset.variants.values()), default=len(asset.body))
+                                    for asset in self.assets.values()),
+            "brotli": brotli is not None
+        }
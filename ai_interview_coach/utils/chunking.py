@@ -0,0 +1,74 @@
+import logging
+import re
+from typing import Callable, List, Optional
+
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+_encoder: Optional[Callable[[str], List[int]]] = None
+_encoder_loaded = False
+
+
+def _get_encoder() -> Optional[Callable[[str], List[int]]]:
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        _encoder_loaded = True
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base").encode
+        except Exception as e:
+            # tiktoken missing, or its encoding file cannot be downloaded
+            logging.warning(f"tiktoken unavailable, estimating token counts: {e}")
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """Model tokens in `text`; roughly 4 characters per token when tiktoken is unavailable."""
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder(text))
+    return (len(text) + 3) // 4
+
+
+def _pieces(text: str, max_tokens: int) -> List[str]:
+    """Lines of `text`, with any line over budget split by sentence and then by words."""
+    pieces = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if count_tokens(line) <= max_tokens:
+            pieces.append(line)
+            continue
+        for sentence in SENTENCE_END.split(line):
+            if count_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            words, current = sentence.split(), []
+            for word in words:
+                if current and count_tokens(" ".join(current + [word])) > max_tokens:
+                    pieces.append(" ".join(current))
+                    current = []
+                current.append(word)
+            if current:
+                pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_text(text: str, max_tokens: int, overlap_lines: int = 1) -> List[str]:
+    """Pack whole lines of `text` into chunks of at most `max_tokens` tokens.
+
+    Consecutive chunks share the last `overlap_lines` lines of the previous one
+    (when they fit), so an entry split across a boundary is still seen whole.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for piece in _pieces(text, max_tokens):
+        tokens = count_tokens(piece) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            carried = current[-overlap_lines:] if overlap_lines else []
+            carried_tokens = sum(count_tokens(line) + 1 for line in carried)
+            current, current_tokens = (carried, carried_tokens) if carried_tokens + tokens <= max_tokens else ([], 0)
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -29,7 +29,7 @@ class InterviewDashboard:
         self.console.print(table)
 
     def display_summary(self, summary: dict):
-        logging.debug(f"Summary data received: {summary}")
+        logging.debug("Summary data received: %s", summary)
         table = Table(title="Interview Summary Report")
         table.add_column("Category", style="cyan")
         table.add_column("Details", style="green")
@@ -4,26 +4,49 @@ from datetime import datetime
 from typing import Dict, List
 import uuid
 from config import Config
+from utils.question_stats import QuestionStatsIndex
+from utils.tracing import traced
 
 
 class FileStorage:
     def __init__(self):
         self.storage_path = Path(Config.STORAGE_DIR) / "interviews"
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.question_stats = QuestionStatsIndex()
 
     def _get_file_path(self, interview_id: str) -> Path:
         return self.storage_path / f"{interview_id}.json"
 
+    @traced("storage.file.save_interview")
     def save_interview(self, interview_data: Dict) -> bool:
         try:
             file_path = self._get_file_path(interview_data['interview_id'])
             with open(file_path, 'w') as f:
                 json.dump(interview_data, f, indent=2, default=str)
-            return True
         except Exception as e:
             print(f"Error saving interview: {e}")
             return False
 
+        try:
+            self.question_stats.record_interview(interview_data)
+        except Exception as e:
+            print(f"Error updating question statistics: {e}")
+        return True
+
+    @traced("storage.file.save_checkpoint")
+    def save_checkpoint(self, interview_data: Dict) -> bool:
+        """Save an unfinished interview apart from completed ones, without updating question statistics"""
+        try:
+            checkpoint_dir = self.storage_path.parent / "checkpoints"
+            checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            with open(checkpoint_dir / f"{interview_data['interview_id']}.json", 'w') as f:
+                json.dump(interview_data, f, indent=2, default=str)
+            return True
+        except Exception as e:
+            print(f"Error saving interview checkpoint: {e}")
+            return False
+
+    @traced("storage.file.load_interview")
     def load_interview(self, interview_id: str) -> Dict:
         try:
             file_path = self._get_file_path(interview_id)
@@ -35,6 +58,7 @@ class FileStorage:
             print(f"Error loading interview: {e}")
             return None
 
+    @traced("storage.file.get_user_interviews")
     def get_user_interviews(self, user_id: str) -> List[Dict]:
         interviews = []
         for file in self.storage_path.glob("*.json"):
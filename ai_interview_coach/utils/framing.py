@@ -0,0 +1,105 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+try:
+    import msgpack
+except ImportError:  # Binary framing is only offered when msgpack is installed
+    msgpack = None
+
+# Websocket subprotocols, most compact first. Clients that offer none get the
+# original framing: one JSON object per text frame, full payloads every time.
+MSGPACK_V2 = "coach.msgpack.v2"
+JSON_V2 = "coach.json.v2"
+# Messages whose payloads repeat most of their structure, sent as changes from the previous one
+DELTA_TYPES = ("feedback",)
+UNSET = "$unset"
+
+
+def supported_subprotocols() -> List[str]:
+    return [MSGPACK_V2, JSON_V2] if msgpack is not None else [JSON_V2]
+
+
+def negotiate(offered: Sequence[str]) -> Optional[str]:
+    """The most compact subprotocol both sides support, or None for the original framing."""
+    for subprotocol in supported_subprotocols():
+        if subprotocol in offered:
+            return subprotocol
+    return None
+
+
+def make_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Changes turning `previous` into `current`; nested dicts are diffed, anything else is replaced."""
+    delta: Dict[str, Any] = {}
+    for key, value in current.items():
+        if key not in previous:
+            delta[key] = value
+        elif isinstance(value, dict) and isinstance(previous[key], dict):
+            nested = make_delta(previous[key], value)
+            if nested:
+                delta[key] = nested
+        elif previous[key] != value:
+            delta[key] = value
+    removed = [key for key in previous if key not in current]
+    if removed:
+        delta[UNSET] = removed
+    return delta
+
+
+def apply_delta(previous: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    result = {key: value for key, value in previous.items() if key not in delta.get(UNSET, ())}
+    for key, value in delta.items():
+        if key == UNSET:
+            continue
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = apply_delta(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+class FrameCodec:
+    """Encodes outgoing messages for one connection in its negotiated subprotocol.
+
+    With a v2 subprotocol, messages queued together are coalesced into one
+    frame holding a list, and DELTA_TYPES messages after the first carry only
+    a `delta` from the previous message of their type.
+    """
+
+    def __init__(self, subprotocol: Optional[str] = None):
+        self.subprotocol = subprotocol
+        self.batched = subprotocol in (MSGPACK_V2, JSON_V2)
+        self.binary = subprotocol == MSGPACK_V2
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"frames": 0, "messages": 0, "bytes": 0, "encode_seconds": 0.0}
+
+    def encode(self, messages: List[Dict[str, Any]]) -> List[Union[str, bytes]]:
+        """Frames to send for `messages`, in order."""
+        start = time.perf_counter()
+        if not self.batched:
+            frames = [json.dumps(message) for message in messages]
+        else:
+            batch = [self._compact(message) for message in messages]
+            if self.binary:
+                frames = [msgpack.packb(batch, default=str)]
+            else:
+                frames = [json.dumps(batch, separators=(",", ":"), default=str)]
+        self._stats["encode_seconds"] += time.perf_counter() - start
+        self._stats["frames"] += len(frames)
+        self._stats["messages"] += len(messages)
+        self._stats["bytes"] += sum(len(frame.encode("utf-8") if isinstance(frame, str) else frame) for frame in frames)
+        return frames
+
+    def _compact(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        message_type = message.get("type")
+        if message_type not in DELTA_TYPES:
+            return message
+        previous = self._last.get(message_type)
+        self._last[message_type] = message
+        if previous is None:
+            return message
+        return {"type": message_type, "delta": make_delta(previous, message)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "encode_seconds": round(self._stats["encode_seconds"], 6),
+                "protocol": self.subprotocol or "json"}
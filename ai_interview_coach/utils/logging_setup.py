@@ -0,0 +1,179 @@
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from config import Config
+
+# Identifiers attached to every record logged from a session's tasks
+_context: ContextVar[Dict[str, str]] = ContextVar("log_context", default={})
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_sampler: Optional["DebugSampler"] = None
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def bind_log_context(**fields: str):
+    """Attach `fields` (e.g. client_id, interview_id) to records logged from this context and tasks it creates."""
+    return _context.set({**_context.get(), **{k: str(v) for k, v in fields.items() if v is not None}})
+
+
+def log_context() -> Dict[str, str]:
+    return dict(_context.get())
+
+
+class ContextFilter(logging.Filter):
+    """Copies the bound context onto the record; runs in the caller's thread, before the queue."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keeps every DEBUG record from a call site up to `burst`, then one in `every`.
+
+    Records at INFO and above always pass. Sampling is per call site, so a
+    chatty loop cannot crowd out a rare debug message elsewhere.
+    """
+
+    def __init__(self, burst: int, every: int):
+        super().__init__()
+        self.burst = burst
+        self.every = max(every, 1)
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+            if count <= self.burst or (count - self.burst) % self.every == 0:
+                return True
+            self.dropped += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the bound context and any `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items()
+                      if key not in _RECORD_FIELDS and not key.startswith("_")})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records unformatted, so the listener's handlers do the formatting.
+
+    The stdlib QueueHandler formats each record in the caller's thread. Here
+    only the message arguments are merged, since they may be mutated after
+    the call returns; exc_info is kept for the listener to format.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def rotating_file_handler(path: Path, max_bytes: int, backups: int) -> logging.Handler:
+    """Size-rotated log file; rotated files are gzipped (interview.log.1.gz, ...)."""
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                   encoding="utf-8", delay=True)
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def configure_logging(level: Optional[str] = None, log_file: Optional[Path] = None,
+                      json_console: Optional[bool] = None):
+    """Route all logging through a queue drained by a listener thread. Safe to call again.
+
+    Callers only pay for the level check, context lookup, merging the message
+    arguments and the enqueue; formatting and file or console I/O happen on
+    the listener thread. The console gets the usual text lines (JSON with
+    `json_console`), `log_file` gets JSON lines.
+    """
+    global _listener, _queue_handler, _sampler
+    shutdown_logging()
+
+    level = logging.getLevelName((level or Config.LOG_LEVEL).upper())
+    console = logging.StreamHandler()
+    console.setFormatter(JsonFormatter() if (Config.LOG_JSON_CONSOLE if json_console is None else json_console)
+                         else logging.Formatter(TEXT_FORMAT))
+    handlers = [console]
+    if log_file:
+        file_handler = rotating_file_handler(Path(log_file), Config.LOG_MAX_BYTES, Config.LOG_BACKUP_COUNT)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_handler = DeferredFormatQueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+    _sampler = DebugSampler(Config.LOG_DEBUG_SAMPLE_BURST, Config.LOG_DEBUG_SAMPLE_EVERY)
+    _queue_handler.addFilter(_sampler)
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def logging_stats() -> Dict:
+    return {"level": logging.getLevelName(logging.getLogger().level),
+            "debug_dropped": _sampler.dropped if _sampler else 0}
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Sequence
+from config import Config
+
+
+class LoopBlockedError(AssertionError):
+    """Raised by `assert_no_blocking` when the event loop was blocked for too long."""
+
+
+class LoopMonitor:
+    """Measures event-loop lag continuously and captures what is blocking the loop.
+
+    A task sleeps for `interval` and records how late it wakes up in a lag
+    histogram. A watchdog thread checks that the task keeps ticking; when it
+    has not for `threshold` seconds, the loop thread's stack is captured while
+    it is still stuck, so the report names the blocking call rather than
+    whatever ran after it.
+    """
+
+    def __init__(self, interval: Optional[float] = None, threshold: Optional[float] = None,
+                 buckets_ms: Optional[Sequence[float]] = None, history: Optional[int] = None):
+        self.interval = interval or Config.LOOP_MONITOR_INTERVAL
+        self.threshold = threshold or Config.LOOP_BLOCK_THRESHOLD
+        self.buckets_ms = tuple(buckets_ms or Config.LOOP_LAG_BUCKETS_MS)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # Last bucket counts lags above the largest bound
+        self.blocks: Deque[Dict[str, Any]] = deque(maxlen=history or Config.LOOP_BLOCK_HISTORY)
+        self.max_lag_ms = 0.0
+        self._total_lag_ms = 0.0
+        self._last_tick = time.monotonic()
+        self._stalled = False  # The current stall has already been captured
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start monitoring the running loop; call from a coroutine on that loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick(), name="loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+
+    async def _tick(self):
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.record(max(now - start - self.interval, 0.0) * 1000)
+            self._last_tick = now
+
+    def record(self, lag_ms: float):
+        index = next((i for i, bound in enumerate(self.buckets_ms) if lag_ms <= bound), len(self.buckets_ms))
+        self.counts[index] += 1
+        self._total_lag_ms += lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if self._stalled:
+            # The loop is running again; the stall lasted as long as this tick was late
+            self.blocks[-1]["lag_ms"] = round(lag_ms, 1)
+            self._stalled = False
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 4):
+            stalled_for = time.monotonic() - self._last_tick - self.interval
+            if stalled_for <= self.threshold or self._stalled:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            self._stalled = True
+            self.blocks.append({"at": time.time(), "lag_ms": round(stalled_for * 1000, 1), "stack": stack})
+            logging.warning("Event loop blocked for over %.0fms at:\n%s", stalled_for * 1000, stack)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the `q` quantile of lag, in ms; None above the largest bucket."""
+        count = sum(self.counts)
+        if not count:
+            return 0.0
+        seen = 0
+        for bound, n in zip(self.buckets_ms, self.counts):
+            seen += n
+            if seen >= q * count:
+                return bound
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        count = sum(self.counts)
+        histogram = {f"<={bound:g}ms": n for bound, n in zip(self.buckets_ms, self.counts)}
+        histogram[f">{self.buckets_ms[-1]:g}ms"] = self.counts[-1]
+        return {
+            "samples": count,
+            "mean_lag_ms": round(self._total_lag_ms / count, 2) if count else 0.0,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "p50_lag_ms": self.percentile(0.5),
+            "p99_lag_ms": self.percentile(0.99),
+            "histogram": histogram,
+            "blocked": len(self.blocks),
+            # Innermost frames are enough to name the culprit on the metrics page
+            "recent_blocks": [{"at": b["at"], "lag_ms": b["lag_ms"], "where": b["stack"].strip().splitlines()[-2:]}
+                              for b in self.blocks]
+        }
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Process-wide monitor of the server's event loop."""
+    global _monitor
+    if _monitor is None:
+        _monitor = LoopMonitor()
+    return _monitor
+
+
+@asynccontextmanager
+async def assert_no_blocking(max_ms: float):
+    """Fail with the blocking stack if the loop is blocked for more than `max_ms` inside the block.
+
+        async with assert_no_blocking(50):
+            await code_under_test()
+    """
+    monitor = LoopMonitor(interval=min(max_ms / 4000, 0.01), threshold=max_ms / 1000)
+    monitor.start()
+    try:
+        yield monitor
+        # One more tick, so a block at the very end is measured
+        await asyncio.sleep(monitor.interval * 2)
+    finally:
+        await monitor.stop()
+    if monitor.max_lag_ms > max_ms:
+        stacks = "\n".join(block["stack"] for block in monitor.blocks) or "(stack not captured)"
+        raise LoopBlockedError(f"Event loop blocked for {monitor.max_lag_ms:.0f}ms (limit {max_ms:g}ms):\n{stacks}")
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from config import Config
+from models.user_profile import UserProfile
+from utils.storage import InterviewStorage
+
+
+class ProfileCache:
+    """In-process LRU cache of validated user profiles in front of InterviewStorage.
+
+    Misses for the same user share one storage read, and a write invalidates the
+    entry so a read already in flight cannot repopulate it with stale data.
+    """
+
+    def __init__(self, storage: InterviewStorage, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        self.storage = storage
+        self.max_size = max_size or Config.PROFILE_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else Config.PROFILE_CACHE_TTL
+        self._entries: "OrderedDict[str, Tuple[UserProfile, float]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    async def get(self, user_id: str) -> Optional[UserProfile]:
+        entry = self._entries.get(user_id)
+        if entry:
+            profile, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self._stats["hits"] += 1
+                return profile.model_copy(deep=True)
+            del self._entries[user_id]
+            self._stats["expirations"] += 1
+
+        self._stats["misses"] += 1
+        pending = self._loading.get(user_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(user_id))
+            self._loading[user_id] = pending
+            pending.add_done_callback(lambda _: self._finish_load(user_id))
+        profile = await asyncio.shield(pending)
+        return profile.model_copy(deep=True) if profile else None
+
+    async def _load(self, user_id: str) -> Optional[UserProfile]:
+        generation = self._generations.get(user_id, 0)
+        profile = await asyncio.to_thread(self.storage.get_user_profile, user_id)
+        if profile is not None and self._generations.get(user_id, 0) == generation:
+            self._put(user_id, profile)
+        return profile
+
+    def _finish_load(self, user_id: str):
+        self._loading.pop(user_id, None)
+        self._generations.pop(user_id, None)
+
+    def _put(self, user_id: str, profile: UserProfile):
+        self._entries[user_id] = (profile, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def save(self, profile: UserProfile):
+        """Write through to storage and drop the cached copy."""
+        self.invalidate(profile.user_id)
+        await asyncio.to_thread(self.storage.save_user_profile, profile)
+        self.invalidate(profile.user_id)
+
+    def invalidate(self, user_id: str):
+        if user_id in self._loading:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        if self._entries.pop(user_id, None) is not None:
+            self._stats["invalidations"] += 1
+
+    def clear(self):
+        for user_id in list(self._entries):
+            self.invalidate(user_id)
+
+    def stats(self) -> Dict:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0
+        }
@@ -0,0 +1,251 @@
+import sqlite3
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+from config import Config
+
+TIMEOUT_RESPONSE = "No response provided within time limit"
+
+# Upper bounds (seconds) of the answer-time histogram buckets; the last bucket is open-ended
+ANSWER_TIME_BUCKETS = [5, 10, 20, 30, 45, 60]
+
+
+def question_hash(question: str) -> str:
+    """Stable identifier for a question, insensitive to case and whitespace."""
+    normalized = re.sub(r"\s+", " ", question.strip().lower())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _welford_update(acc: List[float], value: float) -> List[float]:
+    """Fold one observation into a [count, mean, m2] accumulator."""
+    count, mean, m2 = acc
+    count += 1
+    delta = value - mean
+    mean += delta / count
+    m2 += delta * (value - mean)
+    return [count, mean, m2]
+
+
+def _summarize(acc: List[float]) -> Dict[str, float]:
+    count, mean, m2 = acc
+    return {
+        "count": int(count),
+        "mean": mean,
+        "variance": m2 / (count - 1) if count > 1 else 0.0
+    }
+
+
+def _bucket_index(seconds: float) -> int:
+    for i, upper in enumerate(ANSWER_TIME_BUCKETS):
+        if seconds <= upper:
+            return i
+    return len(ANSWER_TIME_BUCKETS)
+
+
+class QuestionStatsIndex:
+    """Per-question answer statistics, updated incrementally as interviews are saved."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or Config.DB_PATH
+        self._init_db()
+
+    def _init_db(self):
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS question_stats (
+                    bank TEXT,
+                    question_hash TEXT,
+                    phase TEXT,
+                    level TEXT,
+                    question TEXT,
+                    answer_count INTEGER,
+                    timeout_count INTEGER,
+                    metric_stats TEXT,
+                    time_stats TEXT,
+                    time_histogram TEXT,
+                    updated_at TEXT,
+                    PRIMARY KEY(bank, question_hash)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_question_exposure (
+                    user_id TEXT,
+                    question_hash TEXT,
+                    times_asked INTEGER,
+                    last_asked TEXT,
+                    PRIMARY KEY(user_id, question_hash)
+                )
+            """)
+            # Answers already folded in, so saving an interview again does not count them twice
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS question_stats_recorded (
+                    interview_id TEXT,
+                    answer_index INTEGER,
+                    PRIMARY KEY(interview_id, answer_index)
+                )
+            """)
+            conn.commit()
+
+    def record_interview(self, interview_data: Dict):
+        """Fold the answered questions of a saved interview into the index.
+
+        Answers are recorded once per interview_id, so an interview saved again
+        (e.g. on a retry) only adds the answers it did not have before.
+        """
+        bank = interview_data.get("interview_type", "")
+        level = interview_data.get("level", "")
+        questions = interview_data.get("questions", [])
+        if not questions:
+            return
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            new = [entry for i, entry in enumerate(questions)
+                   if self._claim_answer(cursor, interview_data.get("interview_id"), i)]
+            for entry in new:
+                self._record_answer(cursor, bank, level, entry)
+            if interview_data.get("user_id"):
+                self._record_exposure(cursor, interview_data["user_id"], new)
+            conn.commit()
+
+    def _claim_answer(self, cursor: sqlite3.Cursor, interview_id: Optional[str], answer_index: int) -> bool:
+        """True if this answer has not been recorded yet; it is marked as recorded."""
+        if not interview_id:
+            return True
+        cursor.execute("""
+            INSERT OR IGNORE INTO question_stats_recorded (interview_id, answer_index) VALUES (?, ?)
+        """, (interview_id, answer_index))
+        return cursor.rowcount == 1
+
+    def _record_exposure(self, cursor: sqlite3.Cursor, user_id: str, questions: List[Dict]):
+        now = datetime.now().isoformat()
+        cursor.executemany("""
+            INSERT INTO user_question_exposure (user_id, question_hash, times_asked, last_asked)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT(user_id, question_hash)
+            DO UPDATE SET times_asked = times_asked + 1, last_asked = excluded.last_asked
+        """, [(user_id, question_hash(entry["question"]), now) for entry in questions if entry.get("question")])
+
+    def _record_answer(self, cursor: sqlite3.Cursor, bank: str, level: str, entry: Dict):
+        question = entry.get("question")
+        if not question:
+            return
+        phase = entry.get("phase", "")
+        key = question_hash(question)
+
+        cursor.execute("""
+            SELECT answer_count, timeout_count, metric_stats, time_stats, time_histogram
+            FROM question_stats WHERE bank = ? AND question_hash = ?
+        """, (bank, key))
+        row = cursor.fetchone()
+        if row:
+            answer_count, timeout_count = row[0], row[1]
+            metric_stats = json.loads(row[2])
+            time_stats = json.loads(row[3])
+            time_histogram = json.loads(row[4])
+        else:
+            answer_count, timeout_count = 0, 0
+            metric_stats = {}
+            time_stats = [0, 0.0, 0.0]
+            time_histogram = [0] * (len(ANSWER_TIME_BUCKETS) + 1)
+
+        answer_count += 1
+        if TIMEOUT_RESPONSE in str(entry.get("response", "")):
+            timeout_count += 1
+
+        metrics = (entry.get("feedback") or {}).get("metrics", {})
+        for name, value in metrics.items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            metric_stats[name] = _welford_update(metric_stats.get(name, [0, 0.0, 0.0]), value)
+
+        processing_time = entry.get("processing_time")
+        if processing_time is not None:
+            time_stats = _welford_update(time_stats, float(processing_time))
+            time_histogram[_bucket_index(float(processing_time))] += 1
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO question_stats
+            (question_hash, bank, phase, level, question, answer_count, timeout_count,
+             metric_stats, time_stats, time_histogram, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            key,
+            bank,
+            phase,
+            level if phase == "technical" else "",
+            question,
+            answer_count,
+            timeout_count,
+            json.dumps(metric_stats),
+            json.dumps(time_stats),
+            json.dumps(time_histogram),
+            datetime.now().isoformat()
+        ))
+
+    def _row_to_stats(self, row) -> Dict:
+        answer_count, timeout_count = row[5], row[6]
+        metric_stats = json.loads(row[7])
+        return {
+            "question_hash": row[0],
+            "bank": row[1],
+            "phase": row[2],
+            "level": row[3],
+            "question": row[4],
+            "answer_count": answer_count,
+            "timeout_count": timeout_count,
+            "timeout_rate": timeout_count / answer_count if answer_count else 0.0,
+            "metrics": {name: _summarize(acc) for name, acc in metric_stats.items()},
+            "answer_time": {
+                **_summarize(json.loads(row[8])),
+                "buckets": ANSWER_TIME_BUCKETS,
+                "histogram": json.loads(row[9])
+            }
+        }
+
+    def get_question_stats(self, bank: str, question: str) -> Optional[Dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT question_hash, bank, phase, level, question, answer_count, timeout_count,
+                       metric_stats, time_stats, time_histogram
+                FROM question_stats WHERE bank = ? AND question_hash = ?
+            """, (bank, question_hash(question)))
+            row = cursor.fetchone()
+            return self._row_to_stats(row) if row else None
+
+    def get_user_exposure(self, user_id: str) -> Dict[str, int]:
+        """How many times each question (by hash) has been asked to a user."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT question_hash, times_asked FROM user_question_exposure WHERE user_id = ?
+            """, (user_id,))
+            return dict(cursor.fetchall())
+
+    def get_answer_counts(self, bank: str) -> Dict[str, int]:
+        """Answer count per question hash across all users of one bank."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT question_hash, answer_count FROM question_stats WHERE bank = ?
+            """, (bank,))
+            return dict(cursor.fetchall())
+
+    def get_bank_stats(self, bank: str) -> Dict[str, Dict]:
+        """All indexed questions of one bank, keyed by question hash."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT question_hash, bank, phase, level, question, answer_count, timeout_count,
+                       metric_stats, time_stats, time_histogram
+                FROM question_stats WHERE bank = ?
+            """, (bank,))
+            return {row[0]: self._row_to_stats(row) for row in cursor.fetchall()}
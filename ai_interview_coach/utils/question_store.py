@@ -0,0 +1,384 @@
+"""Compiled, indexed question banks loaded lazily per role.
+
+`question_banks/*.json` are the editable sources. `python -m utils.question_store build`
+validates them and writes one compiled file per role plus a small manifest to
+`question_banks/compiled/`; at runtime only the manifest is read up front and a
+role's questions are loaded the first time an interview for that role starts.
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import Config
+
+PHASES = ("intro", "technical", "behavioral")
+LEVELS = ["junior", "mid", "senior"]
+COMPILED_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+ENTRY_FIELDS = {"question", "tags", "reference_answer", "key_points"}
+
+# Used for roles that have no bank file
+BUILTIN_BANKS = {
+    "software_engineer": {
+        "intro": ["Tell me about yourself.", "Why do you want to work in software engineering?"],
+        "technical": {
+            "junior": ["What is a list in Python?", "Explain APIs."],
+            "mid": ["Explain the difference between a list and a tuple in Python.",
+                    "How would you optimize a slow SQL query?"],
+            "senior": ["Design a scalable microservices architecture.", "Explain the CAP theorem."]
+        },
+        "behavioral": ["Describe a time you faced a challenging bug.", "Tell me about a team project."]
+    }
+}
+
+
+class QuestionBankError(ValueError):
+    """A bank file failed validation."""
+
+
+def slot_key(phase: str, level: Optional[str] = None) -> str:
+    return f"{phase}:{level}" if phase == "technical" else phase
+
+
+class RoleBank:
+    """Immutable questions of one role, indexed by phase/level slot and by tag."""
+
+    def __init__(self, role: str, questions: Iterable[Dict[str, Any]], version: str = ""):
+        self.role = role
+        self.version = version
+        records = list(questions)
+        self.texts: Tuple[str, ...] = tuple(r["question"] for r in records)
+        self.tags: Tuple[Tuple[str, ...], ...] = tuple(tuple(r.get("tags", ())) for r in records)
+        slots: Dict[str, List[int]] = {}
+        by_tag: Dict[str, List[int]] = {}
+        for index, record in enumerate(records):
+            slots.setdefault(slot_key(record["phase"], record.get("level")), []).append(index)
+            for tag in record.get("tags", ()):
+                by_tag.setdefault(tag, []).append(index)
+        self.slots = {key: tuple(ids) for key, ids in slots.items()}
+        self.by_tag = {tag: tuple(ids) for tag, ids in by_tag.items()}
+        # Only the few questions that carry reference material pay for it
+        self.references = {
+            r["question"]: {k: r[k] for k in ("reference_answer", "key_points") if k in r}
+            for r in records if "reference_answer" in r or "key_points" in r
+        }
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def ids(self, phase: str, level: Optional[str] = None) -> Tuple[int, ...]:
+        return self.slots.get(slot_key(phase, level), ())
+
+    def questions(self, phase: str, level: Optional[str] = None) -> List[str]:
+        return [self.texts[i] for i in self.ids(phase, level)]
+
+    def tagged(self, tag: str) -> List[str]:
+        return [self.texts[i] for i in self.by_tag.get(tag, ())]
+
+    def reference(self, question: str) -> Optional[Dict[str, Any]]:
+        return self.references.get(question)
+
+    def levels(self) -> List[str]:
+        return [key.split(":", 1)[1] for key in self.slots if key.startswith("technical:")]
+
+
+def _validate_entry(entry: Any, where: str) -> Dict[str, Any]:
+    if isinstance(entry, str):
+        entry = {"question": entry}
+    if not isinstance(entry, dict):
+        raise QuestionBankError(f"{where}: expected a question string or object, got {type(entry).__name__}")
+    unknown = entry.keys() - ENTRY_FIELDS
+    if unknown:
+        raise QuestionBankError(f"{where}: unknown fields {sorted(unknown)}")
+    question = entry.get("question")
+    if not isinstance(question, str) or not question.strip():
+        raise QuestionBankError(f"{where}: question must be a non-empty string")
+    tags = entry.get("tags", [])
+    if not isinstance(tags, list) or not all(isinstance(t, str) and t for t in tags):
+        raise QuestionBankError(f"{where}: tags must be a list of strings")
+    record = {"question": " ".join(question.split())}
+    if tags:
+        record["tags"] = sorted({t.lower() for t in tags})
+    reference_answer = entry.get("reference_answer")
+    if reference_answer is not None:
+        if not isinstance(reference_answer, str) or not reference_answer.strip():
+            raise QuestionBankError(f"{where}: reference_answer must be a non-empty string")
+        record["reference_answer"] = reference_answer.strip()
+    key_points = entry.get("key_points")
+    if key_points is not None:
+        if not isinstance(key_points, list) or not key_points or \
+                not all(isinstance(p, str) and p.strip() for p in key_points):
+            raise QuestionBankError(f"{where}: key_points must be a non-empty list of strings")
+        record["key_points"] = [p.strip() for p in key_points]
+    return record
+
+
+def parse_bank(role: str, data: Any, source: str = "") -> List[Dict[str, Any]]:
+    """Validate one bank document and flatten it into question records."""
+    source = source or role
+    if not isinstance(data, dict):
+        raise QuestionBankError(f"{source}: top level must be an object")
+    unknown = data.keys() - set(PHASES)
+    if unknown:
+        raise QuestionBankError(f"{source}: unknown phases {sorted(unknown)}")
+
+    slots: List[Tuple[str, Optional[str], Any]] = []
+    for phase in ("intro", "behavioral"):
+        slots.append((phase, None, data.get(phase, [])))
+    technical = data.get("technical", {})
+    if not isinstance(technical, dict):
+        raise QuestionBankError(f"{source}: technical must map levels to question lists")
+    for level, entries in technical.items():
+        if level not in LEVELS:
+            raise QuestionBankError(f"{source}: unknown level '{level}' (expected one of {LEVELS})")
+        slots.append(("technical", level, entries))
+
+    records = []
+    for phase, level, entries in slots:
+        where = f"{source}:{slot_key(phase, level)}"
+        if not isinstance(entries, list):
+            raise QuestionBankError(f"{where}: expected a list of questions")
+        seen = set()
+        for position, entry in enumerate(entries):
+            record = _validate_entry(entry, f"{where}[{position}]")
+            if record["question"].lower() in seen:
+                raise QuestionBankError(f"{where}[{position}]: duplicate question '{record['question']}'")
+            seen.add(record["question"].lower())
+            record["phase"] = phase
+            if level:
+                record["level"] = level
+            records.append(record)
+    return records
+
+
+def parse_bank_file(path: Path) -> List[Dict[str, Any]]:
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise QuestionBankError(f"{path.name}: invalid JSON: {e}") from e
+    return parse_bank(path.stem, data, path.name)
+
+
+def _source_version(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _write_json(path: Path, data: Any):
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def compile_banks(source_dir: Optional[Path] = None, compiled_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Validate every bank file and write the compiled per-role files and manifest.
+
+    All sources are validated before anything is written, so a bad file leaves
+    the previous compiled output in place.
+    """
+    source_dir = Path(source_dir or Config.QUESTION_BANKS_DIR)
+    compiled_dir = Path(compiled_dir or Config.QUESTION_BANKS_COMPILED_DIR)
+    compiled = {path.stem: (path, parse_bank_file(path)) for path in sorted(source_dir.glob("*.json"))}
+
+    compiled_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"format": COMPILED_FORMAT, "roles": {}}
+    for role, (path, records) in compiled.items():
+        version = _source_version(path)
+        _write_json(compiled_dir / f"{role}.json", {"role": role, "version": version, "questions": records})
+        manifest["roles"][role] = {
+            "source": path.name,
+            "version": version,
+            "count": len(records)
+        }
+    _write_json(compiled_dir / MANIFEST_NAME, manifest)
+    return manifest
+
+
+class QuestionStore:
+    """Role banks served from the compiled output, loaded on first use.
+
+    Sources that are newer than the manifest (or were never compiled) are parsed
+    directly, so an out-of-date build only costs time, never stale questions.
+    """
+
+    def __init__(self, source_dir: Optional[Path] = None, compiled_dir: Optional[Path] = None):
+        self.source_dir = Path(source_dir or Config.QUESTION_BANKS_DIR)
+        self.compiled_dir = Path(compiled_dir or Config.QUESTION_BANKS_COMPILED_DIR)
+        self._roles: Dict[str, RoleBank] = {}
+        self._rejected: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.compiled_dir / MANIFEST_NAME, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get("format") == COMPILED_FORMAT:
+                return manifest.get("roles", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def roles(self) -> List[str]:
+        sources = {path.stem for path in self.source_dir.glob("*.json")}
+        return sorted(sources | set(self._manifest) | set(BUILTIN_BANKS))
+
+    def get_role(self, role: str) -> Optional[RoleBank]:
+        bank = self._roles.get(role)
+        if bank is None:
+            with self._lock:
+                bank = self._roles.get(role)
+                if bank is None:
+                    bank = self._load_role(role)
+                    if bank is not None:
+                        self._roles[role] = bank
+        return bank
+
+    def _load_role(self, role: str) -> Optional[RoleBank]:
+        source = self.source_dir / f"{role}.json"
+        entry = self._manifest.get(role)
+        if source.exists():
+            version = _source_version(source)
+            if entry and entry.get("version") == version:
+                try:
+                    with open(self.compiled_dir / f"{role}.json", 'r') as f:
+                        compiled = json.load(f)
+                    logging.debug("Loaded compiled question bank: %s", role)
+                    return RoleBank(role, compiled["questions"], version)
+                except (OSError, ValueError, KeyError) as e:
+                    logging.warning(f"Compiled question bank for {role} unreadable, parsing source: {e}")
+            try:
+                bank = RoleBank(role, parse_bank_file(source), version)
+                logging.debug("Parsed question bank source: %s (not compiled or out of date)", role)
+                return bank
+            except QuestionBankError as e:
+                logging.warning(f"Failed to load question bank {source}: {e}")
+        if role in BUILTIN_BANKS:
+            return RoleBank(role, parse_bank(role, BUILTIN_BANKS[role]), "builtin")
+        return None
+
+    def loaded_roles(self) -> List[str]:
+        return list(self._roles)
+
+    def refresh(self) -> Dict[str, Any]:
+        """Re-parse changed sources of loaded roles and swap in new banks.
+
+        Banks are immutable, so a session holding the previous RoleBank keeps a
+        consistent view; only lookups after the swap see the new questions. A
+        source that fails validation leaves the previous bank in service.
+        """
+        result = {"reloaded": [], "removed": [], "failed": {}}
+        for role, bank in list(self._roles.items()):
+            source = self.source_dir / f"{role}.json"
+            if not source.exists():
+                if bank.version != "builtin":
+                    with self._lock:
+                        self._roles.pop(role, None)
+                    result["removed"].append(role)
+                continue
+            version = _source_version(source)
+            if version in (bank.version, self._rejected.get(role)):
+                continue
+            try:
+                new_bank = RoleBank(role, parse_bank_file(source), version)
+            except (OSError, QuestionBankError) as e:
+                # Reported once per file version; the next edit is tried again
+                self._rejected[role] = version
+                result["failed"][role] = str(e)
+                continue
+            self._rejected.pop(role, None)
+            with self._lock:
+                self._roles[role] = new_bank
+            result["reloaded"].append(role)
+        return result
+
+
+class BankWatcher:
+    """Polls the bank sources and hot-swaps changed role banks without a restart."""
+
+    def __init__(self, store: QuestionStore, interval: Optional[float] = None):
+        self.store = store
+        self.interval = interval if interval is not None else Config.QUESTION_BANK_RELOAD_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"checks": 0, "reloads": 0, "failures": 0, "last_reload_ms": 0.0,
+                       "last_reload_at": None, "last_error": None}
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def check(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.to_thread(self.store.refresh)
+        except Exception as e:
+            logging.error(f"Question bank refresh failed: {e}")
+            result = {"reloaded": [], "removed": [], "failed": {"*": str(e)}}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._stats["checks"] += 1
+
+        if result["reloaded"] or result["removed"]:
+            self._stats["reloads"] += len(result["reloaded"]) + len(result["removed"])
+            self._stats["last_reload_ms"] = round(elapsed_ms, 2)
+            self._stats["last_reload_at"] = time.time()
+            logging.info(f"Reloaded question banks {result['reloaded']}, removed {result['removed']} "
+                         f"in {elapsed_ms:.1f}ms")
+        for role, error in result["failed"].items():
+            self._stats["failures"] += 1
+            self._stats["last_error"] = error
+            logging.warning(f"Keeping previous question bank for {role}: {error}")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "loaded_roles": self.store.loaded_roles()}
+
+
+_store: Optional[QuestionStore] = None
+
+
+def get_question_store() -> QuestionStore:
+    """Process-wide question store shared by every session."""
+    global _store
+    if _store is None:
+        _store = QuestionStore()
+    return _store
+
+
+def main(argv: List[str]) -> int:
+    if argv[:1] != ["build"]:
+        print("usage: python -m utils.question_store build [SOURCE_DIR [COMPILED_DIR]]")
+        return 2
+    paths = [Path(p) for p in argv[1:3]]
+    try:
+        manifest = compile_banks(*paths)
+    except QuestionBankError as e:
+        print(f"Question bank validation failed: {e}")
+        return 1
+    for role, entry in manifest["roles"].items():
+        print(f"{role}: {entry['count']} questions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
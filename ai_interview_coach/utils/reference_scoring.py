@@ -0,0 +1,72 @@
+import zlib
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from config import Config
+from utils.retrieval import tokenize
+
+HASH_DIM = 1 << 14
+
+
+def _hashed_counts(texts: Sequence[str], dim: int = HASH_DIM) -> np.ndarray:
+    """Rows of L2-normalized hashed term counts, one per text."""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            matrix[row, zlib.crc32(token.encode("utf-8")) % dim] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _content_words(text: str) -> set:
+    return {token for token in tokenize(text) if " " not in token}
+
+
+class ReferenceScorer:
+    """Provisional technical_accuracy from key-point coverage and similarity to a reference answer.
+
+    Cheap enough to run before the LLM grading call, so the candidate sees an
+    estimate immediately; `confidence` says how far the estimate can be trusted.
+    """
+
+    def __init__(self, point_match: Optional[float] = None, similarity_ceiling: Optional[float] = None):
+        self.point_match = point_match or Config.KEY_POINT_MATCH
+        self.similarity_ceiling = similarity_ceiling or Config.REFERENCE_SIMILARITY_CEILING
+
+    def score(self, response: str, reference: Dict[str, Any]) -> Dict[str, Any]:
+        return self.score_batch([response], [reference])[0]
+
+    def score_batch(self, responses: Sequence[str], references: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        reference_texts = [r.get("reference_answer") or " ".join(r.get("key_points", [])) for r in references]
+        similarities = np.einsum("ij,ij->i", _hashed_counts(responses), _hashed_counts(reference_texts))
+
+        results = []
+        for response, reference, similarity in zip(responses, references, similarities):
+            words = _content_words(response)
+            matched, missed = [], []
+            for point in reference.get("key_points", []):
+                point_words = _content_words(point)
+                hit = len(point_words & words) / len(point_words) if point_words else 0.0
+                (matched if hit >= self.point_match else missed).append(point)
+
+            scaled_similarity = min(1.0, float(similarity) / self.similarity_ceiling)
+            n_points = len(matched) + len(missed)
+            if n_points:
+                coverage = len(matched) / n_points
+                estimate = 0.7 * coverage + 0.3 * scaled_similarity
+                agreement = 1.0 - abs(coverage - scaled_similarity)
+            else:
+                coverage = None
+                estimate = scaled_similarity
+                agreement = 0.5
+            # Trust grows with the number of key points checked and the length of the answer
+            confidence = min(1.0, n_points / 4) * min(1.0, len(response.split()) / 30) * agreement
+
+            results.append({
+                "technical_accuracy": round(10.0 * estimate, 1),
+                "coverage": coverage,
+                "similarity": round(float(similarity), 3),
+                "confidence": round(confidence, 2),
+                "matched_points": matched,
+                "missed_points": missed
+            })
+        return results
@@ -0,0 +1,119 @@
+import hashlib
+import hmac
+import os
+import secrets
+from collections import OrderedDict
+from pathlib import Path
+from statistics import mean
+from typing import Any, Dict, List, Optional
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from config import Config
+from utils.assets import Asset
+
+# Per-answer metrics shown on the report, from the content and vocal feedback
+REPORT_METRICS = {
+    "clarity": "Clarity",
+    "technical_accuracy": "Technical Accuracy",
+    "communication": "Communication",
+    "confidence": "Confidence",
+    "pace": "Pace"
+}
+
+
+def report_context(interview: Dict[str, Any]) -> Dict[str, Any]:
+    """Template variables for feedback.html from a saved interview."""
+    summary = interview.get("summary") or {}
+    scores: Dict[str, List[float]] = {key: [] for key in REPORT_METRICS}
+    for question in interview.get("questions", []):
+        feedback = question.get("feedback") or {}
+        values = {**(feedback.get("vocal_feedback") or {}).get("vocal_metrics", {}), **feedback.get("metrics", {})}
+        for key in REPORT_METRICS:
+            if isinstance(values.get(key), (int, float)):
+                scores[key].append(float(values[key]))
+    return {
+        "score": round(float(summary.get("score", 0))),
+        "overview": summary.get("overview", ""),
+        "metrics": [{"name": name, "score": round(mean(scores[key]), 1)}
+                    for key, name in REPORT_METRICS.items() if scores[key]],
+        "strengths": summary.get("strengths", []),
+        "improvements": summary.get("improvements") or summary.get("recommendations", []),
+        "resources": summary.get("resources", [])
+    }
+
+
+def load_report_secret(path: Optional[Path] = None) -> bytes:
+    """REPORT_SECRET, or else a random key created once in REPORT_SECRET_PATH and shared by every worker."""
+    if Config.REPORT_SECRET:
+        return Config.REPORT_SECRET.encode("utf-8")
+    path = Path(path or Config.REPORT_SECRET_PATH)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp, path)  # Atomic, and fails if another worker got there first
+        except FileExistsError:
+            pass
+        finally:
+            tmp.unlink()
+    return path.read_text().strip().encode("utf-8")
+
+
+class ReportRenderer:
+    """Renders interview reports from feedback.html, compiled once per process.
+
+    A finished interview never changes, so its rendered report is kept (LRU) as
+    an Asset with an ETag and gzip variant, like the static files. Reports hold
+    a candidate's answers and feedback, so their URLs carry a token signed with
+    the report secret; an interview id alone does not open one.
+    """
+
+    def __init__(self, template_dir: Optional[Path] = None, max_size: Optional[int] = None,
+                 secret: Optional[bytes] = None):
+        environment = Environment(loader=FileSystemLoader(str(template_dir or Config.TEMPLATES_DIR)),
+                                  autoescape=select_autoescape(["html"]), auto_reload=False)
+        self.template = environment.get_template("feedback.html")
+        self.max_size = max_size or Config.REPORT_CACHE_SIZE
+        self._reports: "OrderedDict[str, Asset]" = OrderedDict()
+        self._stats = {"hits": 0, "renders": 0, "rejected": 0}
+        self.secret = secret or load_report_secret()
+
+    def token(self, interview_id: str) -> str:
+        return hmac.new(self.secret, interview_id.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    def url(self, interview_id: str) -> str:
+        return f"/report/{interview_id}?token={self.token(interview_id)}"
+
+    def verify(self, interview_id: str, token: str) -> bool:
+        if token and hmac.compare_digest(self.token(interview_id), token):
+            return True
+        self._stats["rejected"] += 1
+        return False
+
+    def render(self, interview: Dict[str, Any]) -> str:
+        return self.template.render(**report_context(interview))
+
+    def cached(self, interview_id: str) -> Optional[Asset]:
+        asset = self._reports.get(interview_id)
+        if asset is not None:
+            self._reports.move_to_end(interview_id)
+            self._stats["hits"] += 1
+        return asset
+
+    def report(self, interview: Dict[str, Any]) -> Asset:
+        """The rendered report for a finished interview, from the cache when possible."""
+        interview_id = interview["interview_id"]
+        asset = self.cached(interview_id)
+        if asset is not None:
+            return asset
+        asset = Asset.build(f"{interview_id}.html", self.render(interview).encode("utf-8"), "text/html; charset=utf-8")
+        self._stats["renders"] += 1
+        self._reports[interview_id] = asset
+        while len(self._reports) > self.max_size:
+            self._reports.popitem(last=False)
+        return asset
+
+    def stats(self) -> Dict:
+        return {**self._stats, "cached": len(self._reports)}
@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Optional, TypeVar
+from utils.tracing import span
+
+T = TypeVar("T")
+
+
+@dataclass
+class SessionResources:
+    """Work one websocket session has in flight, for capacity accounting."""
+    pending_llm_calls: int = 0
+    llm_calls: int = 0
+
+
+# Bound by the session runner; tasks it starts inherit the binding
+_current: ContextVar[Optional[SessionResources]] = ContextVar("session_resources", default=None)
+
+
+def bind_session_resources(resources: SessionResources):
+    """Attribute LLM calls made from the current context (and tasks it creates) to `resources`."""
+    return _current.set(resources)
+
+
+async def tracked_llm_call(call: Awaitable[T], name: str = "llm.call", **attributes) -> T:
+    """Await an LLM call as a span named `name`, counting it against the current session while it is pending."""
+    with span(name, **attributes):
+        resources = _current.get()
+        if resources is None:
+            return await call
+        resources.pending_llm_calls += 1
+        resources.llm_calls += 1
+        try:
+            return await call
+        finally:
+            resources.pending_llm_calls -= 1
@@ -0,0 +1,125 @@
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from config import Config
+from utils.question_store import RoleBank
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+# Bigrams never span these, so "Python, SQL" does not produce "python sql"
+SEGMENT_PATTERN = re.compile(r"[,;:!?()\[\]/\n]|\.(?:\s|$)")
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i in is it its of on or that the this to was "
+    "what when where which who why will with would you your describe explain tell me about".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Unigrams plus adjacent bigrams, keeping tech tokens like c++, c# and node.js intact."""
+    tokens = []
+    for segment in SEGMENT_PATTERN.split(text.lower()):
+        words = [w for w in TOKEN_PATTERN.findall(segment) if w not in STOPWORDS]
+        tokens.extend(words)
+        tokens.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return tokens
+
+
+class RetrievalIndex:
+    """TF-IDF inverted index over a set of questions, queried by cosine similarity.
+
+    Postings are NumPy arrays per term, so scoring a query only touches the
+    questions that share a term with it.
+    """
+
+    def __init__(self, texts: Sequence[str], labels: Optional[Sequence[str]] = None):
+        self.texts = list(texts)
+        self.labels = np.array(labels if labels is not None else [""] * len(self.texts))
+        postings: Dict[str, Tuple[List[int], List[float]]] = {}
+        for doc_id, text in enumerate(self.texts):
+            counts: Dict[str, int] = {}
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                ids, tfs = postings.setdefault(token, ([], []))
+                ids.append(doc_id)
+                tfs.append(1.0 + math.log(count))
+
+        n_docs = max(1, len(self.texts))
+        self.idf = {token: math.log((1 + n_docs) / (1 + len(ids))) + 1.0 for token, (ids, _) in postings.items()}
+        norms = np.zeros(len(self.texts), dtype=np.float64)
+        for token, (ids, tfs) in postings.items():
+            weights = np.asarray(tfs) * self.idf[token]
+            np.add.at(norms, np.asarray(ids), weights * weights)
+        norms = np.sqrt(np.maximum(norms, 1e-12))
+        self.postings = {
+            token: (np.asarray(ids, dtype=np.int32),
+                    (np.asarray(tfs) * self.idf[token] / norms[ids]).astype(np.float32))
+            for token, (ids, tfs) in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def scores(self, query: str) -> np.ndarray:
+        counts: Dict[str, int] = {}
+        for token in tokenize(query):
+            if token in self.postings:
+                counts[token] = counts.get(token, 0) + 1
+        scores = np.zeros(len(self.texts), dtype=np.float32)
+        if not counts:
+            return scores
+        weights = {token: (1.0 + math.log(count)) * self.idf[token] for token, count in counts.items()}
+        query_norm = math.sqrt(sum(w * w for w in weights.values()))
+        for token, weight in weights.items():
+            ids, doc_weights = self.postings[token]
+            scores[ids] += doc_weights * (weight / query_norm)
+        return scores
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0,
+               label: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Top `k` questions scoring at least `min_score`, best first."""
+        scores = self.scores(query)
+        if label is not None:
+            scores[self.labels != label] = 0.0
+        candidates = np.flatnonzero(scores >= max(min_score, 1e-6))
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.texts[i], float(scores[i])) for i in ranked]
+
+
+def resume_query(resume_data: Dict) -> str:
+    terms: Iterable[str] = (term for key in ("skills", "tools", "technologies") for term in resume_data.get(key, []))
+    return ", ".join(str(term) for term in terms)
+
+
+_indexes: Dict[str, Tuple[str, RetrievalIndex]] = {}
+_lock = threading.Lock()
+
+
+def get_technical_index(bank: RoleBank) -> RetrievalIndex:
+    """Index of a role's technical questions labelled by level, rebuilt when the bank changes."""
+    with _lock:
+        cached = _indexes.get(bank.role)
+        if cached and cached[0] == bank.version:
+            return cached[1]
+    ids = [i for level in bank.levels() for i in bank.ids("technical", level)]
+    levels = [level for level in bank.levels() for _ in bank.ids("technical", level)]
+    index = RetrievalIndex([bank.texts[i] for i in ids], levels)
+    with _lock:
+        _indexes[bank.role] = (bank.version, index)
+    return index
+
+
+def relevant_questions(bank: Optional[RoleBank], resume_data: Dict, level: str,
+                       k: Optional[int] = None, min_score: Optional[float] = None) -> List[str]:
+    """Bank questions at `level` most similar to the resume's skills, tools and technologies."""
+    if bank is None:
+        return []
+    k = k or Config.TAILORED_QUESTION_COUNT
+    min_score = Config.RETRIEVAL_MIN_SCORE if min_score is None else min_score
+    query = resume_query(resume_data)
+    if not query:
+        return []
+    return [text for text, _ in get_technical_index(bank).search(query, k, min_score, label=level)]
@@ -0,0 +1,117 @@
+import random
+from typing import Callable, Collection, Dict, List, Optional, Sequence, Tuple
+from config import Config
+from utils.question_store import RoleBank, slot_key
+from utils.question_stats import QuestionStatsIndex, question_hash
+
+
+class AliasTable:
+    """Vose alias table: O(n) to build, O(1) per weighted draw."""
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("Cannot build an alias table from no weights")
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights] if total > 0 else [1.0] * n
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = g
+            scaled[g] = scaled[g] + scaled[s] - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, rng: random.Random) -> int:
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+def exposure_weight(times_seen: int, alpha: Optional[float] = None) -> float:
+    alpha = Config.QUESTION_EXPOSURE_ALPHA if alpha is None else alpha
+    return 1.0 / (1.0 + times_seen) ** alpha
+
+
+class QuestionSampler:
+    """Draws bank questions without repeats in a session, favouring ones a user has seen least.
+
+    Each phase/level slot gets an alias table weighted by how often its questions
+    have been answered overall; tables are rebuilt only when the role's bank
+    version changes. Session exclusion and per-user exposure are applied by
+    rejection against that table, so a draw stays O(1) on average.
+    """
+
+    def __init__(self, answer_counts: Optional[Callable[[str], Dict[str, int]]] = None,
+                 rng: Optional[random.Random] = None, max_rejections: Optional[int] = None):
+        self.answer_counts = answer_counts
+        self.rng = rng or random.Random()
+        self.max_rejections = max_rejections or Config.SAMPLER_MAX_REJECTIONS
+        self._tables: Dict[Tuple[str, str], Tuple[str, Tuple[int, ...], Tuple[str, ...], List[float], AliasTable]] = {}
+        self._stats = {"draws": 0, "rejections": 0, "fallbacks": 0, "exhausted": 0, "tables_built": 0}
+
+    def _table(self, bank: RoleBank, phase: str, level: Optional[str]):
+        key = (bank.role, slot_key(phase, level))
+        cached = self._tables.get(key)
+        if cached and cached[0] == bank.version:
+            return cached
+        ids = bank.ids(phase, level)
+        if not ids:
+            return None
+        hashes = tuple(question_hash(bank.texts[i]) for i in ids)
+        counts = self.answer_counts(bank.role) if self.answer_counts else {}
+        weights = [exposure_weight(counts.get(h, 0)) for h in hashes]
+        cached = (bank.version, ids, hashes, weights, AliasTable(weights))
+        self._tables[key] = cached
+        self._stats["tables_built"] += 1
+        return cached
+
+    def draw(self, bank: Optional[RoleBank], phase: str, level: Optional[str] = None,
+             asked: Collection[str] = (), user_exposure: Optional[Dict[str, int]] = None) -> Optional[str]:
+        """One question for the slot; `asked` and `user_exposure` are keyed by question hash."""
+        if bank is None:
+            return None
+        cached = self._table(bank, phase, level)
+        if cached is None:
+            return None
+        _, ids, hashes, base_weights, table = cached
+        user_exposure = user_exposure or {}
+        self._stats["draws"] += 1
+
+        for _ in range(self.max_rejections):
+            j = table.draw(self.rng)
+            # Proposal already carries the global weight; accept with the user's relative weight
+            if hashes[j] not in asked and self.rng.random() < exposure_weight(user_exposure.get(hashes[j], 0)):
+                return bank.texts[ids[j]]
+            self._stats["rejections"] += 1
+
+        # Mostly exhausted slot: weighted choice over what is left
+        self._stats["fallbacks"] += 1
+        remaining = [j for j, h in enumerate(hashes) if h not in asked]
+        if not remaining:
+            # Every question in the slot was already asked this session
+            self._stats["exhausted"] += 1
+            return bank.texts[ids[table.draw(self.rng)]]
+        weights = [base_weights[j] * exposure_weight(user_exposure.get(hashes[j], 0)) for j in remaining]
+        return bank.texts[ids[self.rng.choices(remaining, weights=weights)[0]]]
+
+    def stats(self) -> Dict:
+        return {**self._stats, "tables": len(self._tables)}
+
+
+_sampler: Optional[QuestionSampler] = None
+
+
+def get_question_sampler() -> QuestionSampler:
+    """Process-wide sampler, so alias tables are shared by every session."""
+    global _sampler
+    if _sampler is None:
+        _sampler = QuestionSampler(QuestionStatsIndex().get_answer_counts)
+    return _sampler
@@ -0,0 +1,349 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, Set
+from starlette.websockets import WebSocket, WebSocketState
+from config import Config
+from utils.framing import FrameCodec
+from utils.resources import SessionResources, bind_session_resources
+from utils.session_registry import WORKER_ID, SessionRegistry
+from utils.tracing import Span, span
+
+_CLOSE = object()
+
+
+class SessionRunner:
+    """Runs one websocket session as reader, writer and heartbeat tasks.
+
+    The reader dispatches incoming messages while work started with `spawn()`
+    (e.g. the interview) runs beside it. Outgoing messages go through a bounded
+    queue drained by the writer, so a slow client blocks producers instead of
+    growing memory; whatever is queued when the writer wakes is encoded together,
+    so the messages of one interview step share a frame when the codec batches.
+    When the socket closes, a task fails, the client stops
+    answering pings or `abort()` is called, every task is cancelled, along with
+    any LLM or TTS call it is awaiting.
+    """
+
+    def __init__(self, websocket: WebSocket,
+                 on_message: Callable[[Dict[str, Any]], Awaitable[None]],
+                 on_audio: Optional[Callable[[bytes], None]] = None,
+                 queue_size: Optional[int] = None, heartbeat_interval: Optional[float] = None,
+                 heartbeat_timeout: Optional[float] = None, codec: Optional[FrameCodec] = None):
+        self.websocket = websocket
+        self.codec = codec or FrameCodec()
+        self.on_message = on_message
+        self.on_audio = on_audio
+        self.heartbeat_interval = heartbeat_interval or Config.WS_HEARTBEAT_INTERVAL
+        self.heartbeat_timeout = heartbeat_timeout or Config.WS_HEARTBEAT_TIMEOUT
+        self.outbound: asyncio.Queue = asyncio.Queue(maxsize=queue_size or Config.WS_OUTBOUND_QUEUE_SIZE)
+        self.closed = asyncio.Event()
+        self.resources = SessionResources()
+        self.last_seen = time.monotonic()  # Last frame of any kind from the client, pongs included
+        self.last_activity = time.monotonic()  # Last message or audio from the client
+        self.close_code = 1000
+        self.trace_parent: Optional[Span] = None  # Span that websocket sends are recorded under, e.g. the interview
+        self._aborted = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"received": 0, "sent": 0, "dropped": 0, "pings": 0}
+
+    async def send(self, type: str, data: Optional[Dict[str, Any]] = None, droppable: bool = False) -> bool:
+        """Queue a message for the client, waiting while the queue is full.
+
+        Droppable messages (partial transcripts, pings) are discarded instead of
+        waiting. Returns False if the message was not queued.
+        """
+        if self.closed.is_set():
+            return False
+        message = {"type": type, **(data or {})}
+        if droppable:
+            try:
+                self.outbound.put_nowait(message)
+            except asyncio.QueueFull:
+                self._stats["dropped"] += 1
+                return False
+            return True
+        await self.outbound.put(message)
+        return True
+
+    async def close(self, code: int = 1000):
+        """Close the socket once the messages already queued have been sent."""
+        if not self.closed.is_set():
+            await self.outbound.put((_CLOSE, code))
+
+    def abort(self, code: int = 1000):
+        """End the session now, dropping queued messages."""
+        self.close_code = code
+        self._aborted.set()
+
+    def spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Run `coro` for the lifetime of the session; it is cancelled when the session ends."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def stats(self) -> Dict:
+        return {**self._stats, "queued": self.outbound.qsize(), "tasks": len(self._tasks),
+                "pending_llm_calls": self.resources.pending_llm_calls, "llm_calls": self.resources.llm_calls,
+                "framing": self.codec.stats()}
+
+    async def run(self):
+        """Serve the session until the socket closes, then cancel everything it started."""
+        self.last_seen = self.last_activity = time.monotonic()
+        # Tasks copy the context when created, so everything below counts its LLM calls against this session
+        bind_session_resources(self.resources)
+        loops = {
+            asyncio.create_task(self._read(), name="session-reader"),
+            asyncio.create_task(self._write(), name="session-writer"),
+            asyncio.create_task(self._heartbeat(), name="session-heartbeat"),
+            asyncio.create_task(self._aborted.wait(), name="session-abort")
+        }
+        try:
+            await asyncio.wait(loops, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.closed.set()
+            tasks = loops | self._tasks
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self.websocket.application_state != WebSocketState.DISCONNECTED:
+                try:
+                    await self.websocket.close(code=self.close_code)
+                except Exception as e:
+                    logging.debug(f"Error closing WebSocket: {e}")
+
+    async def _read(self):
+        while True:
+            try:
+                frame = await self.websocket.receive()
+            except Exception as e:
+                logging.info(f"WebSocket receive ended: {e}")
+                return
+            self.last_seen = time.monotonic()
+            if frame["type"] == "websocket.disconnect":
+                logging.info(f"WebSocket disconnected with code {frame.get('code', 1000)}")
+                return
+            self._stats["received"] += 1
+            try:
+                if frame.get("bytes") is not None:
+                    self.last_activity = self.last_seen
+                    if self.on_audio:
+                        self.on_audio(frame["bytes"])
+                    continue
+                message = json.loads(frame["text"])
+                if message.get("type") == "pong":
+                    continue
+                self.last_activity = self.last_seen
+                await self.on_message(message)
+            except Exception as e:
+                logging.error(f"WebSocket error: {e}")
+                await self.send("error", {"message": str(e)}, droppable=True)
+                await self.close(code=1011)
+                return
+
+    def _next_batch(self, first) -> tuple:
+        """`first` plus every message already queued behind it, and the close code if a close was queued."""
+        batch, item = [], first
+        while True:
+            if isinstance(item, tuple) and item[0] is _CLOSE:
+                return batch, item[1]
+            batch.append(item)
+            if self.outbound.empty() or len(batch) >= Config.WS_MAX_BATCH:
+                return batch, None
+            item = self.outbound.get_nowait()
+
+    async def _write(self):
+        while True:
+            batch, close_code = self._next_batch(await self.outbound.get())
+            try:
+                if batch:
+                    if self.websocket.application_state != WebSocketState.CONNECTED:
+                        return
+                    with span("ws.send", parent=self.trace_parent, messages=len(batch)) as send_span:
+                        for frame in self.codec.encode(batch):
+                            if isinstance(frame, bytes):
+                                await self.websocket.send_bytes(frame)
+                            else:
+                                await self.websocket.send_text(frame)
+                        send_span.set_attribute("types", sorted({message.get("type") for message in batch}))
+                    self._stats["sent"] += len(batch)
+                if close_code is not None:
+                    await self.websocket.close(code=close_code)
+                    return
+            except Exception as e:
+                logging.error(f"WebSocket send error: {e}")
+                return
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            silent_for = time.monotonic() - self.last_seen
+            if silent_for > self.heartbeat_timeout:
+                logging.info(f"No frames from client for {silent_for:.0f}s, closing session")
+                return
+            if await self.send("ping", droppable=True):
+                self._stats["pings"] += 1
+
+
+@dataclass
+class Session:
+    client_id: str
+    started_at: float = field(default_factory=time.monotonic)
+    runner: Optional[SessionRunner] = None
+    coach: Any = None  # InterviewCoachAgent; anything with `state` and `checkpoint()`
+
+    def idle_for(self) -> float:
+        last_activity = self.runner.last_activity if self.runner else self.started_at
+        return time.monotonic() - last_activity
+
+    def stats(self) -> Dict[str, Any]:
+        state = getattr(self.coach, "state", None)
+        return {
+            "client_id": self.client_id,
+            "age": round(time.monotonic() - self.started_at, 1),
+            "idle": round(self.idle_for(), 1),
+            # Serialized size of the interview state, the part of a session that grows with every answer
+            "approx_state_bytes": len(state.model_dump_json()) if state is not None else 0,
+            **(self.runner.stats() if self.runner else {})
+        }
+
+
+class SessionManager:
+    """Admits websocket sessions up to a per-worker limit and releases abandoned ones.
+
+    A session idle for `idle_timeout` seconds (no message or audio from the
+    client; heartbeat pongs do not count) is checkpointed and closed, freeing
+    its slot for a waiting client. With a shared `registry`, sessions another
+    worker has taken over are released too, and this worker's load is published.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, idle_timeout: Optional[float] = None,
+                 reap_interval: Optional[float] = None, registry: Optional[SessionRegistry] = None,
+                 worker_id: str = WORKER_ID):
+        self.max_sessions = max_sessions or Config.MAX_SESSIONS
+        self.idle_timeout = idle_timeout or Config.SESSION_IDLE_TIMEOUT
+        self.reap_interval = reap_interval or Config.SESSION_REAP_INTERVAL
+        self.registry = registry
+        self.worker_id = worker_id
+        self.sessions: Dict[str, Session] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"admitted": 0, "rejected": 0, "reaped": 0, "replaced": 0, "moved": 0}
+
+    async def reserve(self, client_id: str) -> Optional[Session]:
+        """Claim a slot for `client_id`, or None if the worker is full.
+
+        A client that reconnects replaces its previous session.
+        """
+        previous = self.sessions.get(client_id)
+        if previous is not None:
+            self._stats["replaced"] += 1
+        elif len(self.sessions) >= self.max_sessions:
+            self._stats["rejected"] += 1
+            return None
+        session = Session(client_id)
+        self.sessions[client_id] = session
+        self._stats["admitted"] += 1
+        if previous is not None:
+            await self._release(previous, "replaced by a new connection")
+        return session
+
+    def release(self, session: Session):
+        """Forget a finished session; a newer session for the same client is kept."""
+        if self.sessions.get(session.client_id) is session:
+            del self.sessions[session.client_id]
+
+    async def claim(self, session: Session) -> Optional[str]:
+        """Register this worker as the owner of `session` in the shared registry; returns the previous owner."""
+        if self.registry is None:
+            return None
+        return await asyncio.to_thread(self.registry.claim, session.client_id, self.worker_id)
+
+    async def finish(self, session: Session):
+        """Forget a session whose connection ended, giving up registry ownership unless a newer one holds it.
+
+        A client reconnecting to this worker replaces its session before the old
+        connection finishes; the registry row, owned by the same worker id, then
+        belongs to the new connection and must not be released.
+        """
+        current = self.sessions.get(session.client_id)
+        self.release(session)
+        if self.registry is not None and current in (None, session):
+            await asyncio.to_thread(self.registry.release, session.client_id, self.worker_id)
+
+    def retry_after(self) -> int:
+        """Seconds until the next slot is expected to free up through the idle timeout."""
+        if not self.sessions:
+            return 1
+        soonest = min(self.idle_timeout - session.idle_for() for session in self.sessions.values())
+        return int(min(max(soonest, 1), Config.SESSION_RETRY_AFTER_MAX))
+
+    async def _release(self, session: Session, reason: str):
+        logging.info(f"Releasing session for client {session.client_id}: {reason}")
+        # The slot is freed first; the checkpoint writes to disk, so it runs in a thread
+        if session.runner is not None:
+            session.runner.abort(code=1001)
+        self.release(session)
+        if session.coach is not None:
+            try:
+                await asyncio.to_thread(session.coach.checkpoint)
+            except Exception as e:
+                logging.error(f"Error checkpointing session for client {session.client_id}: {e}")
+
+    async def reap(self) -> int:
+        """Checkpoint and close sessions idle for longer than the timeout; returns how many."""
+        idle = [s for s in self.sessions.values() if s.idle_for() > self.idle_timeout]
+        for session in idle:
+            await self._release(session, f"idle for {session.idle_for():.0f}s")
+        self._stats["reaped"] += len(idle)
+        return len(idle)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sync_registry(self) -> int:
+        """Release sessions another worker has resumed and publish this worker's load; returns how many moved."""
+        if self.registry is None:
+            return 0
+        owners = await asyncio.to_thread(self.registry.owners, list(self.sessions))
+        moved = [session for client_id, session in list(self.sessions.items())
+                 if owners.get(client_id) not in (None, self.worker_id)]
+        for session in moved:
+            await self._release(session, f"resumed on worker {owners[session.client_id]}")
+        self._stats["moved"] += len(moved)
+        await asyncio.to_thread(self.registry.report_load, self.worker_id, self.load())
+        await asyncio.to_thread(self.registry.prune)
+        return len(moved)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap()
+            try:
+                await self.sync_registry()
+            except Exception as e:
+                logging.error(f"Session registry sync failed: {e}")
+
+    def load(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "pending_llm_calls": sum(s.runner.resources.pending_llm_calls for s in self.sessions.values() if s.runner)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "worker_id": self.worker_id, "active": len(self.sessions),
+                "max_sessions": self.max_sessions,
+                "sessions": [session.stats() for session in self.sessions.values()]}
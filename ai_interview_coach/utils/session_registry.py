@@ -0,0 +1,263 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from config import Config
+
+# Identifies this process among the workers sharing a registry
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SessionRegistry(ABC):
+    """Which worker owns each client's session, the latest snapshot of its interview, and worker load.
+
+    Every worker shares one registry, so a client that reconnects to a different
+    worker can be resumed there from the last snapshot. Only the current owner
+    may write a session's snapshot, so a worker that lost a session cannot
+    overwrite the new owner's progress.
+    """
+
+    @abstractmethod
+    def claim(self, client_id: str, worker_id: str) -> Optional[str]:
+        """Make `worker_id` the owner of `client_id`'s session; returns the previous owner."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, client_id: str, worker_id: str):
+        """Give up ownership, keeping the snapshot for a later resume."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def owners(self, client_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_snapshot(self, client_id: str, worker_id: str, snapshot: Dict[str, Any]) -> bool:
+        """Store `snapshot` if `worker_id` still owns the session; False otherwise."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_snapshot(self, client_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def discard(self, client_id: str):
+        """Forget a session, e.g. once its interview has finished."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def report_load(self, worker_id: str, load: Dict[str, Any]):
+        raise NotImplementedError
+
+    @abstractmethod
+    def worker_loads(self, max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Load last reported by each worker heard from within `max_age` seconds."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def prune(self, max_age: Optional[float] = None) -> int:
+        """Drop unowned sessions and silent workers older than `max_age` seconds; returns sessions dropped."""
+        raise NotImplementedError
+
+
+class SQLiteSessionRegistry(SessionRegistry):
+    """Registry in a SQLite file, shared by the workers of one host."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or Config.SESSION_REGISTRY_PATH
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_db(self):
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            # WAL lets workers read while another one writes
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    client_id TEXT PRIMARY KEY,
+                    worker_id TEXT,
+                    snapshot TEXT,
+                    claimed_at REAL,
+                    updated_at REAL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS workers (
+                    worker_id TEXT PRIMARY KEY,
+                    load TEXT,
+                    updated_at REAL
+                )
+            """)
+            conn.commit()
+
+    def claim(self, client_id: str, worker_id: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT worker_id FROM sessions WHERE client_id = ?", (client_id,))
+            row = cursor.fetchone()
+            cursor.execute("""
+                INSERT INTO sessions (client_id, worker_id, claimed_at, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(client_id) DO UPDATE SET worker_id = excluded.worker_id, claimed_at = excluded.claimed_at
+            """, (client_id, worker_id, now, now))
+            conn.commit()
+        return row[0] if row else None
+
+    def release(self, client_id: str, worker_id: str):
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE sessions SET worker_id = NULL, updated_at = ?
+                WHERE client_id = ? AND worker_id = ?
+            """, (time.time(), client_id, worker_id))
+            conn.commit()
+
+    def owners(self, client_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        client_ids = list(client_ids)
+        if not client_ids:
+            return {}
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT client_id, worker_id FROM sessions
+                WHERE client_id IN ({", ".join("?" * len(client_ids))})
+            """, client_ids)
+            found = dict(cursor.fetchall())
+        return {client_id: found.get(client_id) for client_id in client_ids}
+
+    def save_snapshot(self, client_id: str, worker_id: str, snapshot: Dict[str, Any]) -> bool:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE sessions SET snapshot = ?, updated_at = ?
+                WHERE client_id = ? AND worker_id = ?
+            """, (json.dumps(snapshot, default=str), time.time(), client_id, worker_id))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def load_snapshot(self, client_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT snapshot FROM sessions WHERE client_id = ?", (client_id,))
+            row = cursor.fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def discard(self, client_id: str):
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM sessions WHERE client_id = ?", (client_id,))
+            conn.commit()
+
+    def report_load(self, worker_id: str, load: Dict[str, Any]):
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO workers (worker_id, load, updated_at) VALUES (?, ?, ?)
+            """, (worker_id, json.dumps(load), time.time()))
+            conn.commit()
+
+    def worker_loads(self, max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        cutoff = time.time() - (Config.WORKER_LOAD_MAX_AGE if max_age is None else max_age)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT worker_id, load FROM workers WHERE updated_at >= ? ORDER BY worker_id", (cutoff,))
+            return {worker_id: json.loads(load) for worker_id, load in cursor.fetchall()}
+
+    def prune(self, max_age: Optional[float] = None) -> int:
+        cutoff = time.time() - (Config.SESSION_SNAPSHOT_TTL if max_age is None else max_age)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM sessions WHERE worker_id IS NULL AND updated_at < ?", (cutoff,))
+            dropped = cursor.rowcount
+            cursor.execute("DELETE FROM workers WHERE updated_at < ?", (cutoff,))
+            conn.commit()
+        return dropped
+
+
+class MemorySessionRegistry(SessionRegistry):
+    """In-process stand-in for a networked registry, with the same semantics as the SQLite one.
+
+    Serves a single worker (or tests); a deployment spanning hosts needs a
+    shared store behind the same interface.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._workers: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, client_id: str, worker_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._sessions.setdefault(client_id, {"worker_id": None, "snapshot": None})
+            previous = entry["worker_id"]
+            entry["worker_id"] = worker_id
+            entry["updated_at"] = time.time()
+            return previous
+
+    def release(self, client_id: str, worker_id: str):
+        with self._lock:
+            entry = self._sessions.get(client_id)
+            if entry and entry["worker_id"] == worker_id:
+                entry["worker_id"] = None
+                entry["updated_at"] = time.time()
+
+    def owners(self, client_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        with self._lock:
+            return {client_id: self._sessions.get(client_id, {}).get("worker_id") for client_id in client_ids}
+
+    def save_snapshot(self, client_id: str, worker_id: str, snapshot: Dict[str, Any]) -> bool:
+        with self._lock:
+            entry = self._sessions.get(client_id)
+            if not entry or entry["worker_id"] != worker_id:
+                return False
+            # Stored serialized, as a networked store would, so callers cannot mutate it afterwards
+            entry["snapshot"] = json.dumps(snapshot, default=str)
+            entry["updated_at"] = time.time()
+            return True
+
+    def load_snapshot(self, client_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            snapshot = self._sessions.get(client_id, {}).get("snapshot")
+        return json.loads(snapshot) if snapshot else None
+
+    def discard(self, client_id: str):
+        with self._lock:
+            self._sessions.pop(client_id, None)
+
+    def report_load(self, worker_id: str, load: Dict[str, Any]):
+        with self._lock:
+            self._workers[worker_id] = (dict(load), time.time())
+
+    def worker_loads(self, max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        cutoff = time.time() - (Config.WORKER_LOAD_MAX_AGE if max_age is None else max_age)
+        with self._lock:
+            return {worker_id: dict(load) for worker_id, (load, updated_at) in sorted(self._workers.items())
+                    if updated_at >= cutoff}
+
+    def prune(self, max_age: Optional[float] = None) -> int:
+        cutoff = time.time() - (Config.SESSION_SNAPSHOT_TTL if max_age is None else max_age)
+        with self._lock:
+            stale = [client_id for client_id, entry in self._sessions.items()
+                     if entry["worker_id"] is None and entry["updated_at"] < cutoff]
+            for client_id in stale:
+                del self._sessions[client_id]
+            for worker_id in [w for w, (_, updated_at) in self._workers.items() if updated_at < cutoff]:
+                del self._workers[worker_id]
+        return len(stale)
+
+
+def create_session_registry() -> SessionRegistry:
+    if Config.SESSION_REGISTRY == "memory":
+        return MemorySessionRegistry()
+    return SQLiteSessionRegistry()
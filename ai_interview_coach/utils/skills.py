@@ -0,0 +1,114 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import Config
+
+CATEGORIES = ("skills", "tools", "technologies")
+# Words keep inner ".", "-", "+", "#" and "/" so node.js, scikit-learn, c++, c# and pl/sql stay whole
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9+#]+(?:[./\-][A-Za-z0-9+#]+)*|\.[A-Za-z][A-Za-z0-9]*")
+COMPOUND_SEPARATORS = re.compile(r"[/\-]")
+CASE_SENSITIVE_PREFIX = "="
+
+
+def _tokens(text: str) -> List[Tuple[str, str]]:
+    """(lowercased, original) word pairs."""
+    return [(word.lower(), word) for word in TOKEN_PATTERN.findall(text)]
+
+
+class SkillExtractor:
+    """Finds taxonomy skills in free text with one pass over a word trie.
+
+    Every canonical name and alias is compiled into a trie of lowercased words;
+    the scan takes the longest match at each position, so "React Native" wins
+    over "React". Aliases written as "=Go" only match with that exact casing,
+    which keeps common words ("go", "rest", "excel") from matching as skills.
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        if taxonomy is None:
+            with open(Config.SKILLS_TAXONOMY_PATH, 'r') as f:
+                taxonomy = json.load(f)
+        self._trie: Dict[Optional[str], Any] = {}
+        self._canonical: Dict[str, Tuple[str, str]] = {}
+        for category in CATEGORIES:
+            for canonical, aliases in taxonomy.get(category, {}).items():
+                exact = {a[len(CASE_SENSITIVE_PREFIX):] for a in aliases if a.startswith(CASE_SENSITIVE_PREFIX)}
+                forms = [a for a in aliases if not a.startswith(CASE_SENSITIVE_PREFIX)]
+                if canonical not in exact:
+                    forms.append(canonical)
+                for form in forms:
+                    self._add(form, canonical, category, None)
+                for form in exact:
+                    self._add(form, canonical, category, form)
+
+    def _add(self, form: str, canonical: str, category: str, exact: Optional[str]):
+        words = _tokens(form)
+        if not words:
+            return
+        node = self._trie
+        for lowered, _ in words:
+            node = node.setdefault(lowered, {})
+        entries = node.setdefault(None, [])
+        entries.append((canonical, category, exact, len(words)))
+        self._canonical[" ".join(w for w, _ in words)] = (canonical, category)
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Canonical skills per category, in order of first mention."""
+        found = {category: {} for category in CATEGORIES}
+        tokens = self._scan_tokens(text or "")
+        trie = self._trie
+        i, n = 0, len(tokens)
+        while i < n:
+            node = trie.get(tokens[i][0])
+            best = None
+            j = i
+            while node is not None:
+                for canonical, category, exact, length in node.get(None, ()):
+                    if exact is None or " ".join(original for _, original in tokens[i:i + length]) == exact:
+                        best = (canonical, category, length)
+                        break
+                j += 1
+                node = node.get(tokens[j][0]) if j < n else None
+            if best:
+                found[best[1]].setdefault(best[0], None)
+                i += best[2]
+            else:
+                i += 1
+        return {category: list(names) for category, names in found.items()}
+
+    def _scan_tokens(self, text: str) -> List[Tuple[str, str]]:
+        """Words of `text`, splitting compounds like "Python/Django" unless the compound is a known name."""
+        tokens = []
+        for lowered, original in _tokens(text):
+            if lowered in self._trie or not COMPOUND_SEPARATORS.search(lowered):
+                tokens.append((lowered, original))
+            else:
+                tokens.extend((part.lower(), part) for part in COMPOUND_SEPARATORS.split(original) if part)
+        return tokens
+
+    def normalize(self, term: str) -> Optional[Tuple[str, str]]:
+        """(canonical, category) for a term that is exactly a known name or alias."""
+        return self._canonical.get(" ".join(w for w, _ in _tokens(term)))
+
+    def merge(self, base: Dict[str, List[str]], extra: Dict[str, Iterable[str]]) -> Dict[str, List[str]]:
+        """Union of two extractions, mapping known terms in `extra` to their canonical names."""
+        merged = {category: list(dict.fromkeys(base.get(category, []))) for category in CATEGORIES}
+        for category in CATEGORIES:
+            for term in extra.get(category, []):
+                if not isinstance(term, str) or not term.strip():
+                    continue
+                known = self.normalize(term)
+                target_category, name = (known[1], known[0]) if known else (category, term.strip())
+                if name.lower() not in {existing.lower() for existing in merged[target_category]}:
+                    merged[target_category].append(name)
+        return merged
+
+
+_extractor: Optional[SkillExtractor] = None
+
+
+def get_skill_extractor() -> SkillExtractor:
+    global _extractor
+    if _extractor is None:
+        _extractor = SkillExtractor()
+    return _extractor
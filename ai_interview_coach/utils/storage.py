@@ -1,14 +1,21 @@
+import logging
 import sqlite3
 from pathlib import Path
 from typing import Dict, List, Optional
 import json
 from datetime import datetime
 from config import Config
-from models.user_profile import UserProfile
+from models.user_profile import UserProfile, InterviewHistory
+from utils.tracing import traced
+
+# Profile fields kept in their own tables instead of the users.profile_data blob
+PROFILE_SPLIT_FIELDS = {"interview_history", "skills"}
+SCHEMA_VERSION = 1
+
 
 class InterviewStorage:
-    def __init__(self):
-        self.db_path = Config.DB_PATH
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path or Config.DB_PATH
         self._init_db()
 
     def _init_db(self):
@@ -32,39 +39,184 @@ class InterviewStorage:
                     FOREIGN KEY(user_id) REFERENCES users(user_id)
                 )
             """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_interview_history (
+                    user_id TEXT,
+                    interview_id TEXT,
+                    date TEXT,
+                    interview_type TEXT,
+                    score REAL,
+                    feedback_summary TEXT,
+                    PRIMARY KEY(user_id, interview_id),
+                    FOREIGN KEY(user_id) REFERENCES users(user_id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_user_interview_history_date
+                ON user_interview_history (user_id, date)
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_skills (
+                    user_id TEXT,
+                    skill TEXT,
+                    PRIMARY KEY(user_id, skill),
+                    FOREIGN KEY(user_id) REFERENCES users(user_id)
+                )
+            """)
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            # Stays at the old version while any blob failed, so the migration is retried on the next start
+            if version < SCHEMA_VERSION and self._migrate_profile_blobs(cursor) == 0:
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             conn.commit()
 
+    def _migrate_profile_blobs(self, cursor: sqlite3.Cursor) -> int:
+        """Move history and skills out of legacy whole-profile JSON blobs; returns how many failed.
+
+        A blob that cannot be migrated is logged and left as it is, so one bad
+        row does not stop the app from starting.
+        """
+        failed = 0
+        cursor.execute("SELECT user_id, profile_data FROM users")
+        for user_id, profile_data in cursor.fetchall():
+            cursor.execute("SAVEPOINT migrate_profile")
+            try:
+                self._migrate_profile_blob(cursor, user_id, profile_data)
+            except Exception as e:
+                cursor.execute("ROLLBACK TO migrate_profile")
+                logging.error(f"Leaving profile of user {user_id} unmigrated: {e}")
+                failed += 1
+            cursor.execute("RELEASE migrate_profile")
+        return failed
+
+    def _migrate_profile_blob(self, cursor: sqlite3.Cursor, user_id: str, profile_data: str):
+        try:
+            data = json.loads(profile_data)
+        except (TypeError, ValueError):
+            return
+        if not isinstance(data, dict) or not PROFILE_SPLIT_FIELDS & data.keys():
+            return
+
+        history = [InterviewHistory.model_validate(entry) for entry in data.pop("interview_history", [])]
+        self._insert_history(cursor, user_id, history)
+        self._sync_skills(cursor, user_id, data.pop("skills", []))
+        cursor.execute("""
+            UPDATE users SET profile_data = ? WHERE user_id = ?
+        """, (json.dumps(data), user_id))
+
+    def _insert_history(self, cursor: sqlite3.Cursor, user_id: str, history: List[InterviewHistory]):
+        cursor.executemany("""
+            INSERT OR IGNORE INTO user_interview_history
+            (user_id, interview_id, date, interview_type, score, feedback_summary)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(
+            user_id,
+            entry.interview_id,
+            entry.date.isoformat(),
+            entry.interview_type,
+            entry.score,
+            entry.feedback_summary
+        ) for entry in history])
+
+    def _sync_skills(self, cursor: sqlite3.Cursor, user_id: str, skills: List[str]):
+        skills = set(skills)
+        cursor.execute("SELECT skill FROM user_skills WHERE user_id = ?", (user_id,))
+        stored = {row[0] for row in cursor.fetchall()}
+        cursor.executemany("""
+            INSERT OR IGNORE INTO user_skills (user_id, skill) VALUES (?, ?)
+        """, [(user_id, skill) for skill in skills - stored])
+        cursor.executemany("""
+            DELETE FROM user_skills WHERE user_id = ? AND skill = ?
+        """, [(user_id, skill) for skill in stored - skills])
+
+    @traced("storage.db.save_user_profile")
     def save_user_profile(self, profile: UserProfile):
+        """Upsert the profile header; history rows are appended, never rewritten."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT OR REPLACE INTO users 
+                INSERT OR REPLACE INTO users
                 (user_id, profile_data, created_at, updated_at)
                 VALUES (?, ?, ?, ?)
             """, (
                 profile.user_id,
-                profile.model_dump_json(),
+                profile.model_dump_json(exclude=PROFILE_SPLIT_FIELDS),
                 profile.created_at.isoformat(),
                 profile.updated_at.isoformat()
             ))
+            self._insert_history(cursor, profile.user_id, profile.interview_history)
+            self._sync_skills(cursor, profile.user_id, profile.skills)
             conn.commit()
 
-    def get_user_profile(self, user_id: str) -> Optional[UserProfile]:
+    @traced("storage.db.append_interview_history")
+    def append_interview_history(self, user_id: str, entry: InterviewHistory):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            self._insert_history(cursor, user_id, [entry])
+            cursor.execute("""
+                UPDATE users SET updated_at = ? WHERE user_id = ?
+            """, (datetime.now().isoformat(), user_id))
+            conn.commit()
+
+    @traced("storage.db.add_user_skills")
+    def add_user_skills(self, user_id: str, skills: List[str]):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR IGNORE INTO user_skills (user_id, skill) VALUES (?, ?)
+            """, [(user_id, skill) for skill in set(skills)])
+            conn.commit()
+
+    @traced("storage.db.get_interview_history")
+    def get_interview_history(self, user_id: str, limit: Optional[int] = None) -> List[InterviewHistory]:
+        """Latest `limit` history entries (all when None), oldest first."""
+        with sqlite3.connect(self.db_path) as conn:
+            return self._fetch_history(conn.cursor(), user_id, limit)
+
+    def _fetch_history(self, cursor: sqlite3.Cursor, user_id: str, limit: Optional[int]) -> List[InterviewHistory]:
+        cursor.execute("""
+            SELECT interview_id, date, interview_type, score, feedback_summary
+            FROM user_interview_history
+            WHERE user_id = ? ORDER BY date DESC LIMIT ?
+        """, (user_id, -1 if limit is None else limit))
+        return [
+            InterviewHistory(
+                interview_id=row[0],
+                date=datetime.fromisoformat(row[1]),
+                interview_type=row[2],
+                score=row[3],
+                feedback_summary=row[4]
+            ) for row in reversed(cursor.fetchall())
+        ]
+
+    @traced("storage.db.get_user_profile")
+    def get_user_profile(self, user_id: str, history_limit: Optional[int] = None) -> Optional[UserProfile]:
+        """Load the profile header plus the latest `history_limit` history entries."""
+        if history_limit is None:
+            history_limit = Config.PROFILE_HISTORY_LIMIT
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT profile_data FROM users WHERE user_id = ?
             """, (user_id,))
             result = cursor.fetchone()
-            if result:
-                return UserProfile.model_validate_json(result[0])
-        return None
+            if not result:
+                return None
+
+            data = json.loads(result[0])
+            cursor.execute("""
+                SELECT skill FROM user_skills WHERE user_id = ? ORDER BY skill
+            """, (user_id,))
+            data["skills"] = [row[0] for row in cursor.fetchall()]
+            profile = UserProfile.model_validate(data)
+            profile.interview_history = self._fetch_history(cursor, user_id, history_limit)
+            return profile
 
+    @traced("storage.db.save_interview")
     def save_interview(self, interview_id: str, user_id: str, data: Dict):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO interviews 
+                INSERT INTO interviews
                 (interview_id, user_id, interview_data, created_at)
                 VALUES (?, ?, ?, ?)
             """, (
@@ -75,11 +227,12 @@ class InterviewStorage:
             ))
             conn.commit()
 
+    @traced("storage.db.get_user_interviews")
     def get_user_interviews(self, user_id: str) -> List[Dict]:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT interview_data FROM interviews 
+                SELECT interview_data FROM interviews
                 WHERE user_id = ? ORDER BY created_at DESC
             """, (user_id,))
-            return [json.loads(row[0]) for row in cursor.fetchall()]
\ No newline at end of file
+            return [json.loads(row[0]) for row in cursor.fetchall()]
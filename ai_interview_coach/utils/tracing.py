@@ -0,0 +1,314 @@
+import atexit
+import functools
+import hashlib
+import inspect
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import Config
+
+SERVICE_NAME = "ai_interview_coach"
+_current: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def trace_id_for(interview_id: str) -> str:
+    """Trace id of an interview, the same on every worker, so a resumed interview continues its trace."""
+    return hashlib.sha256(interview_id.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class Span:
+    """One timed operation, with the fields of an OpenTelemetry span."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    start_time_unix_nano: int = field(default_factory=time.time_ns)
+    end_time_unix_nano: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "UNSET"  # "OK" or "ERROR" once ended
+    status_message: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time_unix_nano or time.time_ns()
+        return (end - self.start_time_unix_nano) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+            "resource": {"service.name": SERVICE_NAME, "process.pid": os.getpid()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        status = data.get("status") or {}
+        return cls(data["name"], data["trace_id"], data["span_id"], data.get("parent_span_id"),
+                   data["start_time_unix_nano"], data.get("end_time_unix_nano"), data.get("attributes", {}),
+                   status.get("code", "UNSET"), status.get("message"))
+
+
+class MemorySpanExporter:
+    """Keeps finished spans in a list; for tests, or as a collector stand-in inside one process."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+
+class JsonlSpanExporter:
+    """Appends finished spans as JSON lines, written by a background thread.
+
+    Exporting only enqueues, so instrumented code never waits on the disk.
+    When the file passes `max_bytes` it is moved to `<file>.1`, replacing the
+    previous one.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.path = Path(path or Config.TRACE_FILE)
+        self.max_bytes = max_bytes or Config.TRACE_MAX_BYTES
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        self._queue.put(span.to_dict())
+
+    def flush(self):
+        """Block until every span exported so far is on disk."""
+        self._queue.join()
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and not self._queue.empty():
+                item = self._queue.get()
+                batch.append(item)
+            try:
+                self._write([entry for entry in batch if entry is not None])
+            except Exception as e:
+                print(f"Error writing trace spans: {e}", file=sys.stderr)
+            for _ in batch:
+                self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        if not entries:
+            return
+        if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+            self.path.replace(self.path.with_name(self.path.name + ".1"))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry, default=str) + "\n" for entry in entries)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter.
+
+    The current span is kept in a ContextVar, so spans opened in a task (or a
+    thread started with asyncio.to_thread) become children of the span that
+    was current when it was created.
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self._stats = {"spans": 0, "errors": 0}
+
+    def start_span(self, name: str, parent: Optional[Span] = None, trace_id: Optional[str] = None,
+                   **attributes) -> Span:
+        parent = parent or _current.get()
+        if trace_id is None:
+            trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        parent_span_id = parent.span_id if parent and parent.trace_id == trace_id else None
+        return Span(name, trace_id, os.urandom(8).hex(), parent_span_id, attributes=attributes)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None):
+        span.end_time_unix_nano = time.time_ns()
+        span.status = "ERROR" if error is not None else "OK"
+        if error is not None:
+            span.status_message = f"{type(error).__name__}: {error}"
+            self._stats["errors"] += 1
+        self._stats["spans"] += 1
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, trace_id: Optional[str] = None,
+             **attributes) -> Iterator[Span]:
+        """Time the block as a span, current for everything started inside it."""
+        span = self.start_span(name, parent, trace_id, **attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current.reset(token)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "exporter": type(self.exporter).__name__ if self.exporter else None}
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer, exporting to TRACE_FILE when tracing is enabled."""
+    global _tracer
+    if _tracer is None:
+        exporter = None
+        if Config.TRACING_ENABLED:
+            exporter = JsonlSpanExporter()
+            atexit.register(exporter.shutdown)
+        _tracer = Tracer(exporter)
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Replace the process-wide tracer (e.g. with a MemorySpanExporter in tests); returns the old one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def span(name: str, parent: Optional[Span] = None, trace_id: Optional[str] = None, **attributes):
+    return get_tracer().span(name, parent, trace_id, **attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of a function or coroutine function as a span."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_spans(path: Path, trace_id: Optional[str] = None) -> List[Span]:
+    spans = []
+    rotated = path.with_name(path.name + ".1")
+    for file in (rotated, path):
+        if not file.exists():
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by a crash
+                if trace_id is None or data.get("trace_id") == trace_id:
+                    spans.append(Span.from_dict(data))
+    return spans
+
+
+def critical_path(root: Span, children: Dict[str, List[Span]]) -> List[Span]:
+    """Spans under `root` that determined when it finished.
+
+    Walking back from the root's end, the child that finished last is on the
+    path, then the last child to finish before that one started, and so on;
+    each is expanded the same way.
+    """
+    chain, cursor = [], root.end_time_unix_nano
+    for child in sorted(children.get(root.span_id, []), key=lambda s: s.end_time_unix_nano, reverse=True):
+        if child.end_time_unix_nano <= cursor:
+            chain.append(child)
+            cursor = child.start_time_unix_nano
+    path = [root]
+    for child in reversed(chain):
+        path.extend(critical_path(child, children))
+    return path
+
+
+def critical_path_report(spans: List[Span]) -> List[str]:
+    """Text lines with the critical path of each root span and where its time went."""
+    finished = [s for s in spans if s.end_time_unix_nano is not None]
+    ids = {s.span_id for s in finished}
+    children: Dict[str, List[Span]] = {}
+    for s in finished:
+        if s.parent_span_id in ids:
+            children.setdefault(s.parent_span_id, []).append(s)
+    roots = sorted((s for s in finished if s.parent_span_id not in ids), key=lambda s: s.start_time_unix_nano)
+
+    lines = []
+    for root in roots:
+        path = critical_path(root, children)
+        on_path = {s.span_id for s in path}
+        depth = {root.span_id: 0}
+        by_kind: Dict[str, float] = {}
+        label = f"{root.name} {root.attributes['interview_id']}" if "interview_id" in root.attributes else root.name
+        lines.append(f"{label}: {root.duration_ms:.1f}ms")
+        for s in path:
+            if s is not root:
+                depth[s.span_id] = depth[s.parent_span_id] + 1
+            # Time not covered by this span's own children on the path
+            self_ms = s.duration_ms - sum(c.duration_ms for c in children.get(s.span_id, []) if c.span_id in on_path)
+            kind = s.name.split(".")[0]
+            by_kind[kind] = by_kind.get(kind, 0.0) + self_ms
+            error = f"  [{s.status_message}]" if s.status == "ERROR" else ""
+            lines.append(f"  {s.duration_ms:10.1f}ms {self_ms:10.1f}ms self  {'  ' * depth[s.span_id]}{s.name}{error}")
+        lines.append("  time on critical path: " + ", ".join(
+            f"{kind} {ms:.1f}ms" for kind, ms in sorted(by_kind.items(), key=lambda item: -item[1])))
+    return lines
+
+
+def main(argv: List[str]) -> int:
+    if not argv or argv[0].startswith("-"):
+        print("usage: python -m utils.tracing INTERVIEW_ID [TRACE_FILE]")
+        return 2
+    path = Path(argv[1]) if len(argv) > 1 else Config.TRACE_FILE
+    spans = load_spans(path, trace_id_for(argv[0]))
+    if not spans:
+        print(f"No spans for interview {argv[0]} in {path}")
+        return 1
+    print("\n".join(critical_path_report(spans)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+from config import Config
+
+# Live speech is served before background pre-warming
+PRIORITY_SPEAK = 0
+PRIORITY_SYNTHESIZE = 1
+PRIORITY_PREWARM = 2
+
+
+def _default_engine_factory():
+    import pyttsx3
+    return pyttsx3.init()
+
+
+class TTSWorker:
+    """Owns the pyttsx3 engine on a dedicated thread and caches synthesized audio by content hash.
+
+    pyttsx3 engines are not thread-safe and `runAndWait()` blocks for the whole
+    utterance, so every engine call is funnelled through one request queue.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, engine_factory: Optional[Callable] = None,
+                 rate: Optional[int] = None, volume: Optional[float] = None):
+        self.cache_dir = Path(cache_dir or Config.TTS_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.engine_factory = engine_factory or _default_engine_factory
+        self.rate = rate or Config.TTS_RATE
+        self.volume = volume or Config.TTS_VOLUME
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"cache_hits": 0, "synthesized": 0, "spoken": 0, "errors": 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._queue.put((-1, next(self._sequence), None, None, None))
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def cache_key(self, text: str) -> str:
+        payload = f"{self.rate}|{self.volume}|{text.strip()}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def cached_path(self, text: str) -> Optional[Path]:
+        path = self.cache_path(self.cache_key(text))
+        return path if path.exists() else None
+
+    def submit_synthesis(self, text: str, priority: int = PRIORITY_SYNTHESIZE) -> Future:
+        """Queue synthesis of `text` to the audio cache; concurrent requests share one job."""
+        key = self.cache_key(text)
+        path = self.cache_path(key)
+        future = Future()
+        if path.exists():
+            self._stats["cache_hits"] += 1
+            future.set_result(path)
+            return future
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and not pending.cancelled():
+                return pending
+            self._pending[key] = future
+        self.start()
+        self._queue.put((priority, next(self._sequence), "synthesize", text, future))
+        return future
+
+    def submit_speech(self, text: str) -> Future:
+        future = Future()
+        self.start()
+        self._queue.put((PRIORITY_SPEAK, next(self._sequence), "speak", text, future))
+        return future
+
+    async def synthesize(self, text: str) -> Optional[Path]:
+        # Synthesis jobs are shared and cached, so a cancelled caller leaves the job running for the others
+        return await asyncio.shield(asyncio.wrap_future(self.submit_synthesis(text)))
+
+    async def speak(self, text: str):
+        """Speak `text`; cancelling the caller drops the utterance if the worker has not started it."""
+        await asyncio.wrap_future(self.submit_speech(text))
+
+    def prewarm(self, texts: Iterable[str]) -> int:
+        """Queue background synthesis for every uncached text; returns how many were queued."""
+        queued = 0
+        for text in dict.fromkeys(t for t in texts if t and t.strip()):
+            if self.cached_path(text) is None:
+                self.submit_synthesis(text, priority=PRIORITY_PREWARM)
+                queued += 1
+        logging.debug("Queued %d prompts for TTS pre-warming", queued)
+        return queued
+
+    def stats(self) -> Dict:
+        return {**self._stats, "queued": self._queue.qsize()}
+
+    def _run(self):
+        engine = None
+        try:
+            engine = self.engine_factory()
+            engine.setProperty('rate', self.rate)
+            engine.setProperty('volume', self.volume)
+        except Exception as e:
+            logging.error(f"Speech engine initialization error: {e}")
+
+        while True:
+            _, _, kind, text, future = self._queue.get()
+            if kind is None:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if engine is None:
+                    raise RuntimeError("Speech engine unavailable")
+                if kind == "speak":
+                    engine.say(text)
+                    engine.runAndWait()
+                    self._stats["spoken"] += 1
+                    future.set_result(None)
+                else:
+                    future.set_result(self._synthesize(engine, text))
+            except Exception as e:
+                self._stats["errors"] += 1
+                logging.error(f"Speech synthesis error: {e}")
+                future.set_result(None)
+            finally:
+                if kind == "synthesize":
+                    with self._lock:
+                        self._pending.pop(self.cache_key(text), None)
+
+    def _synthesize(self, engine, text: str) -> Path:
+        path = self.cache_path(self.cache_key(text))
+        if path.exists():
+            self._stats["cache_hits"] += 1
+            return path
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        engine.save_to_file(text, str(tmp_path))
+        engine.runAndWait()
+        os.replace(tmp_path, path)
+        self._stats["synthesized"] += 1
+        return path
+
+
+_worker: Optional[TTSWorker] = None
+
+
+def get_tts_worker() -> TTSWorker:
+    """Process-wide TTS worker shared by every session."""
+    global _worker
+    if _worker is None:
+        _worker = TTSWorker()
+    return _worker
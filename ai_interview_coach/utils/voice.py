@@ -1,99 +1,343 @@
 import speech_recognition as sr
-import pyttsx3
-import pyaudio
-import wave
-import tempfile
 import logging
-import os
 import asyncio
-from typing import Optional
+import hashlib
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
 from config import Config
-import openai
 
+_END_OF_AUDIO = None
+
+
+class SpeechCapture:
+    """Microphone capture on a dedicated audio thread, calibrated once per session.
+
+    `Recognizer.listen` and `adjust_for_ambient_noise` block, so they never run on
+    the event loop. Listening happens in short windows so a cancelled capture
+    releases the microphone within `poll_interval` seconds.
+    """
+
+    def __init__(self, recognizer: sr.Recognizer, source_factory: Optional[Callable] = None,
+                 calibration_duration: Optional[float] = None, drift_ratio: Optional[float] = None,
+                 max_calibration_age: Optional[float] = None, poll_interval: Optional[float] = None):
+        self.recognizer = recognizer
+        self.source_factory = source_factory or (lambda: sr.Microphone(sample_rate=Config.VOICE_SAMPLE_RATE))
+        self.calibration_duration = calibration_duration or Config.VOICE_CALIBRATION_DURATION
+        self.drift_ratio = drift_ratio or Config.VOICE_CALIBRATION_DRIFT
+        self.max_calibration_age = max_calibration_age or Config.VOICE_CALIBRATION_MAX_AGE
+        self.poll_interval = poll_interval or Config.VOICE_LISTEN_POLL
+        self.calibrations = 0
+        self.last_listen_delay = 0.0  # Seconds between a capture request and the microphone listening
+        self._baseline_threshold: Optional[float] = None
+        self._calibrated_at: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech-capture")
+
+    def needs_calibration(self) -> bool:
+        if self._baseline_threshold is None:
+            return True
+        if time.monotonic() - self._calibrated_at > self.max_calibration_age:
+            return True
+        drift = abs(self.recognizer.energy_threshold - self._baseline_threshold) / max(self._baseline_threshold, 1.0)
+        return drift > self.drift_ratio
+
+    def invalidate_calibration(self):
+        self._baseline_threshold = None
 
-class VoiceInterface:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)
-        self.engine.setProperty('volume', 0.9)
-        self._last_response = None
-        self._response_event = asyncio.Event()
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+    def _calibrate(self, source):
+        logging.debug("Adjusting for ambient noise...")
+        self.recognizer.adjust_for_ambient_noise(source, duration=self.calibration_duration)
+        self._baseline_threshold = self.recognizer.energy_threshold
+        self._calibrated_at = time.monotonic()
+        self.calibrations += 1
 
-    def speak(self, text: str):
-        """Output text as speech if voice is enabled"""
-        if not Config.VOICE_ENABLED:
-            logging.debug(f"Text-to-speech: {text}")
-            return
+    def _capture(self, timeout: float, cancelled: threading.Event) -> Optional[sr.AudioData]:
+        requested = time.monotonic()
+        with self.source_factory() as source:
+            if self.needs_calibration():
+                self._calibrate(source)
+            self.last_listen_delay = time.monotonic() - requested
+            logging.debug("Listening for speech (timeout: %ss)...", timeout)
+            deadline = time.monotonic() + timeout
+            while not cancelled.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    return self.recognizer.listen(
+                        source,
+                        timeout=min(self.poll_interval, remaining),
+                        phrase_time_limit=timeout
+                    )
+                except sr.WaitTimeoutError:
+                    continue
+        return None
 
+    async def capture(self, timeout: float) -> Optional[sr.AudioData]:
+        """Capture one utterance without blocking the event loop; None if nothing was said."""
+        cancelled = threading.Event()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._capture, timeout, cancelled)
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except Exception as e:
-            logging.error(f"Speech synthesis error: {e}")
-
-    def set_response(self, response: str):
-        """Set the response received from the UI"""
-        self._last_response = response
-        self._response_event.set()
-        logging.debug(f"Response received from UI: {response}")
-
-    async def wait_for_response(self, timeout: int = 60) -> Optional[str]:
-        """Wait for a response with timeout, checking both UI and voice input"""
-        self._response_event.clear()
-        self._last_response = None
+            return await future
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
 
+    def _stream_capture(self, timeout: float, cancelled: threading.Event, emit: Callable):
+        requested = time.monotonic()
+        with self.source_factory() as source:
+            if self.needs_calibration():
+                self._calibrate(source)
+            self.last_listen_delay = time.monotonic() - requested
+            emit(("format", source.SAMPLE_RATE, source.SAMPLE_WIDTH))
+            deadline = time.monotonic() + timeout
+            while not cancelled.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    for chunk in self.recognizer.listen(source, timeout=min(self.poll_interval, remaining),
+                                                        phrase_time_limit=timeout, stream=True):
+                        if cancelled.is_set():
+                            return
+                        emit(chunk.frame_data)
+                    return
+                except sr.WaitTimeoutError:
+                    continue
+
+    async def stream(self, timeout: float) -> AsyncIterator[bytes]:
+        """Yield raw PCM chunks of one utterance as they are captured.
+
+        The whole utterance is kept afterwards in `last_audio`.
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(item):
+            loop.call_soon_threadsafe(chunks.put_nowait, item)
+
+        def run():
+            try:
+                self._stream_capture(timeout, cancelled, emit)
+            finally:
+                emit(_END_OF_AUDIO)
+
+        future = loop.run_in_executor(self._executor, run)
+        frames: List[bytes] = []
+        audio_format = (Config.VOICE_SAMPLE_RATE, 2)
+        self.last_audio = None
         try:
-            # Wait for either UI response or voice input
-            done, pending = await asyncio.wait(
-                [
-                    asyncio.create_task(self._response_event.wait()),
-                    asyncio.create_task(self._listen_for_voice(timeout))
-                ],
-                timeout=timeout,
-                return_when=asyncio.FIRST_COMPLETED
-            )
-
-            # Cancel any pending tasks
-            for task in pending:
-                task.cancel()
-
-            if self._last_response:
-                return self._last_response
-            return None
+            while True:
+                item = await chunks.get()
+                if item is _END_OF_AUDIO:
+                    break
+                if isinstance(item, tuple):
+                    audio_format = item[1:]
+                    continue
+                frames.append(item)
+                yield item
+            await future
+        finally:
+            cancelled.set()
+            if frames:
+                self.last_audio = sr.AudioData(b"".join(frames), *audio_format)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AudioChunkChannel:
+    """Async queue of PCM chunks pushed by a producer (e.g. websocket binary frames).
+
+    Each `end()` closes the current utterance; iterating again reads the next one.
+    """
+
+    def __init__(self, max_chunks: int = 1024):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+
+    def feed(self, chunk: bytes):
+        try:
+            self._queue.put_nowait(chunk)
+        except asyncio.QueueFull:
+            logging.warning("Audio chunk dropped: input channel is full")
+
+    def end(self):
+        try:
+            self._queue.put_nowait(_END_OF_AUDIO)
+        except asyncio.QueueFull:
+            logging.warning("End of audio dropped: input channel is full")
+
+    def clear(self) -> int:
+        """Drop chunks nobody has read yet; returns how many were dropped."""
+        dropped = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            dropped += 1
+        return dropped
+
+    async def __aiter__(self):
+        while True:
+            chunk = await self._queue.get()
+            if chunk is _END_OF_AUDIO:
+                return
+            yield chunk
+
+
+class TextInputChannel:
+    """Async queue of typed answers pushed by a producer (e.g. websocket messages).
+
+    A consumer awaiting `get()` wakes as soon as an answer is pushed, instead of
+    polling or waiting out its timeout.
+    """
+
+    def __init__(self, max_items: int = 16):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_items)
+        self.last_received_at: Optional[float] = None  # time.monotonic() when the last read answer was pushed
 
+    def push(self, text: str):
+        try:
+            self._queue.put_nowait((time.monotonic(), text))
+        except asyncio.QueueFull:
+            logging.warning("Typed answer dropped: input channel is full")
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[str]:
+        """The next pushed answer, or None if none arrives within `timeout` seconds."""
+        try:
+            received_at, text = await asyncio.wait_for(self._queue.get(), timeout)
         except asyncio.TimeoutError:
-            logging.debug("Response timeout reached")
-            return None
-        except Exception as e:
-            logging.error(f"Error waiting for response: {e}")
             return None
+        self.last_received_at = received_at
+        return text
 
-    async def _listen_for_voice(self, timeout: int) -> Optional[str]:
-        """Listen for voice input with timeout"""
-        if not Config.VOICE_ENABLED:
-            return None
+    def clear(self) -> int:
+        """Drop answers nobody has read yet; returns how many were dropped."""
+        dropped = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            dropped += 1
+        return dropped
 
-        with sr.Microphone() as source:
-            self.recognizer.adjust_for_ambient_noise(source)
-            try:
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=timeout)
-                text = self.recognizer.recognize_google(audio)
-                self._last_response = text
-                self._response_event.set()
-                return text
-            except sr.WaitTimeoutError:
-                logging.debug("Voice input timeout")
-                return None
-            except sr.UnknownValueError:
-                logging.debug("Could not understand audio")
-                return None
-            except Exception as e:
-                logging.error(f"Voice recognition error: {e}")
-                return None
-
-    def clear_response(self):
-        """Clear the stored response"""
-        self._last_response = None
-        self._response_event.clear()
\ No newline at end of file
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+@dataclass
+class Transcript:
+    text: str
+    is_final: bool
+    audio_seconds: float  # Audio consumed when the transcript was produced
+
+
+class ASRBackend(ABC):
+    """Speech recognizer fed incrementally with 16-bit mono PCM chunks."""
+
+    def __init__(self, sample_rate: int = Config.VOICE_SAMPLE_RATE, sample_width: int = 2):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+    def _seconds(self, n_bytes: int) -> float:
+        return n_bytes / (self.sample_rate * self.sample_width)
+
+    @abstractmethod
+    def transcribe(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Transcript]:
+        """Yield partial transcripts while audio arrives and exactly one final transcript."""
+
+
+class GoogleASRBackend(ASRBackend):
+    """Google Web Speech API; partials re-recognize the audio buffered so far."""
+
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None, partial_interval: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.recognizer = recognizer or sr.Recognizer()
+        self.partial_interval = partial_interval if partial_interval is not None else Config.ASR_PARTIAL_INTERVAL
+
+    async def _recognize(self, frames: bytes) -> str:
+        audio = sr.AudioData(frames, self.sample_rate, self.sample_width)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self.recognizer.recognize_google, audio)
+        except sr.UnknownValueError:
+            return ""
+
+    async def transcribe(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Transcript]:
+        buffer = bytearray()
+        next_partial = self.partial_interval
+        async for chunk in chunks:
+            buffer.extend(chunk)
+            seconds = self._seconds(len(buffer))
+            if self.partial_interval and seconds >= next_partial:
+                next_partial = seconds + self.partial_interval
+                yield Transcript(await self._recognize(bytes(buffer)), False, seconds)
+        text = await self._recognize(bytes(buffer)) if buffer else ""
+        yield Transcript(text, True, self._seconds(len(buffer)))
+
+
+class LocalASRBackend(ASRBackend):
+    """Deterministic offline stand-in driven by WAV fixtures with `.txt` transcripts.
+
+    A stream is matched to a fixture by the hash of its first bytes, and the
+    fixture's words are revealed in proportion to the audio received so far.
+    No recordings ship with the app: put 16 kHz 16-bit mono answers in
+    ASR_FIXTURES_DIR as NAME.wav, each with its transcript in NAME.txt.
+    """
+
+    FINGERPRINT_BYTES = 4096
+
+    def __init__(self, fixtures_dir: Optional[Path] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures: Dict[str, tuple] = {}
+        fixtures_dir = Path(fixtures_dir or Config.ASR_FIXTURES_DIR)
+        self.load_fixtures(fixtures_dir)
+        if not self.fixtures:
+            logging.warning(f"No ASR fixtures in {fixtures_dir}; every answer will transcribe as empty")
+
+    @classmethod
+    def fingerprint(cls, frames: bytes) -> str:
+        return hashlib.sha1(frames[:cls.FINGERPRINT_BYTES]).hexdigest()
+
+    def load_fixtures(self, fixtures_dir: Path):
+        for wav_path in sorted(fixtures_dir.glob("*.wav")):
+            transcript_path = wav_path.with_suffix(".txt")
+            if not transcript_path.exists():
+                continue
+            with wave.open(str(wav_path), "rb") as f:
+                frames = f.readframes(f.getnframes())
+            self.add_fixture(frames, transcript_path.read_text().strip())
+
+    def add_fixture(self, frames: bytes, transcript: str):
+        self.fixtures[self.fingerprint(frames)] = (len(frames), transcript.split())
+
+    async def transcribe(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Transcript]:
+        head = bytearray()
+        received = 0
+        revealed = 0
+        fixture = None
+        async for chunk in chunks:
+            received += len(chunk)
+            if fixture is None and len(head) < self.FINGERPRINT_BYTES:
+                head.extend(chunk[:self.FINGERPRINT_BYTES - len(head)])
+                if len(head) >= self.FINGERPRINT_BYTES:
+                    fixture = self.fixtures.get(self.fingerprint(bytes(head)))
+            if fixture:
+                total_bytes, words = fixture
+                count = min(len(words), len(words) * received // max(total_bytes, 1))
+                if count > revealed:
+                    revealed = count
+                    yield Transcript(" ".join(words[:count]), False, self._seconds(received))
+        if fixture is None:
+            fixture = self.fixtures.get(self.fingerprint(bytes(head)))
+        text = " ".join(fixture[1]) if fixture else ""
+        yield Transcript(text, True, self._seconds(received))
+
+
+def create_asr_backend(recognizer: Optional[sr.Recognizer] = None) -> ASRBackend:
+    if Config.ASR_BACKEND == "local":
+        return LocalASRBackend()
+    return GoogleASRBackend(recognizer)